@@ -0,0 +1 @@
+"""Benchmark harnesses for the awesome_updater and news_poster pipelines."""
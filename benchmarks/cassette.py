@@ -0,0 +1,248 @@
+import base64
+import hashlib
+import json
+import threading
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import httpx
+except ImportError:  # httpx only ships with the openai SDK
+    httpx = None
+
+# Hosts are mapped to the service names used in benchmark reports
+SERVICE_HOSTS = {
+    "export.arxiv.org": "arxiv",
+    "arxiv.org": "arxiv",
+    "api.tavily.com": "tavily",
+    "api.github.com": "github",
+    "github.com": "github",
+    "raw.githubusercontent.com": "github",
+    "api.openai.com": "openai",
+    "api.semanticscholar.org": "semantic_scholar",
+    "api.twitter.com": "twitter",
+    "api.x.com": "twitter",
+    "upload.twitter.com": "twitter",
+}
+
+# Request body fields that carry credentials and must never reach a cassette
+SECRET_FIELDS = {"api_key", "apiKey", "token", "access_token"}
+
+# Response headers worth keeping; everything else is noise in the cassette
+KEPT_HEADERS = {
+    "content-type",
+    "etag",
+    "last-modified",
+    "link",
+    "location",
+    "retry-after",
+    "x-ratelimit-limit",
+    "x-ratelimit-remaining",
+    "x-ratelimit-reset",
+    "x-ratelimit-resource",
+    "x-ratelimit-used",
+}
+
+
+class CassetteMiss(Exception):
+    """Raised in replay mode when a request has no recorded interaction."""
+
+
+def service_for_url(url: str) -> str:
+    """Map a request URL to the service name used in reports."""
+    host = (urlsplit(url).hostname or "").lower()
+    return SERVICE_HOSTS.get(host, "other")
+
+
+def _normalize_url(url: str) -> str:
+    """Sort query parameters so equivalent requests share a key."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ""))
+
+
+def _body_digest(body: Any) -> str:
+    """Hash a request body with credential fields stripped out."""
+    if body is None:
+        return ""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if not isinstance(body, (bytes, bytearray)):
+        # Streaming or generator bodies cannot be hashed without consuming them
+        return "<stream>"
+    try:
+        payload = json.loads(body)
+        if isinstance(payload, dict):
+            payload = {k: v for k, v in payload.items() if k not in SECRET_FIELDS}
+        body = json.dumps(payload, sort_keys=True).encode("utf-8")
+    except ValueError:
+        pass
+    return hashlib.sha1(body).hexdigest()
+
+
+class Cassette:
+    """Records outbound HTTP interactions to a JSON file and replays them offline.
+
+    Both ``requests`` (arXiv, Tavily, GitHub, Twitter) and ``httpx`` (OpenAI) are
+    intercepted at the transport level, so the code under test runs unmodified.
+    """
+
+    def __init__(self, path: str, mode: str = "replay"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.interactions: List[Dict[str, Any]] = []
+        self.fixtures: Dict[str, Any] = {}
+        self.call_counts: Dict[str, int] = defaultdict(int)
+        self.tokens = {"prompt": 0, "completion": 0, "total": 0}
+        self._queues: Dict[Tuple[str, str, str], Deque[Dict[str, Any]]] = {}
+        self._last: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._originals: Dict[str, Any] = {}
+
+        if mode == "replay":
+            self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.interactions = data.get("interactions", [])
+        self.fixtures = data.get("fixtures", {})
+        queues: Dict[Tuple[str, str, str], Deque[Dict[str, Any]]] = defaultdict(deque)
+        for interaction in self.interactions:
+            queues[self._key_of(interaction)].append(interaction)
+        self._queues = dict(queues)
+
+    def save(self) -> None:
+        """Write recorded interactions and fixtures to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": 1, "interactions": self.interactions, "fixtures": self.fixtures},
+                f,
+                indent=2,
+            )
+
+    @staticmethod
+    def _key_of(interaction: Dict[str, Any]) -> Tuple[str, str, str]:
+        return (interaction["method"], interaction["url"], interaction["body_sha1"])
+
+    def __enter__(self) -> "Cassette":
+        self._originals["requests"] = requests.Session.send
+        requests.Session.send = self._wrap_requests(requests.Session.send)
+        if httpx is not None:
+            self._originals["httpx"] = httpx.Client.send
+            httpx.Client.send = self._wrap_httpx(httpx.Client.send)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        requests.Session.send = self._originals.pop("requests")
+        if httpx is not None and "httpx" in self._originals:
+            httpx.Client.send = self._originals.pop("httpx")
+        if self.mode == "record":
+            self.save()
+
+    def _count(self, url: str, body: bytes, content_type: str) -> None:
+        service = service_for_url(url)
+        with self._lock:
+            self.call_counts[service] += 1
+            if service == "openai" and "json" in content_type:
+                try:
+                    usage = json.loads(body).get("usage") or {}
+                except ValueError:
+                    usage = {}
+                self.tokens["prompt"] += usage.get("prompt_tokens", 0)
+                self.tokens["completion"] += usage.get("completion_tokens", 0)
+                self.tokens["total"] += usage.get("total_tokens", 0)
+
+    def _record(self, method: str, url: str, request_body: Any,
+                status: int, headers: Dict[str, str], body: bytes) -> None:
+        interaction = {
+            "service": service_for_url(url),
+            "method": method.upper(),
+            "url": _normalize_url(url),
+            "body_sha1": _body_digest(request_body),
+            "status": status,
+            "headers": {k.lower(): v for k, v in headers.items() if k.lower() in KEPT_HEADERS},
+            "body_b64": base64.b64encode(body).decode("ascii"),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def _lookup(self, method: str, url: str, request_body: Any) -> Dict[str, Any]:
+        key = (method.upper(), _normalize_url(url), _body_digest(request_body))
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+                return self._last[key]
+            if key in self._last:
+                # Requests repeated more often than recorded reuse the final answer
+                return self._last[key]
+        raise CassetteMiss(f"No recorded interaction for {method.upper()} {url}")
+
+    def _wrap_requests(self, original: Any) -> Any:
+        cassette = self
+
+        def send(session: requests.Session, request: requests.PreparedRequest, **kwargs: Any):
+            if cassette.mode == "record":
+                response = original(session, request, **kwargs)
+                body = response.content
+                cassette._record(request.method, request.url, request.body,
+                                 response.status_code, dict(response.headers), body)
+            else:
+                interaction = cassette._lookup(request.method, request.url, request.body)
+                body = base64.b64decode(interaction["body_b64"])
+                response = requests.Response()
+                response.status_code = interaction["status"]
+                response.headers = CaseInsensitiveDict(interaction["headers"])
+                response._content = body
+                response.url = request.url
+                response.request = request
+                response.reason = "OK" if response.status_code < 400 else "Replayed error"
+                response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+            cassette._count(request.url, body, response.headers.get("content-type", ""))
+            return response
+
+        return send
+
+    def _wrap_httpx(self, original: Any) -> Any:
+        cassette = self
+
+        def send(client: Any, request: Any, **kwargs: Any):
+            url = str(request.url)
+            request_body = request.read()
+            if cassette.mode == "record":
+                response = original(client, request, **kwargs)
+                body = response.read()
+                cassette._record(request.method, url, request_body,
+                                 response.status_code, dict(response.headers), body)
+            else:
+                interaction = cassette._lookup(request.method, url, request_body)
+                body = base64.b64decode(interaction["body_b64"])
+                response = httpx.Response(
+                    interaction["status"],
+                    headers=interaction["headers"],
+                    content=body,
+                    request=request,
+                )
+            cassette._count(url, body, response.headers.get("content-type", ""))
+            return response
+
+        return send
+
+    def fixture(self, name: str) -> Optional[Any]:
+        """Return a non-HTTP fixture stored alongside the interactions."""
+        return self.fixtures.get(name)
+
+    def set_fixture(self, name: str, value: Any) -> None:
+        """Store a non-HTTP fixture (e.g. the cloned README) in the cassette."""
+        self.fixtures[name] = value
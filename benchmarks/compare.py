@@ -0,0 +1,55 @@
+"""Compare two benchmark result files.
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/<base>.json benchmarks/results/<head>.json
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterator, Tuple
+
+
+def _metrics(result: Dict[str, Any]) -> Iterator[Tuple[str, float]]:
+    """Flatten one target's result into comparable (name, value) pairs."""
+    yield "wall_time_s", result["wall_time_s"]
+    yield "peak_memory_bytes", result["peak_memory_bytes"]
+    for stage, values in result.get("stages", {}).items():
+        yield f"stage.{stage}.total_s", values["total_s"]
+    for service, count in result.get("calls", {}).items():
+        yield f"calls.{service}", count
+    for kind, count in result.get("tokens", {}).items():
+        yield f"tokens.{kind}", count
+
+
+def compare(base: Dict[str, Any], head: Dict[str, Any]) -> str:
+    lines = []
+    for target in sorted(set(base) | set(head)):
+        if target not in base or target not in head:
+            lines.append(f"{target}: only present in {'head' if target in head else 'base'}")
+            continue
+        lines.append(f"{target} ({base[target]['commit']} -> {head[target]['commit']})")
+        before = dict(_metrics(base[target]))
+        after = dict(_metrics(head[target]))
+        for name in sorted(set(before) | set(after)):
+            old, new = before.get(name, 0), after.get(name, 0)
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            lines.append(f"  {name:<40} {old:>14.3f} {new:>14.3f} {change:>9}")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    args = parser.parse_args()
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.head, encoding="utf-8") as f:
+        head = json.load(f)
+    print(compare(base, head))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+import importlib
+import os
+import resource
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import git
+
+from benchmarks.cassette import Cassette
+
+# (module, class, method, stage) tuples timed for each benchmark target
+STAGES: Dict[str, List[Tuple[str, str, str, str]]] = {
+    "awesome_updater": [
+        ("awesome_updater.core.git_manager", "GitManager", "__init__", "clone"),
+        ("awesome_updater.core.content_fetcher", "ContentFetcher", "_process_batch", "fetch.batch"),
+        ("awesome_updater.core.content_fetcher", "ContentFetcher", "_fetch_arxiv_papers", "fetch.arxiv"),
+        ("awesome_updater.core.content_fetcher", "ContentFetcher", "_fetch_lab_content", "fetch.labs"),
+        ("awesome_updater.core.content_fetcher", "ContentFetcher", "_fetch_github_repos", "fetch.github"),
+        ("awesome_updater.core.content_merger", "ContentMerger", "merge_content", "merge"),
+        ("awesome_updater.core.git_manager", "GitManager", "commit_and_push", "push"),
+    ],
+    "news_poster": [
+        ("news_poster.news_poster", "NewsPoster", "__init__", "auth"),
+        ("news_poster.news_poster", "NewsPoster", "fetch_top_news", "fetch_news"),
+        ("news_poster.news_poster", "NewsPoster", "post_to_twitter", "post"),
+        ("news_poster.news_poster", "NewsPoster", "fetch_top_tweets", "fetch_tweets"),
+        ("news_poster.news_poster", "NewsPoster", "engage_with_tweets", "engage"),
+    ],
+}
+
+ENTRY_POINTS = {
+    "awesome_updater": "awesome_updater.main",
+    "news_poster": "news_poster.main",
+}
+
+# Placeholder credentials used in replay mode so the entry points pass their env checks
+REPLAY_ENV = {
+    "GITHUB_TOKEN": "replay-github-token",
+    "TAVILY_API_KEY": "replay-tavily-key",
+    "OPENAI_API_KEY": "replay-openai-key",
+    "TWITTER_API_KEY": "replay-twitter-key",
+    "TWITTER_API_SECRET": "replay-twitter-secret",
+    "TWITTER_ACCESS_TOKEN": "replay-twitter-token",
+    "TWITTER_ACCESS_TOKEN_SECRET": "replay-twitter-token-secret",
+}
+
+
+class StageTimer:
+    """Accumulates inclusive wall time per pipeline stage."""
+
+    def __init__(self) -> None:
+        self.totals: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        timer = self
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timer.totals[stage] += time.perf_counter() - start
+                timer.calls[stage] += 1
+
+        timed.__wrapped__ = func
+        return timed
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage: {"total_s": round(self.totals[stage], 6), "calls": self.calls[stage]}
+            for stage in sorted(self.totals)
+        }
+
+
+@contextmanager
+def _patched(owner: Any, name: str, value: Any) -> Iterator[None]:
+    original = getattr(owner, name)
+    setattr(owner, name, value)
+    try:
+        yield
+    finally:
+        setattr(owner, name, original)
+
+
+@contextmanager
+def _env(overrides: Dict[str, str]) -> Iterator[None]:
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _local_remote(readme: str, workdir: str) -> str:
+    """Create a bare repository holding ``readme`` on ``main`` and return its path."""
+    seed = os.path.join(workdir, "seed")
+    bare = os.path.join(workdir, "remote.git")
+    repo = git.Repo.init(seed, initial_branch="main")
+    with open(os.path.join(seed, "README.md"), "w", encoding="utf-8") as f:
+        f.write(readme)
+    repo.index.add(["README.md"])
+    repo.index.commit("Benchmark fixture")
+    subprocess.run(["git", "clone", "--bare", "-q", seed, bare], check=True)
+    return bare
+
+
+def _redirect_clone(cassette: Cassette, workdir: str, calls: Dict[str, int]) -> Callable:
+    """Build a ``Repo.clone_from`` replacement that never touches the real remote.
+
+    In record mode the real repository is cloned once to capture its README; in both
+    modes the working clone points at a local bare repository so pushes stay local.
+    """
+    original = git.Repo.clone_from
+
+    def clone_from(url: str, to_path: str, **kwargs: Any) -> git.Repo:
+        calls["git"] += 1
+        readme = cassette.fixture("readme")
+        if readme is None:
+            if cassette.mode != "record":
+                raise RuntimeError("Cassette has no README fixture to replay the clone from")
+            snapshot = original(url, os.path.join(workdir, "snapshot"), depth=1)
+            with open(os.path.join(snapshot.working_dir, "README.md"), encoding="utf-8") as f:
+                readme = f.read()
+            cassette.set_fixture("readme", readme)
+        return original(_local_remote(readme, workdir), to_path)
+
+    return clone_from
+
+
+def run_benchmark(target: str, cassette_path: str, mode: str = "replay",
+                  skip_sleep: bool = True) -> Dict[str, Any]:
+    """Run one entry point under a cassette and collect timing, call and memory figures."""
+    if target not in ENTRY_POINTS:
+        raise ValueError(f"Unknown benchmark target: {target}")
+
+    timer = StageTimer()
+    slept = {"seconds": 0.0}
+    git_calls: Dict[str, int] = defaultdict(int)
+
+    def fake_sleep(seconds: float) -> None:
+        slept["seconds"] += max(0.0, seconds)
+
+    with ExitStack() as stack, tempfile.TemporaryDirectory() as workdir:
+        if mode == "replay":
+            stack.enter_context(_env({k: os.environ.get(k) or v for k, v in REPLAY_ENV.items()}))
+        # A fresh run ID per benchmark run, so it never resumes another run's checkpoints
+        stack.enter_context(_env({"AWESOME_RUN_ID": f"benchmark-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"}))
+        cassette = stack.enter_context(Cassette(cassette_path, mode))
+
+        for module_name, class_name, method, stage in STAGES[target]:
+            owner = getattr(importlib.import_module(module_name), class_name)
+            stack.enter_context(_patched(owner, method, timer.wrap(stage, getattr(owner, method))))
+        stack.enter_context(_patched(git.Repo, "clone_from",
+                                     staticmethod(_redirect_clone(cassette, workdir, git_calls))))
+        if mode == "replay" and skip_sleep:
+            # Client-side politeness delays (e.g. arXiv's 3s page delay) are not our cost
+            stack.enter_context(_patched(time, "sleep", fake_sleep))
+
+        entry = importlib.import_module(ENTRY_POINTS[target])
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            exit_status = entry.main()
+        except SystemExit as e:
+            exit_status = e.code
+        finally:
+            wall_time = time.perf_counter() - started
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        calls = dict(cassette.call_counts)
+        calls.update(git_calls)
+        return {
+            "target": target,
+            "mode": mode,
+            "cassette": str(cassette_path),
+            "commit": _current_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "exit_status": exit_status,
+            "wall_time_s": round(wall_time, 6),
+            "skipped_sleep_s": round(slept["seconds"], 6),
+            "stages": timer.report(),
+            "calls": dict(sorted(calls.items())),
+            "tokens": dict(cassette.tokens),
+            "peak_memory_bytes": peak_memory,
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+
+
+def _current_commit() -> str:
+    try:
+        return git.Repo(search_parent_directories=True).head.commit.hexsha[:12]
+    except Exception:
+        return "unknown"
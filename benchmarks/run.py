@@ -0,0 +1,51 @@
+"""Run end-to-end benchmarks against recorded cassettes.
+
+Usage:
+    # Record real arXiv/Tavily/GitHub/OpenAI/Twitter traffic (needs real credentials)
+    python -m benchmarks.run awesome_updater --mode record
+
+    # Replay offline and write a results file that can be diffed between commits
+    python -m benchmarks.run awesome_updater news_poster
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.harness import ENTRY_POINTS, run_benchmark
+from utils.logger import logger
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Record/replay benchmark for the pipelines")
+    parser.add_argument("targets", nargs="+", choices=sorted(ENTRY_POINTS))
+    parser.add_argument("--mode", choices=["record", "replay"], default="replay")
+    parser.add_argument("--cassette-dir", default=str(BENCHMARK_DIR / "cassettes"))
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--keep-sleep", action="store_true",
+                        help="Honour client-side sleeps during replay")
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        logger.warning("Record mode talks to the real services and posts to Twitter")
+
+    results = {}
+    for target in args.targets:
+        cassette = Path(args.cassette_dir) / f"{target}.json"
+        logger.info(f"Running {target} benchmark ({args.mode}) with cassette {cassette}")
+        results[target] = run_benchmark(target, str(cassette), args.mode,
+                                        skip_sleep=not args.keep_sleep)
+
+    commit = next(iter(results.values()))["commit"]
+    output = Path(args.output) if args.output else BENCHMARK_DIR / "results" / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    logger.info(f"Benchmark results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""Scale benchmark for the score → dedup → format → merge path.
+
+Runs the real ``ContentFetcher`` scoring/dedup, the entry formatter and
+``ContentMerger`` (whole and section-sharded) against synthetic inputs of growing size. The ``stream`` stage
+runs the bounded normalize → dedup → score → top-K select pipeline over a
+generator of the same candidates, for comparison with the list-based stages. The GPT service is a
+local fake, so no network access or API keys are needed.
+
+Usage:
+    PYTHONPATH=src:. python -m benchmarks.scale --levels 1000:0.5,10000:2,100000:8
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from awesome_updater.core.candidate_selector import CandidateSelector
+from awesome_updater.core.content_fetcher import ContentFetcher
+from awesome_updater.core.content_merger import ContentMerger
+from awesome_updater.core.entry_formatter import format_entries
+from benchmarks.synthetic import generate_candidates, generate_readme, iter_candidates
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_LEVELS = "1000:0.25,10000:1,30000:3,100000:8"
+STAGE_NAMES = ["score", "dedup", "sort", "format", "merge", "merge_sharded", "stream"]
+
+
+class FakeGPTService:
+    """Stands in for ``GPTService``: appends the new entries to the current README or section."""
+
+    CURRENT_MARKER = "Here is the current content:\n"
+    NEW_MARKER = "\n\nHere is the new content to analyze and potentially merge:\n"
+    END_MARKER = "\n\nPlease analyze both"
+    SECTION_MARKERS = ("Here is one section of the list:\n",
+                       "\n\nHere are new entries routed to this section:\n",
+                       "\n\nAdd the relevant new entries")
+
+    def __init__(self) -> None:
+        self.prompt_chars = 0
+        self.calls = 0
+
+    def complete(self, prompt: str, system_prompt: Optional[str] = None, **kwargs: Any) -> str:
+        self.calls += 1
+        self.prompt_chars += len(prompt) + len(system_prompt or "")
+        markers = (self.CURRENT_MARKER, self.NEW_MARKER, self.END_MARKER)
+        if prompt.startswith(self.SECTION_MARKERS[0]):
+            markers = self.SECTION_MARKERS
+        start = prompt.index(markers[0]) + len(markers[0])
+        middle = prompt.index(markers[1])
+        end = prompt.index(markers[2], middle)
+        current = prompt[start:middle]
+        new = prompt[middle + len(markers[1]):end]
+        return f"{current}\n{new}".strip()
+
+
+def _measure(func: Callable[[], Any]) -> Tuple[Any, float, int]:
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    return result, elapsed, max(0, peak - before)
+
+
+def run_level(count: int, readme_mb: float, seed: int = 0) -> Dict[str, Any]:
+    """Run every stage once for ``count`` candidates and a README of ``readme_mb`` MB."""
+    candidates = generate_candidates(count, seed)
+    readme = generate_readme(int(readme_mb * 1024 * 1024), seed)
+    fetcher = ContentFetcher("scale-benchmark-token")
+    gpt = FakeGPTService()
+    stages: Dict[str, Dict[str, float]] = {}
+
+    def score() -> None:
+        for item in candidates:
+            item['impact_score'] = fetcher._calculate_impact_score(item)
+
+    _, elapsed, peak = _measure(score)
+    stages["score"] = {"seconds": elapsed, "peak_bytes": peak}
+
+    unique, elapsed, peak = _measure(lambda: fetcher._deduplicate(candidates))
+    stages["dedup"] = {"seconds": elapsed, "peak_bytes": peak}
+
+    def sort() -> List[Dict[str, Any]]:
+        return sorted(unique, key=lambda x: x.get('impact_score', 0), reverse=True)
+
+    ranked, elapsed, peak = _measure(sort)
+    stages["sort"] = {"seconds": elapsed, "peak_bytes": peak}
+
+    formatted, elapsed, peak = _measure(lambda: "\n".join(format_entries(ranked)))
+    stages["format"] = {"seconds": elapsed, "peak_bytes": peak}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        readme_path = os.path.join(workdir, "README.md")
+        with open(readme_path, "w", encoding="utf-8") as f:
+            f.write(readme)
+        merger = ContentMerger(readme_path, gpt, mode="whole")
+        merged, elapsed, peak = _measure(lambda: merger.merge_content(formatted))
+        stages["merge"] = {"seconds": elapsed, "peak_bytes": peak}
+
+        with open(readme_path, "w", encoding="utf-8") as f:
+            f.write(readme)
+        # No output limit here: the fake service has none, and this measures routing and reassembly
+        merger = ContentMerger(readme_path, gpt, mode="sharded", max_output_tokens=sys.maxsize)
+        merged, elapsed, peak = _measure(lambda: merger.merge_content(formatted))
+        stages["merge_sharded"] = {"seconds": elapsed, "peak_bytes": peak}
+
+    def stream() -> Any:
+        def scored(items: Any) -> Any:
+            for item in items:
+                item['impact_score'] = fetcher._calculate_impact_score(item)
+                yield item
+        unique_items = fetcher._iter_unique(fetcher._iter_normalized(iter_candidates(count, seed), 1500))
+        return CandidateSelector().select(scored(unique_items))
+
+    _, elapsed, peak = _measure(stream)
+    stages["stream"] = {"seconds": elapsed, "peak_bytes": peak}
+
+    return {
+        "candidates": count,
+        "unique_candidates": len(unique),
+        "readme_bytes": len(readme.encode("utf-8")),
+        "formatted_bytes": len(formatted.encode("utf-8")),
+        "merge_prompt_chars": gpt.prompt_chars,
+        "merged": merged,
+        "stages": {name: {"seconds": round(v["seconds"], 6), "peak_bytes": v["peak_bytes"]}
+                   for name, v in stages.items()},
+        "total_seconds": round(sum(v["seconds"] for v in stages.values()), 6),
+    }
+
+
+def _write_csv(results: List[Dict[str, Any]], path: Path) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["candidates", "readme_bytes", "stage", "seconds", "peak_bytes"])
+        for result in results:
+            for stage, values in result["stages"].items():
+                writer.writerow([result["candidates"], result["readme_bytes"], stage,
+                                 values["seconds"], values["peak_bytes"]])
+
+
+def _plot(results: List[Dict[str, Any]], path: Path) -> bool:
+    """Plot time and memory against input size; skipped when matplotlib is missing."""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return False
+
+    sizes = [r["candidates"] for r in results]
+    fig, (time_ax, mem_ax) = plt.subplots(1, 2, figsize=(12, 5))
+    for stage in STAGE_NAMES:
+        time_ax.plot(sizes, [r["stages"][stage]["seconds"] for r in results], marker="o", label=stage)
+        mem_ax.plot(sizes, [r["stages"][stage]["peak_bytes"] / 2**20 for r in results],
+                    marker="o", label=stage)
+    for ax, label in ((time_ax, "seconds"), (mem_ax, "peak MiB")):
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlabel("candidates")
+        ax.set_ylabel(label)
+        ax.grid(True, which="both", alpha=0.3)
+        ax.legend()
+    fig.suptitle("awesome_updater scale benchmark")
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Scale benchmark for score/dedup/format/merge")
+    parser.add_argument("--levels", default=DEFAULT_LEVELS,
+                        help="Comma-separated <candidates>:<readme MB> pairs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output-dir", default=str(BENCHMARK_DIR / "results"))
+    args = parser.parse_args()
+
+    levels = [(int(c), float(mb)) for c, mb in (pair.split(":") for pair in args.levels.split(","))]
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tracemalloc.start()
+    results = []
+    for count, readme_mb in levels:
+        result = run_level(count, readme_mb, args.seed)
+        results.append(result)
+        print(f"{count:>8} candidates, {result['readme_bytes'] / 2**20:6.2f} MiB README: "
+              + ", ".join(f"{name} {v['seconds']:.3f}s" for name, v in result["stages"].items()))
+    tracemalloc.stop()
+
+    with open(output_dir / "scale.json", "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    _write_csv(results, output_dir / "scale.csv")
+    if _plot(results, output_dir / "scale.png"):
+        print(f"Plot written to {output_dir / 'scale.png'}")
+    else:
+        print("matplotlib not installed; wrote scale.json and scale.csv only")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""Synthetic candidate sets and awesome-list READMEs for scale testing.
+
+Usage:
+    python -m benchmarks.synthetic candidates --count 50000 --output /tmp/candidates.json
+    python -m benchmarks.synthetic readme --size-mb 4 --output /tmp/README.md
+"""
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List
+
+TOPICS = [
+    "embodied agents", "world models", "humanoid locomotion", "dexterous manipulation",
+    "vision-language-action models", "sim-to-real transfer", "legged robots",
+    "mobile manipulation", "imitation learning", "diffusion policies",
+    "foundation models for robotics", "tactile sensing", "visual navigation",
+    "reinforcement learning from human feedback", "multi-robot coordination",
+]
+METHODS = [
+    "a transformer-based policy", "a latent diffusion planner", "a hierarchical controller",
+    "a self-supervised representation", "a graph neural network", "a model-predictive controller",
+    "a mixture-of-experts policy", "a large language model planner", "a contrastive encoder",
+]
+BENCHMARKS = [
+    "RLBench", "Meta-World", "CALVIN", "Habitat", "LIBERO", "ManiSkill", "BEHAVIOR-1K",
+    "Open X-Embodiment", "DROID", "AI2-THOR",
+]
+VENUES = ["ICML", "NeurIPS", "ICLR", "RSS", "CoRL", "ICRA", "IROS", "arXiv preprint"]
+LABS = ["Meta AI", "Google Research", "DeepMind", "BAIR", "Stanford REAL", "CMU RED", "MIT CSAIL"]
+AUTHORS = [
+    "Sergey Levine", "Chelsea Finn", "Pieter Abbeel", "Lerrel Pinto", "Jitendra Malik",
+    "Alice Zhang", "Bob Kumar", "Carla Rossi", "Diego Santos", "Emma Chen", "Farid Haddad",
+    "Grace Okafor", "Hiro Tanaka", "Ines Müller", "Jonas Berg", "Kim Park",
+]
+SECTIONS = [
+    "Foundation Models & World Models", "Perception & Understanding", "Learning & Control",
+    "Simulation & Environments", "Hardware & Platforms", "Datasets & Benchmarks",
+    "Companies & Research Labs",
+]
+
+ABSTRACT_MIN_CHARS = 800
+ABSTRACT_MAX_CHARS = 2000
+
+
+def _abstract(rng: random.Random) -> str:
+    topic, other = rng.sample(TOPICS, 2)
+    method = rng.choice(METHODS)
+    bench = rng.choice(BENCHMARKS)
+    sentences = [
+        f"We study {topic} and propose {method} that leverages {other}.",
+        f"Our approach is trained on {rng.randint(10, 900)}k trajectories collected "
+        f"across {rng.randint(2, 40)} robot embodiments.",
+        f"On {bench} it improves success rate by {rng.uniform(2, 35):.1f}% over prior work.",
+        f"Experiments on real hardware show robust generalization to unseen objects "
+        f"and scenes.",
+    ]
+    if rng.random() < 0.2:
+        sentences.append(f"This work was done at {rng.choice(LABS)}.")
+    if rng.random() < 0.3:
+        sentences.append(f"Accepted at {rng.choice(VENUES)}.")
+    body = sentences[1:]
+    # Real arXiv abstracts run about 800-2000 characters; pad with further findings
+    target = min(ABSTRACT_MAX_CHARS, max(ABSTRACT_MIN_CHARS, int(rng.gauss(1350, 300))))
+    length = sum(len(sentence) + 1 for sentence in sentences)
+    while length < target:
+        topic = rng.choice(TOPICS)
+        sentence = rng.choice([
+            f"We further analyze how {rng.choice(METHODS)} scales with data for {topic}.",
+            f"Ablations on {rng.choice(BENCHMARKS)} show that each component contributes "
+            f"to the final performance on {topic}.",
+            f"Compared with {rng.choice(METHODS)}, our method needs {rng.randint(2, 10)}x fewer "
+            f"demonstrations and transfers to {rng.randint(2, 12)} new tasks without fine-tuning.",
+            f"We release code, pretrained checkpoints and a benchmark suite for {topic} "
+            f"to support reproducible research.",
+        ])
+        if length + len(sentence) + 1 > ABSTRACT_MAX_CHARS:
+            break
+        body.append(sentence)
+        length += len(sentence) + 1
+    rng.shuffle(body)
+    return " ".join([sentences[0]] + body)
+
+
+def _arxiv_id(rng: random.Random, published: datetime) -> str:
+    return f"{published:%y%m}.{rng.randint(0, 99999):05d}"
+
+
+def iter_candidates(count: int, seed: int = 0, duplicate_ratio: float = 0.1) -> Iterator[Dict[str, Any]]:
+    """Yield ``count`` candidate items shaped like ``ContentFetcher`` output.
+
+    About ``duplicate_ratio`` of the items repeat an earlier item (as a different
+    arXiv version or source) so deduplication has real work to do.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    recent: List[Dict[str, Any]] = []
+    for index in range(count):
+        if recent and rng.random() < duplicate_ratio:
+            original = rng.choice(recent)
+            link = original["links"][0]
+            variant = link.replace("/abs/", "/pdf/") + "v2" if "arxiv.org" in link else link + "/"
+            yield dict(original, links=[variant] + original["links"][1:])
+            continue
+
+        published = now - timedelta(days=rng.expovariate(1 / 120))
+        title = f"{rng.choice(TOPICS).title()} with {rng.choice(METHODS)[2:].title()} #{index}"
+        owner = rng.choice(["openai", "google-deepmind", "facebookresearch", "nvlabs", "user"])
+        repo = f"{owner}/{title.split(' with ')[0].lower().replace(' ', '-')}-{index}"
+        stars = int(rng.lognormvariate(4, 1.6))
+        if rng.random() < 0.7:
+            arxiv_id = _arxiv_id(rng, published)
+            links = [f"https://arxiv.org/abs/{arxiv_id}"]
+            if rng.random() < 0.5:
+                links.append(f"https://github.com/{repo}")
+            item: Dict[str, Any] = {
+                "title": title,
+                "authors": rng.sample(AUTHORS, rng.randint(1, 6)),
+                "description": _abstract(rng),
+                "links": links,
+                "type": "research",
+                "published_date": published.isoformat(),
+                "citations": int(rng.expovariate(1 / 15)),
+            }
+        else:
+            item = {
+                "title": repo,
+                "description": _abstract(rng).split(".")[0],
+                "links": [f"https://github.com/{repo}"],
+                "type": rng.choice(["tool", "product", "dataset"]),
+                "published_date": published.isoformat(),
+            }
+        item["metrics"] = {
+            "stars": stars,
+            "forks": stars // rng.randint(3, 12),
+            "updated_at": (published + timedelta(days=rng.randint(0, 60))).isoformat(),
+            "created_at": published.isoformat(),
+        }
+        if len(recent) < 1000:
+            recent.append(item)
+        else:
+            recent[rng.randrange(len(recent))] = item
+        yield item
+
+
+def generate_candidates(count: int, seed: int = 0, duplicate_ratio: float = 0.1) -> List[Dict[str, Any]]:
+    """Return a list of ``count`` synthetic candidate items."""
+    return list(iter_candidates(count, seed, duplicate_ratio))
+
+
+def generate_readme(target_bytes: int, seed: int = 0) -> str:
+    """Build an awesome-list README of roughly ``target_bytes`` bytes.
+
+    Sections alternate between paper tables and project lists, matching the layout
+    the merge prompts expect.
+    """
+    rng = random.Random(seed)
+    parts = ["# Awesome Embodied AI\n\n", "A curated list of embodied AI resources.\n\n"]
+    per_section = max(1, target_bytes // len(SECTIONS))
+    for number, section in enumerate(SECTIONS):
+        header = f"## {section}\n\n"
+        parts.append(header)
+        section_size = 0
+        if number % 2 == 0:
+            table_header = "| Name | Description | Paper | Code |\n| ---------- | ---------- | ---------- | ---------- |\n"
+            parts.append(table_header)
+            section_size += len(table_header)
+        entry = 0
+        while section_size < per_section:
+            entry += 1
+            name = f"{rng.choice(TOPICS).title()} {number}-{entry}"
+            description = _abstract(rng).split(".")[0]
+            repo = f"https://github.com/lab{number}/{name.lower().replace(' ', '-')}"
+            if number % 2 == 0:
+                arxiv_id = f"{rng.randint(18, 25)}{rng.randint(1, 12):02d}.{rng.randint(0, 99999):05d}"
+                line = (f"| {name} | {description} | [Paper](https://arxiv.org/abs/{arxiv_id}) "
+                        f"| [Code]({repo}) |\n")
+            else:
+                line = f"- [{name}]({repo}) - {description} [⭐{int(rng.lognormvariate(5, 1.5))}]\n"
+            parts.append(line)
+            section_size += len(line.encode("utf-8"))
+        parts.append("\n")
+    return "".join(parts)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate synthetic scale-test inputs")
+    sub = parser.add_subparsers(dest="kind", required=True)
+    candidates = sub.add_parser("candidates")
+    candidates.add_argument("--count", type=int, default=10000)
+    candidates.add_argument("--seed", type=int, default=0)
+    candidates.add_argument("--output", required=True)
+    readme = sub.add_parser("readme")
+    readme.add_argument("--size-mb", type=float, default=2.0)
+    readme.add_argument("--seed", type=int, default=0)
+    readme.add_argument("--output", required=True)
+    args = parser.parse_args()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        if args.kind == "candidates":
+            json.dump(generate_candidates(args.count, args.seed), f)
+        else:
+            f.write(generate_readme(int(args.size_mb * 1024 * 1024), args.seed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
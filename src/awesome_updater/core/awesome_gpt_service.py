@@ -1,6 +1,9 @@
 from typing import Optional, Dict, List
+import re
 from utils.gpt_service import GPTService
 from utils.logger import logger
+from utils.merge_validator import validate_merge
+from awesome_updater.core.candidate_selector import estimate_tokens
 
 class AwesomeGPTService:
     """Specialized GPT service for Awesome List operations."""
@@ -37,9 +40,15 @@ Rules for Content Structure:
     TITLE_PROMPT = """You are a technical writer specializing in making research content engaging while maintaining accuracy.
 Your task is to rewrite titles to be more engaging while preserving technical accuracy and key terms."""
     
-    def __init__(self, gpt_service: GPTService):
-        """Initialize with a GPT service instance."""
+    def __init__(self, gpt_service: GPTService, max_removals: int = 0):
+        """Initialize with a GPT service instance.
+        
+        Args:
+            gpt_service: Service used for completions
+            max_removals: Entries a merge may drop before dropped entries are restored
+        """
         self.gpt = gpt_service
+        self.max_removals = max_removals
         
     def generate_attractive_title(self, title: str) -> str:
         """Generate a more engaging version of an article title."""
@@ -61,7 +70,8 @@ Your task is to rewrite titles to be more engaging while preserving technical ac
                 prompt=prompt,
                 system_prompt=self.TITLE_PROMPT,
                 max_tokens=100,
-                temperature=0.7
+                temperature=0.7,
+                task="title"
             )
             return new_title if new_title else title
         except Exception as e:
@@ -94,27 +104,16 @@ Focus on maintaining a high-quality, well-organized list while preserving the ex
                 prompt=prompt,
                 system_prompt=self.CURATOR_PROMPT,
                 max_tokens=4000,
-                temperature=0.1  # Low temperature for consistent curation
+                temperature=0.1,  # Low temperature for consistent curation
+                task="merge"
             )
             
             if not merged_content:
                 return current_content
                 
-            # Safety checks
-            if len(merged_content) < len(current_content) * 0.5:
-                logger.warning("Merged content is too short, might have lost valuable content")
-                return current_content
-            
-            content_indicators = ["github.com", "arxiv.org", "doi.org"]
-            current_indicators = sum(1 for i in content_indicators if i in current_content)
-            merged_indicators = sum(1 for i in content_indicators if i in merged_content)
-            
-            if merged_indicators < current_indicators * 0.7:
-                logger.warning("Merged content has lost too many valuable references")
-                return current_content
-            
-            if "| ----------" not in merged_content and "| ----------" in current_content:
-                logger.warning("Merged content has lost table formatting")
+            # Entry-level check: sections must survive, dropped entries are put back
+            merged_content, _ = validate_merge(current_content, merged_content, self.max_removals)
+            if merged_content is None:
                 return current_content
             
             logger.info("Successfully merged content using GPT")
@@ -122,4 +121,54 @@ Focus on maintaining a high-quality, well-organized list while preserving the ex
             
         except Exception as e:
             logger.error(f"Failed to merge content using GPT: {e}")
-            return current_content 
\ No newline at end of file
+            return current_content
+
+    def merge_section(self, section: str, new_entries: List[str], max_output_tokens: int = 16000) -> str:
+        """Merge new entries into one ``##`` section of the list; the section itself on failure.
+        
+        The prompt holds only this section, so its size (and the response) is bounded
+        by the section rather than the whole README.
+        """
+        heading = section.split("\n", 1)[0]
+        new_content = "\n".join(new_entries)
+        max_tokens = int((estimate_tokens(section) + estimate_tokens(new_content)) * 1.2) + 200
+        if max_tokens > max_output_tokens:
+            logger.warning(f"Section '{heading}' needs ~{max_tokens} output tokens, "
+                           f"over the {max_output_tokens} limit; leaving it unchanged")
+            return section
+        try:
+            prompt = f"""Here is one section of the list:
+{section}
+
+Here are new entries routed to this section:
+{new_content}
+
+Add the relevant new entries to this section, keeping its exact table and list formatting
+and the alphabetical order of entries. Keep every existing entry unless it is clearly outdated.
+Return only the updated section, starting with the line "{heading}", and nothing else."""
+
+            merged = self.gpt.complete(
+                prompt=prompt,
+                system_prompt=self.CURATOR_PROMPT,
+                max_tokens=max_tokens,
+                temperature=0.1,
+                task="merge_section"
+            )
+            if not merged:
+                return section
+            # Drop a surrounding ```markdown fence if the model added one
+            merged = re.sub(r"^```\w*\n|\n```$", "", merged.strip())
+            if not merged.startswith(heading):
+                logger.warning(f"Merged section does not start with '{heading}'; keeping it unchanged")
+                return section
+            
+            merged, _ = validate_merge(section, merged, self.max_removals)
+            if merged is None:
+                return section
+            # Keep the blank lines that separated this section from the next one
+            trailing = section[len(section.rstrip()):]
+            return merged.rstrip() + trailing
+            
+        except Exception as e:
+            logger.error(f"Failed to merge section '{heading}': {e}")
+            return section
@@ -0,0 +1,172 @@
+import heapq
+import itertools
+import json
+import math
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from awesome_updater.core.entry_formatter import format_entry, truncate_text
+from utils.logger import logger
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional; fall back to a character heuristic
+    _encoding = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the prompt tokens a piece of text costs."""
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    # English markdown averages roughly four characters per token
+    return math.ceil(len(text) / 4) + 1
+
+
+@dataclass
+class CutEntry:
+    title: str
+    bucket: str
+    score: float
+    tokens: int
+    reason: str
+
+
+@dataclass
+class SelectionResult:
+    """Entries chosen for the merge prompt, plus what was cut and why."""
+
+    items: List[Dict[Any, Any]] = field(default_factory=list)
+    entries: List[str] = field(default_factory=list)
+    tokens: int = 0
+    budget: int = 0
+    cut: List[CutEntry] = field(default_factory=list)
+    cut_by_reason: Dict[str, int] = field(default_factory=dict)
+    # Cut entries beyond this are only counted, so a huge candidate stream stays cheap
+    max_cut_records: int = 1000
+
+    def add_cut(self, entry: CutEntry) -> None:
+        self.cut_by_reason[entry.reason] = self.cut_by_reason.get(entry.reason, 0) + 1
+        if len(self.cut) < self.max_cut_records:
+            self.cut.append(entry)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "selected": len(self.entries),
+            "tokens": self.tokens,
+            "budget": self.budget,
+            "cut": sum(self.cut_by_reason.values()),
+            "cut_by_reason": dict(self.cut_by_reason),
+        }
+
+
+class CandidateSelector:
+    """Picks the best candidates for the merge prompt within a token budget.
+
+    Candidates are grouped into buckets (by content type by default). Each bucket
+    keeps a bounded min-heap of its top-K entries, so memory stays proportional to
+    the quotas rather than the number of candidates, and ``items`` can be a stream
+    that is consumed once. The survivors are then packed
+    greedily, best score first, into the token budget.
+    """
+
+    def __init__(self, token_budget: int = 3000, quotas: Optional[Dict[str, int]] = None,
+                 max_entry_tokens: int = 250,
+                 bucket: Callable[[Dict[Any, Any]], str] = lambda item: item.get('type') or 'default'):
+        self.token_budget = token_budget
+        self.quotas = quotas or {}
+        self.max_entry_tokens = max_entry_tokens
+        self.bucket = bucket
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "CandidateSelector":
+        settings = (config or {}).get('selection') or {}
+        return cls(
+            token_budget=settings.get('token_budget', 3000),
+            quotas=settings.get('quotas'),
+            max_entry_tokens=settings.get('max_entry_tokens', 250),
+        )
+
+    def _quota(self, bucket: str) -> int:
+        return self.quotas.get(bucket, self.quotas.get('default', 10))
+
+    def _fit_entry(self, item: Dict[Any, Any]) -> Tuple[str, int]:
+        """Format an item, shortening its description until the entry fits ``max_entry_tokens``.
+
+        Returns the entry and its tokens; it is still over the limit only when even an
+        empty description does not fit (e.g. a very long title).
+        """
+        entry = format_entry(item)
+        tokens = estimate_tokens(entry)
+        description = item.get('description') or ''
+        while tokens > self.max_entry_tokens and description:
+            # Drop the overflow (about four characters per token) plus a small margin
+            keep = len(description) - (tokens - self.max_entry_tokens) * 4 - 8
+            description = truncate_text(description, keep) if keep > 0 else ''
+            entry = format_entry(item, description)
+            tokens = estimate_tokens(entry)
+        return entry, tokens
+
+    def select(self, items: Iterable[Dict[Any, Any]]) -> SelectionResult:
+        result = SelectionResult(budget=self.token_budget)
+        heaps: Dict[str, List[Tuple[float, int, Dict[Any, Any], str, int]]] = {}
+        seq = itertools.count()
+
+        for item in items:
+            bucket = self.bucket(item)
+            score = item.get('impact_score', 0)
+            heap = heaps.setdefault(bucket, [])
+            if len(heap) >= self._quota(bucket) and (not heap or score <= heap[0][0]):
+                # Cannot make the bucket's top-K, so skip formatting it; tokens are only
+                # counted for cut entries that are kept for the report
+                tokens = estimate_tokens(format_entry(item)) if len(result.cut) < result.max_cut_records else 0
+                result.add_cut(CutEntry(item.get('title') or '', bucket, score, tokens, 'bucket_quota'))
+                continue
+
+            entry, tokens = self._fit_entry(item)
+            if tokens > self.max_entry_tokens:
+                result.add_cut(CutEntry(item.get('title') or '', bucket, score, tokens, 'entry_too_long'))
+                continue
+
+            candidate = (score, next(seq), item, entry, tokens)
+            if len(heap) < self._quota(bucket):
+                heapq.heappush(heap, candidate)
+                continue
+            if heap and score > heap[0][0]:
+                candidate = heapq.heapreplace(heap, candidate)
+            _, _, evicted, _, evicted_tokens = candidate
+            result.add_cut(CutEntry(evicted.get('title') or '', bucket,
+                                    evicted.get('impact_score', 0), evicted_tokens, 'bucket_quota'))
+
+        finalists = sorted(
+            ((entry, bucket) for bucket, heap in heaps.items() for entry in heap),
+            key=lambda pair: (pair[0][0], -pair[0][1]),
+            reverse=True
+        )
+        for (score, _, item, entry, tokens), bucket in finalists:
+            if result.tokens + tokens > self.token_budget:
+                result.add_cut(CutEntry(item.get('title') or '', bucket, score, tokens, 'token_budget'))
+                continue
+            result.items.append(item)
+            result.entries.append(entry)
+            result.tokens += tokens
+
+        summary = result.summary()
+        logger.info(f"Selected {summary['selected']} entries ({summary['tokens']}/{self.token_budget} tokens), "
+                    f"cut {summary['cut']}: {summary['cut_by_reason']}")
+        return result
+
+    @staticmethod
+    def write_report(result: SelectionResult, path: str) -> None:
+        """Write the selection summary and every cut entry with its reason as JSON."""
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "summary": result.summary(),
+                    "selected": [item.get('title') for item in result.items],
+                    "cut": [asdict(entry) for entry in result.cut],
+                }, f, indent=2, default=str)
+        except OSError as e:
+            logger.error(f"Failed to write selection report: {e}")
@@ -0,0 +1,258 @@
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+import requests
+from utils.logger import logger
+from utils.resilience import Deadline
+from utils.tracing import tracer
+from awesome_updater.core.github_client import GitHubClient
+from awesome_updater.core.metrics_store import MetricsStore
+
+HOUR = 3600.0
+LAST_BUILD_PATTERN = re.compile(r"<lastBuildDate>\s*(.*?)\s*</lastBuildDate>", re.DOTALL)
+
+
+@dataclass
+class SourceState:
+    """What the scheduler has learned about one source, persisted between invocations."""
+
+    interval: float  # seconds between probes
+    last_probe: float = 0.0
+    last_change: float = 0.0
+    mean_gap: float = 0.0  # moving average of the time between observed changes
+    probes: int = 0
+    changes: int = 0
+    validators: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], interval: float) -> "SourceState":
+        known = {key: value for key, value in data.items() if key in cls.__dataclass_fields__}
+        return cls(**{"interval": interval, **known})
+
+
+@dataclass
+class ProbeResult:
+    source: str
+    changed: bool
+    validators: Dict[str, Any]
+    detail: str = ""
+
+
+@dataclass
+class Decision:
+    run: bool
+    reason: str
+    results: List[ProbeResult] = field(default_factory=list)
+    probed_at: float = field(default_factory=time.time)
+
+
+class ChangeScheduler:
+    """Decides whether a full update run is worth it by probing sources cheaply first.
+
+    Probes are a conditional GET of the arXiv listing feeds and conditional GETs of the
+    most-starred watched GitHub repos (a 304 costs no quota); without new data a run
+    still happens once ``max_staleness_hours`` passed since the last one. Each probed
+    source is only probed again after its own interval,
+    which follows the observed time between changes: about two probes per expected
+    change, clamped to the source's limits. Probe state is only committed after the
+    full run it triggered succeeded, so a failed run is retried on the next invocation.
+    """
+
+    def __init__(self, state_path: str, github: Optional[GitHubClient] = None,
+                 metrics_store: Optional[MetricsStore] = None,
+                 arxiv_categories: Optional[List[str]] = None,
+                 arxiv_feed_url: str = "https://rss.arxiv.org/rss",
+                 github_repos: int = 30, max_staleness_hours: float = 48,
+                 intervals: Optional[Dict[str, Dict[str, float]]] = None,
+                 timeout: float = 20.0):
+        self.state_path = state_path
+        self.github = github
+        self.metrics_store = metrics_store
+        self.arxiv_categories = arxiv_categories or ["cs.RO", "cs.AI"]
+        self.arxiv_feed_url = arxiv_feed_url.rstrip("/")
+        self.github_repos = github_repos
+        self.max_staleness = max_staleness_hours * HOUR
+        # Per-source probe interval limits in hours
+        self.intervals = {
+            'arxiv': {'min_hours': 1, 'max_hours': 12},
+            'github': {'min_hours': 1, 'max_hours': 24},
+            **(intervals or {}),
+        }
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.state = self._load_state()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict], github: Optional[GitHubClient] = None,
+                    metrics_store: Optional[MetricsStore] = None) -> "ChangeScheduler":
+        settings = (config or {}).get('scheduler') or {}
+        return cls(
+            state_path=settings.get('state_path', '.state/scheduler.json'),
+            github=github,
+            metrics_store=metrics_store,
+            arxiv_categories=settings.get('arxiv_categories'),
+            arxiv_feed_url=settings.get('arxiv_feed_url', "https://rss.arxiv.org/rss"),
+            github_repos=settings.get('github_repos', 30),
+            max_staleness_hours=settings.get('max_staleness_hours', 48),
+            intervals=settings.get('intervals'),
+            timeout=settings.get('timeout_seconds', 20),
+        )
+
+    def _load_state(self) -> Dict[str, Any]:
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable scheduler state {self.state_path}: {e}")
+            return {}
+
+    def _save_state(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+            with open(self.state_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, indent=2)
+        except OSError as e:
+            logger.error(f"Failed to write scheduler state: {e}")
+
+    def _source(self, name: str) -> SourceState:
+        limits = self.intervals.get(name) or {}
+        return SourceState.from_dict((self.state.get('sources') or {}).get(name) or {},
+                                     limits.get('min_hours', 1) * HOUR)
+
+    def _due(self, name: str, now: float) -> bool:
+        source = self._source(name)
+        return now - source.last_probe >= source.interval
+
+    def _probe_arxiv(self, validators: Dict[str, Any]) -> ProbeResult:
+        """Conditional GET of each category's listing feed; its build date marks a new listing."""
+        new_validators = dict(validators)
+        changed = []
+        for category in self.arxiv_categories:
+            previous = validators.get(category) or {}
+            headers = {}
+            if previous.get('etag'):
+                headers['If-None-Match'] = previous['etag']
+            if previous.get('last_modified'):
+                headers['If-Modified-Since'] = previous['last_modified']
+            try:
+                response = self.session.get(f"{self.arxiv_feed_url}/{category}", headers=headers,
+                                            timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                # An unreachable feed cannot prove there is nothing new
+                logger.warning(f"arXiv probe for {category} failed: {e}")
+                changed.append(category)
+                continue
+            if response.status_code == 304:
+                continue
+            if response.status_code != 200:
+                logger.warning(f"arXiv probe for {category}: HTTP {response.status_code}")
+                changed.append(category)
+                continue
+            match = LAST_BUILD_PATTERN.search(response.text)
+            built = match.group(1) if match else hashlib.sha256(response.content).hexdigest()
+            new_validators[category] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'built': built,
+            }
+            if built != previous.get('built'):
+                changed.append(category)
+        return ProbeResult('arxiv', bool(changed), new_validators,
+                           f"new listings: {', '.join(changed)}" if changed else "no new listings")
+
+    def _watched_repos(self) -> List[str]:
+        """The most-starred repos in the metrics store, the ones whose activity matters most."""
+        if not self.metrics_store:
+            return []
+        ranked = sorted(
+            ((series.stars[-1], self.metrics_store.names[index])
+             for index, series in self.metrics_store.series.items() if len(series)),
+            reverse=True
+        )
+        return [name for _, name in ranked[:self.github_repos]]
+
+    def _probe_github(self, validators: Dict[str, Any], deadline: Deadline) -> ProbeResult:
+        """Conditional GETs of watched repos; a push since the last run is a change."""
+        repos = self._watched_repos()
+        if not self.github or not repos:
+            # Nothing to watch yet; the staleness limit still triggers runs
+            return ProbeResult('github', False, validators, "no watched repos to probe")
+        new_validators = dict(validators)
+        pushed = []
+        for repo in repos:
+            previous = validators.get(repo) or {}
+            headers = {'If-None-Match': previous['etag']} if previous.get('etag') else None
+            response = self.github.request(f"repos/{repo}", headers=headers, deadline=deadline)
+            if response is None or response.status_code == 304:
+                continue
+            if response.status_code != 200:
+                continue
+            pushed_at = response.json().get('pushed_at')
+            new_validators[repo] = {'etag': response.headers.get('ETag'), 'pushed_at': pushed_at}
+            if previous and pushed_at != previous.get('pushed_at'):
+                pushed.append(repo)
+        first_probe = not validators
+        return ProbeResult('github', first_probe or bool(pushed), new_validators,
+                           f"{len(pushed)} of {len(repos)} watched repos pushed")
+
+    def probe(self, deadline: Optional[Deadline] = None) -> Decision:
+        """Probe the sources that are due and decide whether to run the full pipeline."""
+        deadline = deadline or Deadline()
+        now = time.time()
+        results = []
+        with tracer.span("scheduler.probe") as span:
+            if self._due('arxiv', now):
+                results.append(self._probe_arxiv(self._source('arxiv').validators))
+            if self._due('github', now):
+                results.append(self._probe_github(self._source('github').validators, deadline))
+            span.set_attributes(probed=len(results), changed=sum(r.changed for r in results))
+
+        for result in results:
+            logger.info(f"Probe {result.source}: {result.detail}")
+        last_run = self.state.get('last_run', 0.0)
+        changed = [result.source for result in results if result.changed]
+        if changed:
+            decision = Decision(True, f"new data from {', '.join(changed)}", results, now)
+        elif now - last_run >= self.max_staleness:
+            decision = Decision(True, "no full run within the staleness limit", results, now)
+        else:
+            decision = Decision(False, "no source changed", results, now)
+        logger.info(f"Scheduler decision: {'run' if decision.run else 'skip'} ({decision.reason})")
+        return decision
+
+    def _learn(self, name: str, result: ProbeResult, now: float) -> None:
+        source = self._source(name)
+        limits = self.intervals.get(name) or {}
+        source.probes += 1
+        source.last_probe = now
+        source.validators = result.validators
+        if result.changed:
+            source.changes += 1
+            if source.last_change:
+                gap = now - source.last_change
+                source.mean_gap = gap if not source.mean_gap else 0.3 * gap + 0.7 * source.mean_gap
+            source.last_change = now
+        # Probe about twice per expected change; a long quiet spell stretches the interval
+        quiet = now - source.last_change if source.last_change else 0.0
+        target = max(source.mean_gap, quiet) / 2
+        source.interval = min(max(target, limits.get('min_hours', 1) * HOUR),
+                              limits.get('max_hours', 24) * HOUR)
+        self.state.setdefault('sources', {})[name] = asdict(source)
+
+    def commit(self, decision: Decision, ran: bool = False) -> None:
+        """Record the probe results, and the full run they triggered when ``ran``."""
+        for result in decision.results:
+            self._learn(result.source, result, decision.probed_at)
+        if ran:
+            self.state['last_run'] = decision.probed_at
+        self._save_state()
+        for name, source in (self.state.get('sources') or {}).items():
+            logger.info(f"{name}: next probe in {source['interval'] / HOUR:.1f}h "
+                        f"({source['changes']}/{source['probes']} probes saw changes)")
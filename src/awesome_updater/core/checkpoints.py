@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional
+
+from awesome_updater.core.fetch_jobs import new_run_id
+from utils.logger import logger
+
+
+def fingerprint(*parts: Any) -> str:
+    """Digest of a stage's inputs; a checkpoint is only reused when it matches."""
+    digest = hashlib.sha256()
+    for part in parts:
+        text = part if isinstance(part, str) else json.dumps(part, sort_keys=True, default=str)
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _write_json(path: str, data: Any) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, default=str)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str) -> Optional[Any]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+        return None
+
+
+class ProfileCheckpoints:
+    """Stage checkpoints of one profile within a run, one JSON file per stage."""
+
+    def __init__(self, path: str, run_id: str):
+        self.path = path
+        self.run_id = run_id
+
+    def load(self, stage: str, inputs: Optional[str] = None) -> Optional[Any]:
+        """The saved output of ``stage``, if it was completed with the same ``inputs``."""
+        record = _read_json(os.path.join(self.path, f"{stage}.json"))
+        if record is None:
+            return None
+        if inputs is not None and record.get("inputs") != inputs:
+            logger.info(f"Checkpoint '{stage}' of run {self.run_id} has different inputs; redoing it")
+            return None
+        logger.info(f"Resuming from checkpoint '{stage}' of run {self.run_id}")
+        return record.get("data")
+
+    def save(self, stage: str, data: Any, inputs: Optional[str] = None) -> None:
+        try:
+            _write_json(os.path.join(self.path, f"{stage}.json"),
+                        {"inputs": inputs, "saved_at": time.time(), "data": data})
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Failed to save checkpoint '{stage}': {e}")
+
+
+class RunCheckpoints:
+    """Checkpoints of an update run, kept under ``<root>/<run_id>/``.
+
+    A run that did not finish is resumed by the next run started within
+    ``resume_within_hours`` (such as a platform restart after a failed push), so
+    completed stages are not repeated. ``AWESOME_RUN_ID`` pins the run ID explicitly.
+    """
+
+    def __init__(self, root: str, run_id: Optional[str] = None,
+                 resume_within_hours: float = 2.0, keep_runs: int = 10):
+        self.root = root
+        self.keep_runs = keep_runs
+        self.run_id = run_id or self._unfinished_run(resume_within_hours) or new_run_id()
+        self.path = os.path.join(root, self.run_id)
+        manifest = self._manifest()
+        if manifest:
+            logger.info(f"Resuming run {self.run_id} (attempt {manifest.get('attempts', 1) + 1})")
+        _write_json(os.path.join(self.path, "run.json"), {
+            "run_id": self.run_id,
+            "status": "running",
+            "started_at": (manifest or {}).get("started_at", time.time()),
+            "attempts": (manifest or {}).get("attempts", 0) + 1,
+        })
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> Optional["RunCheckpoints"]:
+        settings = (config or {}).get('checkpoints') or {}
+        if not settings.get('enabled', False):
+            return None
+        try:
+            return cls(settings.get('path', '.state/runs'), os.getenv("AWESOME_RUN_ID"),
+                       resume_within_hours=settings.get('resume_within_hours', 2),
+                       keep_runs=settings.get('keep_runs', 10))
+        except OSError as e:
+            logger.error(f"Checkpoints disabled: {e}")
+            return None
+
+    def _manifest(self, run_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        return _read_json(os.path.join(self.root, run_id or self.run_id, "run.json"))
+
+    def _runs(self) -> List[str]:
+        """Run IDs, oldest first (they start with their timestamp)."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.isdir(os.path.join(self.root, name)))
+
+    def _unfinished_run(self, resume_within_hours: float) -> Optional[str]:
+        cutoff = time.time() - resume_within_hours * 3600
+        for run_id in reversed(self._runs()):
+            manifest = self._manifest(run_id) or {}
+            if manifest.get("started_at", 0) < cutoff:
+                break
+            if manifest.get("status") != "completed":
+                return run_id
+        return None
+
+    def for_profile(self, name: str) -> ProfileCheckpoints:
+        return ProfileCheckpoints(os.path.join(self.path, name), self.run_id)
+
+    def finish(self, ok: bool) -> None:
+        """Mark the run completed (or failed, so a retry resumes it) and drop old runs."""
+        manifest = self._manifest() or {"run_id": self.run_id}
+        manifest.update(status="completed" if ok else "failed", finished_at=time.time())
+        try:
+            _write_json(os.path.join(self.path, "run.json"), manifest)
+        except OSError as e:
+            logger.error(f"Failed to record run status: {e}")
+        for run_id in self._runs()[:-self.keep_runs] if self.keep_runs else []:
+            if run_id != self.run_id:
+                shutil.rmtree(os.path.join(self.root, run_id), ignore_errors=True)
@@ -0,0 +1,167 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+from utils.logger import logger
+from utils.resilience import CircuitBreaker, CircuitOpenError, Deadline, DeadlineExceeded, call_with_resilience
+from utils.tracing import tracer
+from awesome_updater.core.pdf_links import arxiv_id
+
+# The batch endpoint accepts at most this many IDs per request
+MAX_BATCH_SIZE = 500
+
+
+def _citation_counts(records: Any, expected: int) -> List[Optional[int]]:
+    """Counts from a batch response, which must hold a record or null per requested ID."""
+    if not isinstance(records, list) or len(records) != expected:
+        raise ValueError(f"expected a list of {expected} records, got {type(records).__name__}"
+                         f"{f' of {len(records)}' if isinstance(records, list) else ''}")
+    counts = []
+    for record in records:
+        if record is not None and not isinstance(record, dict):
+            raise ValueError(f"unexpected record {record!r}")
+        count = (record or {}).get("citationCount")
+        counts.append(count if isinstance(count, int) and not isinstance(count, bool) else None)
+    return counts
+
+
+class CitationEnricher:
+    """Looks up citation counts of arXiv papers through a scholarly metadata batch endpoint.
+
+    Uses the Semantic Scholar Graph API (``POST /graph/v1/paper/batch``), which takes
+    up to 500 IDs per request, so a run costs a handful of requests rather than one
+    per paper. Counts, including papers the service does not know yet, are cached
+    per arXiv ID with a TTL. ``base_url`` can point at a local fake for testing.
+    """
+
+    def __init__(self, base_url: str = "https://api.semanticscholar.org", api_key: Optional[str] = None,
+                 cache_path: Optional[str] = None, ttl_hours: float = 72, missing_ttl_hours: float = 24,
+                 batch_size: int = MAX_BATCH_SIZE, timeout: float = 30.0, max_attempts: int = 3):
+        self.base_url = base_url.rstrip("/")
+        self.cache_path = cache_path
+        self.ttl = ttl_hours * 3600
+        self.missing_ttl = missing_ttl_hours * 3600
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.session = requests.Session()
+        if api_key:
+            self.session.headers["x-api-key"] = api_key
+        self.breaker = CircuitBreaker("semantic_scholar")
+        self.cache: Dict[str, Dict[str, Any]] = self._load_cache()
+        # Shared by the fetchers of all list profiles in a run
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> Optional["CitationEnricher"]:
+        """Build an enricher from the ``citations`` config section; None when disabled."""
+        settings = (config or {}).get('citations') or {}
+        if not settings.get('enabled'):
+            return None
+        return cls(
+            base_url=settings.get('base_url', "https://api.semanticscholar.org"),
+            api_key=os.getenv("SEMANTIC_SCHOLAR_API_KEY"),
+            cache_path=settings.get('cache_path'),
+            ttl_hours=settings.get('ttl_hours', 72),
+            missing_ttl_hours=settings.get('missing_ttl_hours', 24),
+            batch_size=settings.get('batch_size', MAX_BATCH_SIZE),
+            timeout=settings.get('timeout_seconds', 30),
+        )
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable citation cache {self.cache_path}: {e}")
+            return {}
+
+    def save_cache(self) -> None:
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            with self._lock, open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump(self.cache, f)
+        except OSError as e:
+            logger.error(f"Failed to write citation cache: {e}")
+
+    def _fresh(self, paper_id: str, now: float) -> bool:
+        entry = self.cache.get(paper_id)
+        if entry is None:
+            return False
+        ttl = self.ttl if entry.get("citations") is not None else self.missing_ttl
+        return now - entry.get("fetched_at", 0) < ttl
+
+    def _fetch_batch(self, paper_ids: List[str], deadline: Deadline) -> List[Optional[Dict[str, Any]]]:
+        """One batch request; the response lists a record (or null) per requested ID, in order."""
+        def request(timeout: float) -> List[Optional[Dict[str, Any]]]:
+            response = self.session.post(
+                f"{self.base_url}/graph/v1/paper/batch",
+                params={"fields": "citationCount"},
+                json={"ids": [f"ARXIV:{paper_id}" for paper_id in paper_ids]},
+                timeout=timeout,
+            )
+            response.raise_for_status()
+            return response.json()
+
+        with tracer.span("citations.batch", source="semantic_scholar", ids=len(paper_ids)):
+            return call_with_resilience(self.breaker, request, deadline,
+                                        timeout=self.timeout, max_attempts=self.max_attempts)
+
+    def lookup(self, paper_ids: List[str], deadline: Optional[Deadline] = None) -> Dict[str, Optional[int]]:
+        """Citation counts by arXiv ID; None for papers the service does not know."""
+        deadline = deadline or Deadline()
+        now = time.time()
+        with self._lock:
+            to_fetch = list(dict.fromkeys(paper_id for paper_id in paper_ids if not self._fresh(paper_id, now)))
+        requests_made = 0
+        for start in range(0, len(to_fetch), self.batch_size):
+            batch = to_fetch[start:start + self.batch_size]
+            try:
+                counts = _citation_counts(self._fetch_batch(batch, deadline), len(batch))
+            except (CircuitOpenError, DeadlineExceeded) as e:
+                logger.warning(f"Citation lookup stopped: {e}")
+                break
+            except Exception as e:
+                logger.warning(f"Citation batch of {len(batch)} papers failed: {e}")
+                continue
+            requests_made += 1
+            with self._lock:
+                for paper_id, count in zip(batch, counts):
+                    self.cache[paper_id] = {"citations": count, "fetched_at": now}
+        if requests_made:
+            self.save_cache()
+        logger.info(f"Citations: {len(to_fetch)} of {len(set(paper_ids))} papers looked up "
+                    f"in {requests_made} requests")
+        with self._lock:
+            return {paper_id: (self.cache.get(paper_id) or {}).get("citations") for paper_id in paper_ids}
+
+    def enrich(self, items: List[Dict[Any, Any]], deadline: Optional[Deadline] = None) -> int:
+        """Set ``citations`` on research items with an arXiv link; returns how many got a count."""
+        papers: Dict[str, List[Dict[Any, Any]]] = {}
+        for item in items:
+            if item.get('type') != 'research':
+                continue
+            paper_id = next((arxiv_id(link) for link in item.get('links') or [] if arxiv_id(link)), None)
+            if paper_id:
+                papers.setdefault(paper_id, []).append(item)
+        if not papers:
+            return 0
+        with tracer.span("citations.enrich", papers=len(papers)) as span:
+            counts = self.lookup(list(papers), deadline)
+            found = 0
+            for paper_id, paper_items in papers.items():
+                count = counts.get(paper_id)
+                if count is None:
+                    continue
+                found += len(paper_items)
+                for item in paper_items:
+                    item['citations'] = count
+            span.set_attribute("found", found)
+        return found
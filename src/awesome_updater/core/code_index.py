@@ -0,0 +1,250 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
+
+import requests
+from awesome_updater.core.pdf_links import arxiv_id
+from utils.logger import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    arxiv_id TEXT NOT NULL,
+    repo_url TEXT NOT NULL,
+    is_official INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (arxiv_id, repo_url)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+@dataclass
+class ImportStats:
+    rows: int = 0
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    skipped: bool = False
+
+
+def iter_json_records(stream: IO[str], chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the elements of a JSON array (or the objects of a JSON Lines file) one at a time.
+
+    Only one chunk of the file is held in memory, so multi-hundred-MB dumps can be
+    read without loading them whole.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    while True:
+        chunk = stream.read(chunk_size)
+        buffer += chunk
+        pos = 0
+        while True:
+            # Skip the separators between records
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) and not started:
+                started = True
+                if buffer[pos] == "[":
+                    pos += 1
+                    continue
+            if pos >= len(buffer) or buffer[pos] == "]":
+                break
+            try:
+                record, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not chunk:
+                    raise
+                break  # The record continues in the next chunk
+            yield record
+        buffer = buffer[pos:]
+        if not chunk:
+            return
+
+
+class PaperCodeIndex:
+    """On-disk arXiv ID -> code repository index built from bulk paper/code link dumps.
+
+    The index is a SQLite table clustered on ``(arxiv_id, repo_url)`` and read
+    through a memory map, so lookups are a single primary-key probe. Importing a
+    newer dump only writes the rows that changed, and a dump identical to the
+    last one imported is skipped entirely.
+
+    Dumps are gzipped (or plain) JSON arrays or JSON Lines of objects shaped like
+    the Papers with Code export: ``paper_arxiv_id`` (or ``paper_url_abs``),
+    ``repo_url`` and optionally ``is_official``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._connect().executescript(SCHEMA)
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> Optional["PaperCodeIndex"]:
+        """Open the index from the ``code_index`` config section, refreshing it when stale."""
+        settings = (config or {}).get('code_index') or {}
+        if not settings.get('enabled'):
+            return None
+        index = cls(settings.get('path', '.state/paper_code.sqlite'))
+        if settings.get('dump_url'):
+            index.refresh_if_stale(settings['dump_url'], settings.get('refresh_days', 7))
+        return index
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._local.conn = conn
+        return conn
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, conn: sqlite3.Connection, **values: Any) -> None:
+        conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                         [(key, str(value)) for key, value in values.items()])
+
+    def lookup(self, paper_id: str) -> List[str]:
+        """Code repositories for an arXiv ID (any version), official implementations first."""
+        rows = self._connect().execute(
+            "SELECT repo_url FROM links WHERE arxiv_id = ? ORDER BY is_official DESC, repo_url",
+            (_normalize_id(paper_id),)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def lookup_many(self, paper_ids: Iterable[str]) -> Dict[str, List[str]]:
+        return {paper_id: links for paper_id in paper_ids if (links := self.lookup(paper_id))}
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM links").fetchone()[0]
+
+    def import_dump(self, path: str) -> ImportStats:
+        """Bring the index in line with a dump file, writing only the differences."""
+        stats = ImportStats()
+        digest = _file_digest(path)
+        if digest == self._meta("dump_sha256"):
+            logger.info(f"Paper/code dump {path} unchanged since last import")
+            stats.skipped = True
+            return stats
+
+        conn = self._connect()
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS incoming "
+                     "(arxiv_id TEXT, repo_url TEXT, is_official INTEGER, PRIMARY KEY (arxiv_id, repo_url))")
+        conn.execute("DELETE FROM incoming")
+        opener = gzip.open if _is_gzip(path) else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            batch = []
+            for record in iter_json_records(f):
+                row = _row(record)
+                if row is None:
+                    continue
+                batch.append(row)
+                stats.rows += 1
+                if len(batch) >= 10000:
+                    conn.executemany("INSERT OR REPLACE INTO incoming VALUES (?, ?, ?)", batch)
+                    batch.clear()
+            conn.executemany("INSERT OR REPLACE INTO incoming VALUES (?, ?, ?)", batch)
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            stats.removed = conn.execute(
+                "DELETE FROM links WHERE NOT EXISTS (SELECT 1 FROM incoming i "
+                "WHERE i.arxiv_id = links.arxiv_id AND i.repo_url = links.repo_url)"
+            ).rowcount
+            stats.updated = conn.execute(
+                "UPDATE links SET is_official = (SELECT i.is_official FROM incoming i "
+                "WHERE i.arxiv_id = links.arxiv_id AND i.repo_url = links.repo_url) "
+                "WHERE is_official != (SELECT i.is_official FROM incoming i "
+                "WHERE i.arxiv_id = links.arxiv_id AND i.repo_url = links.repo_url)"
+            ).rowcount
+            stats.added = conn.execute(
+                "INSERT OR IGNORE INTO links SELECT arxiv_id, repo_url, is_official FROM incoming"
+            ).rowcount
+            self._set_meta(conn, dump_sha256=digest, imported_at=time.time())
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.execute("DELETE FROM incoming")
+
+        logger.info(f"Imported paper/code dump: {stats.rows} rows, {stats.added} added, "
+                    f"{stats.updated} updated, {stats.removed} removed")
+        return stats
+
+    def refresh(self, url: str, timeout: float = 60.0) -> ImportStats:
+        """Download a dump (conditionally, by ETag) and import it."""
+        headers = {}
+        etag = self._meta("dump_etag")
+        if etag:
+            headers["If-None-Match"] = etag
+        with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
+            if response.status_code == 304:
+                logger.info("Paper/code dump not modified")
+                self._set_meta(self._connect(), checked_at=time.time())
+                return ImportStats(skipped=True)
+            response.raise_for_status()
+            with tempfile.NamedTemporaryFile(suffix=".json.gz", delete=False) as f:
+                shutil.copyfileobj(response.raw, f)
+                download = f.name
+            new_etag = response.headers.get("ETag")
+        try:
+            stats = self.import_dump(download)
+        finally:
+            os.remove(download)
+        self._set_meta(self._connect(), checked_at=time.time(), **({"dump_etag": new_etag} if new_etag else {}))
+        return stats
+
+    def refresh_if_stale(self, url: str, max_age_days: float = 7) -> Optional[ImportStats]:
+        checked_at = float(self._meta("checked_at") or 0)
+        if time.time() - checked_at < max_age_days * 86400:
+            return None
+        try:
+            return self.refresh(url)
+        except (requests.exceptions.RequestException, OSError, ValueError) as e:
+            logger.error(f"Failed to refresh paper/code index from {url}: {e}")
+            return None
+
+
+def _normalize_id(paper_id: str) -> str:
+    paper_id = paper_id.strip()
+    head, _, version = paper_id.rpartition("v")
+    return head if head and version.isdigit() else paper_id
+
+
+def _row(record: Dict[str, Any]) -> Optional[tuple]:
+    if not isinstance(record, dict):
+        return None
+    paper_id = record.get("paper_arxiv_id") or arxiv_id(record.get("paper_url_abs") or "")
+    repo_url = (record.get("repo_url") or "").strip().rstrip("/")
+    if not paper_id or not repo_url:
+        return None
+    return _normalize_id(paper_id), repo_url, 1 if record.get("is_official") else 0
+
+
+def _is_gzip(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(2) == b"\x1f\x8b"
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
@@ -1,188 +1,305 @@
 import os
-from typing import Dict, List, Optional, Any
+import itertools
+import math
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 import arxiv
 import requests
-from tavily import Client
 from utils.logger import logger
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from bs4 import BeautifulSoup
 import pytz
 import re
 from utils.logger import logger
+from utils.relevance import RelevanceRanker
+from utils.tracing import tracer
+from utils.resilience import (
+    CircuitBreaker, CircuitOpenError, Deadline, DeadlineExceeded, RetryBudget,
+    TimeoutHTTPAdapter, call_with_resilience
+)
+from awesome_updater.core.github_client import GitHubClient, PRIORITY_ENRICHMENT
+from awesome_updater.core.metrics_store import MetricsStore
+from awesome_updater.core.fetch_cache import FetchCache
+from awesome_updater.core.profiles import ListProfile
+from awesome_updater.core.fetch_jobs import FetchCoordinator, Handler
+from awesome_updater.core.pdf_links import PdfLinkScanner, arxiv_id
+from awesome_updater.core.code_index import PaperCodeIndex
+from awesome_updater.core.lab_scraper import LabScraper
+from awesome_updater.core.parser_pool import ParserPool
+from awesome_updater.core.citations import CitationEnricher
 
 class ContentFetcher:
-    def __init__(self, github_token: str, tavily_api_key: str = None):
+    def __init__(self, github_token: str,
+                 config: Optional[Dict] = None, github_client: Optional[GitHubClient] = None,
+                 relevance_ranker: Optional[RelevanceRanker] = None,
+                 metrics_store: Optional[MetricsStore] = None,
+                 profile: Optional[ListProfile] = None,
+                 fetch_cache: Optional[FetchCache] = None,
+                 jobs: Optional[FetchCoordinator] = None):
         self.github_token = github_token
-        self.tavily_client = Client(tavily_api_key) if tavily_api_key else None
-        self.headers = {
-            "Authorization": f"Bearer {github_token}",
-            "Accept": "application/vnd.github.v3+json"
+        self.config = config or {}
+        # Queries and watch-lists come from the list profile being updated
+        self.profile = profile or ListProfile('default', config=self.config)
+        # Shared between the fetchers of a multi-list run so overlapping work happens once
+        self.fetch_cache = fetch_cache or FetchCache()
+        # When set, queries and enrichment run as durable jobs that other workers can share
+        self.jobs = jobs
+        # Local arXiv ID -> code repository index, consulted before any PDF is downloaded
+        self.code_index = self.fetch_cache.get_or_compute(
+            ('code_index',), lambda: PaperCodeIndex.from_config(self.config)
+        )
+        # One process pool per run for the lab scraper's and PDF scanner's parsing
+        parsers = self.fetch_cache.get_or_compute(('parser_pool',), lambda: ParserPool.from_config(self.config))
+        # New posts on lab blogs; sites are scraped once per run for all profiles
+        self.lab_scraper = self.fetch_cache.get_or_compute(
+            ('lab_scraper',), lambda: LabScraper.from_config(self.config, parsers)
+        )
+        # Post URLs by lab that this profile read, kept with its selection checkpoint
+        self.lab_posts: Dict[str, List[str]] = {}
+        # Finds code links in the first page of papers whose abstract has none
+        self.pdf_scanner = self.fetch_cache.get_or_compute(
+            ('pdf_scanner',), lambda: PdfLinkScanner.from_config(self.config, parsers)
+        )
+        # Citation counts for arXiv papers, looked up in batches and cached per paper
+        self.citations = self.fetch_cache.get_or_compute(
+            ('citations',), lambda: CitationEnricher.from_config(self.config)
+        )
+        self.relevance_ranker = relevance_ranker
+        # Star history for velocity scoring; every metrics fetch appends a snapshot
+        self.metrics_store = metrics_store or MetricsStore.from_config(self.config)
+        
+        # Per-source circuit breakers, timeouts and one retry budget for the whole run
+        resilience = (self.config.get('fetch') or {}).get('resilience') or {}
+        self.max_attempts = resilience.get('max_attempts', 3)
+        self.timeouts = {'arxiv': 30, 'github': 10, **(resilience.get('timeouts') or {})}
+        latency_thresholds = resilience.get('latency_thresholds') or {}
+        self.retry_budget = RetryBudget(resilience.get('retry_budget', 10))
+        self.breakers = {
+            source: CircuitBreaker(
+                source,
+                failure_threshold=resilience.get('failure_threshold', 3),
+                latency_threshold=latency_thresholds.get(source),
+                reset_timeout=resilience.get('reset_timeout_seconds', 120)
+            )
+            for source in ('arxiv', 'github')
         }
-        self.important_authors = [
-            "Yann LeCun", "Sergey Levine", "Pieter Abbeel", "Chelsea Finn",
-            "Lerrel Pinto", "Ashish Kumar", "Jitendra Malik"
-        ]
-        self.important_venues = [
-            "ICML", "NeurIPS", "ICLR", "RSS", "CoRL", "ICRA", "IROS"
-        ]
-        self.important_labs = [
-            "Meta AI", "Google Research", "DeepMind", "BAIR", "Stanford REAL",
-            "CMU RED", "MIT CSAIL"
-        ]
         
-    def fetch_all_content(self) -> List[Dict[Any, Any]]:
-        """Fetch content using aggregated search approach with focus on recent updates."""
-        all_content = []
+        # Shared, rate-limit-aware client for both search and metric enrichment
+        self.github = github_client or GitHubClient.from_config(github_token, self.config)
+        if self.github.retry_budget is None:
+            self.github.breaker = self.breakers['github']
+            self.github.retry_budget = self.retry_budget
+            self.github.timeout = self.timeouts['github']
+        else:
+            # Already configured by another profile's fetcher; share its breaker
+            self.breakers['github'] = self.github.breaker
         
-        # Fetch arXiv papers
-        arxiv_papers = self._fetch_arxiv_papers()
-        all_content.extend(arxiv_papers)
+        # arxiv.Client never passes a timeout, so one is applied at the session level
+        self._arxiv_timeout = self.timeouts['arxiv']
+        self.arxiv_client = arxiv.Client(num_retries=0)
+        self.arxiv_client._session.mount("https://", TimeoutHTTPAdapter(lambda: self._arxiv_timeout))
+        self.important_authors = self.profile.important_authors
+        self.important_venues = self.profile.important_venues
+        self.important_labs = self.profile.important_labs
+        # Freshness windows (in days) pushed down into each source's query
+        self.recency = {'arxiv_days': 30, 'github_days': 180, 'github_field': 'pushed',
+                        **((self.config.get('fetch') or {}).get('recency') or {})}
         
-        # Fetch from important labs' websites
-        lab_content = self._fetch_lab_content()
-        all_content.extend(lab_content)
+    def fetch_all_content(self, deadline: Optional[Deadline] = None) -> List[Dict[Any, Any]]:
+        """Fetch, filter, enrich and score every candidate and return them as one list.
         
-        # Fetch GitHub repositories
-        github_repos = self._fetch_github_repos()
-        all_content.extend(github_repos)
+        Prefer ``iter_content`` when the candidates are consumed once, e.g. by the
+        candidate selector; this materializes the whole stream.
+        """
+        return list(self.iter_content(deadline))
+
+    def iter_content(self, deadline: Optional[Deadline] = None) -> Iterator[Dict[Any, Any]]:
+        """Stream scored candidates: fetch → normalize → dedup → filter/enrich → score.
         
-        # Calculate impact scores
-        for item in all_content:
-            item['impact_score'] = self._calculate_impact_score(item)
+        Sources are fetched one after another and their items flow through the later
+        stages in batches of ``pipeline.batch_size``, so only one source's results and
+        one batch are in flight at a time, however many candidates the sources return.
         
-        return all_content
+        Args:
+            deadline: Run-level deadline passed down to every outbound call
+                (default: ``fetch.deadline_seconds`` from the config)
+        """
+        if deadline is None:
+            deadline = Deadline((self.config.get('fetch') or {}).get('deadline_seconds'))
+        settings = self.config.get('pipeline') or {}
+        candidates = self._iter_unique(self._iter_normalized(
+            self._iter_sources(deadline), settings.get('max_description_chars', 1500)
+        ))
+        for batch in _batched(candidates, settings.get('batch_size', 200)):
+            yield from self._process_batch(batch, deadline)
         
-    def _is_recent_content(self, date_str: Optional[str], months: int = 6) -> bool:
-        """Check if content is recent (within specified months)."""
-        if not date_str:
-            return False
-            
-        try:
-            if isinstance(date_str, str):
-                content_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            else:
-                content_date = date_str
-                
-            cutoff_date = datetime.now(pytz.UTC) - timedelta(days=30 * months)
-            return content_date > cutoff_date
-        except Exception as e:
-            logger.error(f"Error parsing date {date_str}: {e}")
-            return False
+        logger.info("Fetch circuit states: " + ", ".join(
+            f"{source}={breaker.state}" for source, breaker in self.breakers.items()
+        ))
+        
+        # Persist this run's metric snapshots
+        self.metrics_store.flush()
+        store_settings = self.config.get('metrics_store') or {}
+        self.metrics_store.downsample(store_settings.get('downsample_after_days', 30),
+                                      store_settings.get('downsample_bucket_hours', 24))
 
-    def _tavily_search(self, query: str, search_type: str, content_type: str) -> List[Dict]:
-        """Search using Tavily API."""
-        if not self.tavily_client:
-            return []
+    def _iter_sources(self, deadline: Deadline) -> Iterator[Dict[Any, Any]]:
+        """Items from each source in turn; a source is only fetched once the previous one is drained."""
+        sources = (
+            ('arxiv', self._fetch_arxiv_papers),
+            # Important labs' websites
+            ('labs', self._fetch_lab_content),
+            ('github', self._fetch_github_repos),
+        )
+        for source, fetch in sources:
+            with tracer.span(f"fetch.{source}", source=source) as span:
+                items = fetch(deadline) or []
+                span.set_attribute("items", len(items))
+            yield from items
+            del items
+
+    @staticmethod
+    def _iter_normalized(items: Iterable[Dict[Any, Any]], max_description_chars: int) -> Iterator[Dict[Any, Any]]:
+        """Trim descriptions (full abstracts, README blurbs) and make dates strings."""
+        for item in items:
+            description = ' '.join((item.get('description') or '').split())
+            if len(description) > max_description_chars:
+                description = description[:max_description_chars].rsplit(' ', 1)[0] + '…'
+            item['description'] = description
+            if isinstance(item.get('published_date'), datetime):
+                item['published_date'] = item['published_date'].isoformat()
+            yield item
+
+    def _process_batch(self, batch: List[Dict[Any, Any]], deadline: Deadline) -> List[Dict[Any, Any]]:
+        """Filter, enrich and score one batch of unique candidates."""
+        # Drop off-topic candidates before spending GitHub quota or GPT tokens on them
+        if self.relevance_ranker:
+            with tracer.span("relevance", items=len(batch)) as span:
+                batch, dropped = self.relevance_ranker.filter(batch)
+                span.set_attribute("dropped", len(dropped))
+            logger.info(f"Relevance filter kept {len(batch)} items, dropped {len(dropped)}")
         
-        try:
-            # Adjust query based on content type
-            if content_type == "product":
-                query = f"news {query}"  # Prefix with 'news' for product searches
-            
-            logger.info(f"Starting Tavily search for query: {query}")
-            response = self.tavily_client.search(
-                query=query,
-                search_depth="advanced",  # Use advanced search for better results
-                include_domains=[
-                    'github.com',
-                    'arxiv.org', 
-                    'paperswithcode.com',
-                    'x.com',
-                    'twitter.com',
-                    'huggingface.co',
-                    'arxiv-sanity.com'
-                ],
-                max_results=20
-            )
-            
-            if not response:
-                logger.warning(f"Empty response from Tavily for query: {query}")
-                return []
-                
-            logger.info(f"Received {len(response.get('results', []))} results from Tavily")
-            
-            results = []
-            for item in response.get('results', []):
-                try:
-                    # Extract GitHub URLs if present (but not required)
-                    github_links = re.findall(
-                        r'https?://github\.com/[^/\s]+/[^/\s]+',
-                        item.get('content', '') + item.get('url', '')
-                    )
-                    
-                    # For research content, look for citation information
-                    citations = 0
-                    if content_type == 'research':
-                        citation_patterns = [
-                            r'cited by (\d+)',
-                            r'(\d+) citations',
-                            r'citations: (\d+)'
-                        ]
-                        content_lower = item.get('content', '').lower()
-                        for pattern in citation_patterns:
-                            match = re.search(pattern, content_lower)
-                            if match:
-                                citations = int(match.group(1))
-                                break
-                    
-                    # Check if it's a social media post
-                    is_social = any(domain in item.get('url', '').lower() 
-                                  for domain in ['x.com', 'twitter.com'])
-                    
-                    # Check for research indicators
-                    is_research = any(domain in item.get('url', '').lower()
-                                    for domain in ['arxiv.org', 'arxiv-sanity.com', 'paperswithcode.com'])
-                    
-                    # Extract date information if available
-                    pub_date = None
-                    date_patterns = [
-                        r'published(?:\s+on)?\s+(\d{4}-\d{2}-\d{2})',
-                        r'posted(?:\s+on)?\s+(\d{4}-\d{2}-\d{2})',
-                        r'date:\s+(\d{4}-\d{2}-\d{2})'
-                    ]
-                    for pattern in date_patterns:
-                        match = re.search(pattern, item.get('content', '').lower())
-                        if match:
-                            pub_date = match.group(1)
-                            break
-                    
-                    results.append({
-                        'title': item.get('title'),
-                        'description': item.get('content'),
-                        'links': [item.get('url')] + github_links,
-                        'type': content_type,
-                        'citations': citations,
-                        'relevance_score': item.get('score', 0),
-                        'is_social': is_social,
-                        'is_research': is_research,
-                        'has_code': bool(github_links),
-                        'published_date': pub_date
-                    })
-                except Exception as e:
-                    logger.error(f"Error processing Tavily result: {str(e)}")
+        # Attach known code links from the local index, then look for the rest in PDFs,
+        # so papers can be enriched with their repo's metrics
+        if self.code_index:
+            self._attach_indexed_code_links(batch)
+        if self.pdf_scanner:
+            self.pdf_scanner.scan(batch, deadline)
+        if self.citations:
+            self.citations.enrich(batch, deadline)
+        
+        # Attach GitHub metrics, most promising items first
+        with tracer.span("enrich.github", items=len(batch)):
+            self._enrich_all(batch, deadline)
+        
+        # Calculate impact scores, once per item and watch-list across profiles
+        watch_lists = (tuple(self.important_authors), tuple(self.important_venues),
+                       tuple(self.important_labs))
+        with tracer.span("score", items=len(batch)):
+            for item in batch:
+                item['impact_score'] = self.fetch_cache.get_or_compute(
+                    ('score', self._dedup_key(item), watch_lists),
+                    lambda item=item: self._calculate_impact_score(item)
+                )
+        return batch
+
+    def _attach_indexed_code_links(self, items: List[Dict[Any, Any]]) -> int:
+        """Attach code repositories from the local paper/code index to arXiv papers."""
+        found = 0
+        with tracer.span("code_index.lookup", items=len(items)) as span:
+            for item in items:
+                links = item.get('links') or []
+                if item.get('type') != 'research' or any('github.com' in link for link in links if link):
                     continue
-            
-            logger.info(f"Successfully processed {len(results)} results from Tavily")
-            return results
-            
-        except Exception as e:
-            logger.error(f"Tavily search error for query '{query}': {str(e)}")
-            return []
+                paper_id = next((arxiv_id(link) for link in links if arxiv_id(link)), None)
+                code_links = self.code_index.lookup(paper_id) if paper_id else []
+                if not code_links:
+                    continue
+                found += 1
+                item['code_links'] = code_links
+                item['links'] = list(links) + [link for link in code_links if link not in links]
+            span.set_attribute("found", found)
+        logger.info(f"Code index: code links attached to {found} papers")
+        return found
 
-    def _github_search(self, query: str) -> List[Dict]:
-        """Search GitHub repositories."""
-        url = "https://api.github.com/search/repositories"
-        params = {
-            'q': query,
-            'sort': 'stars',
-            'order': 'desc',
-            'per_page': 20
-        }
+    def _deduplicate(self, items: List[Dict[Any, Any]]) -> List[Dict[Any, Any]]:
+        """Remove duplicate items, keyed by their primary link or normalized title."""
+        return list(self._iter_unique(items))
+
+    def _iter_unique(self, items: Iterable[Dict[Any, Any]]) -> Iterator[Dict[Any, Any]]:
+        """Yield the first item for each identity; only the keys seen so far are kept."""
+        seen = set()
+        duplicates = 0
+        for item in items:
+            key = self._dedup_key(item)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            yield item
+        if duplicates:
+            logger.info(f"Removed {duplicates} duplicate items")
+
+    @staticmethod
+    def _dedup_key(item: Dict[Any, Any]) -> str:
+        """Build a stable identity for an item across sources."""
+        links = item.get('links') or []
+        if links and links[0]:
+            # arXiv abs/pdf links and versioned IDs all refer to the same paper
+            link = links[0].lower().rstrip('/')
+            link = re.sub(r'arxiv\.org/(abs|pdf)/', 'arxiv.org/abs/', link)
+            link = re.sub(r'(\d{4}\.\d{4,5})(v\d+)?(\.pdf)?$', r'\1', link)
+            return link
+        return re.sub(r'\W+', ' ', (item.get('title') or '').lower()).strip()
+
+    @staticmethod
+    def _parse_date(value: Any) -> Optional[datetime]:
+        """Parse an ISO string or datetime into a timezone-aware datetime."""
+        if not value:
+            return None
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=pytz.UTC)
+        return value
         
+    def _window_start(self, source: str) -> Optional[datetime]:
+        """Start of ``source``'s recency window, or None when the window is disabled."""
+        days = self.recency.get(f'{source}_days')
+        if not days:
+            return None
+        return datetime.now(pytz.UTC) - timedelta(days=days)
+
+    def _windowed_arxiv_query(self, query: str) -> str:
+        """Restrict an arXiv query to papers submitted inside the recency window."""
+        start = self._window_start('arxiv')
+        if start is None:
+            return query
+        end = datetime.now(pytz.UTC)
+        return f"({query}) AND submittedDate:[{start:%Y%m%d%H%M} TO {end:%Y%m%d}2359]"
+
+    def _github_window(self, query: str, shard_by: str, since: Optional[str] = None,
+                       field: Optional[str] = None) -> Dict[str, Any]:
+        """Search arguments restricting ``query`` to repos created or pushed since ``since``.
+
+        ``since`` defaults to the start of the GitHub recency window. When the window is
+        on the field the search shards by, it becomes the lower bound of the sharded
+        range; otherwise it is added to the query as a ``field:>=date`` qualifier.
+        """
+        field = field or self.recency.get('github_field', 'pushed')
+        if since is None:
+            start = self._window_start('github')
+            since = start.date().isoformat() if start else None
+        if not since:
+            return {'query': query, 'shard_by': shard_by}
+        if field == shard_by:
+            return {'query': query, 'shard_by': shard_by, 'since': date.fromisoformat(since)}
+        return {'query': f"{query} {field}:>={since}", 'shard_by': shard_by}
+
+    def _github_search(self, query: str, deadline: Optional[Deadline] = None) -> List[Dict]:
+        """Search GitHub repositories."""
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json().get('items', [])
+            return list(self.github.iter_search_repos(
+                **self._github_window(query, 'created'), max_results=20, deadline=deadline))
         except requests.exceptions.Timeout:
             logger.error(f"GitHub search timed out for query: {query}")
             return []
@@ -233,7 +350,8 @@ class ContentFetcher:
                     'stars': item.get('stargazers_count', 0),
                     'forks': item.get('forks_count', 0),
                     'updated_at': item.get('updated_at'),
-                    'created_at': item.get('created_at')
+                    'created_at': item.get('created_at'),
+                    'pushed_at': item.get('pushed_at')
                 }
             })
         return processed
@@ -258,6 +376,71 @@ class ContentFetcher:
         content['impact_score'] = self._calculate_impact_score(content)
         return content
 
+    def _enrich_all(self, items: List[Dict[Any, Any]], deadline: Optional[Deadline] = None) -> None:
+        """Fetch GitHub metrics for items in one prioritized batch.
+        
+        Items are queued by their preliminary impact score, so when the core quota
+        runs out it is the low-scoring items that go without metrics. Those are
+        marked with ``metrics_status`` instead of silently getting zero stars.
+        """
+        jobs = []
+        repo_paths = {}
+        for index, item in enumerate(items):
+            if 'metrics' in item:
+                continue
+            repo_path = self._item_repo(item)
+            cached = self.fetch_cache.get(('repo', repo_path)) if repo_path else None
+            if cached is not None:
+                # Already enriched by another list profile in this run
+                item['metrics'] = dict(cached)
+                continue
+            if repo_path:
+                priority = PRIORITY_ENRICHMENT - self._calculate_impact_score(item)
+                jobs.append((priority, index, repo_path, None))
+                repo_paths[index] = repo_path
+        
+        if not jobs:
+            return
+        
+        logger.info(f"Enriching {len(jobs)} items with GitHub metrics")
+        if self.jobs:
+            metrics = self.jobs.run(
+                'enrich_repo', {path: {'path': path} for _, _, path, _ in jobs}, self.job_handlers(), deadline,
+                priorities={path: priority for priority, _, path, _ in jobs}
+            )
+            fetched = {index: metrics.get(path) for _, index, path, _ in jobs}
+        else:
+            fetched = {
+                index: self._metrics_from_repo(data) if isinstance(data, dict) and 'message' not in data else None
+                for index, data in self.github.run_prioritized(jobs, deadline).items()
+            }
+        for index, repo_metrics in fetched.items():
+            if repo_metrics is not None:
+                items[index]['metrics'] = repo_metrics
+                self._record_metrics(repo_paths[index], items[index]['metrics'])
+                self.fetch_cache.put(('repo', repo_paths[index]), items[index]['metrics'])
+            else:
+                items[index]['metrics_status'] = 'unavailable'
+        
+        unavailable = sum(1 for item in items if item.get('metrics_status') == 'unavailable')
+        if unavailable:
+            logger.warning(f"GitHub metrics unavailable for {unavailable} items")
+
+    def job_handlers(self) -> Dict[str, Handler]:
+        """Handlers for the fetch jobs this fetcher can run on behalf of any worker."""
+        return {
+            'arxiv_query': lambda payload, deadline: self._arxiv_query(payload['query'], deadline),
+            'github_search': lambda payload, deadline: self._discover_term(
+                payload['term'], payload['settings'], deadline, record=False),
+            'enrich_repo': lambda payload, deadline: self._repo_metrics(payload['path'], deadline),
+        }
+
+    def _repo_metrics(self, repo_path: str, deadline: Optional[Deadline] = None) -> Optional[Dict]:
+        data = self.github.get_json(repo_path, deadline=deadline)
+        if not isinstance(data, dict) or 'message' in data:
+            return None
+        return self._metrics_from_repo(data)
+
     def _extract_github_urls(self, links: List[str]) -> List[str]:
         """Extract GitHub repository URLs from a list of links."""
         github_pattern = r'https?://github\.com/([^/]+/[^/]+)'
@@ -266,54 +449,72 @@ class ContentFetcher:
             if re.match(github_pattern, link)
         ]
 
+    @staticmethod
+    def _repo_path(github_url: str) -> Optional[str]:
+        """Turn a GitHub URL into a ``repos/{owner}/{repo}`` API path."""
+        # Skip URLs that are clearly not repository URLs
+        if any(invalid_path in github_url for invalid_path in [
+            '/features/', '/apps/', '/settings/', '/marketplace/',
+            'github.blog', 'help.github.com', 'docs.github.com'
+        ]):
+            return None
+        
+        # Extract owner and repo using a more specific regex
+        match = re.match(r'https?://github\.com/([^/\s]+)/([^/\s#?]+)', github_url)
+        if not match:
+            return None
+        
+        owner, repo = match.groups()
+        # Clean up repo name (remove any trailing parts)
+        repo = repo.split('#')[0].split('?')[0]
+        if repo.endswith('.git'):
+            repo = repo[:-4]
+        if not owner or not repo:
+            return None
+        return f"repos/{owner}/{repo}"
+
+    @staticmethod
+    def _metrics_from_repo(data: Dict) -> Dict:
+        return {
+            'stars': data.get('stargazers_count', 0),
+            'forks': data.get('forks_count', 0),
+            'updated_at': data.get('updated_at'),
+            'created_at': data.get('created_at'),
+            'pushed_at': data.get('pushed_at')
+        }
+
+    def _record_metrics(self, repo: str, metrics: Dict) -> None:
+        """Append a metrics snapshot for ``owner/repo`` to the time-series store."""
+        if not repo:
+            return
+        self.metrics_store.record(repo, metrics.get('stars', 0), metrics.get('forks', 0),
+                                  metrics.get('pushed_at'))
+
+    def _item_repo(self, item: Dict[Any, Any]) -> Optional[str]:
+        return next(
+            (path for path in map(self._repo_path, self._extract_github_urls(item.get('links') or [])) if path),
+            None
+        )
+
     def _get_github_metrics(self, github_url: str) -> Dict:
         """Get GitHub repository metrics."""
         try:
-            # Skip URLs that are clearly not repository URLs
-            if any(invalid_path in github_url for invalid_path in [
-                '/features/', '/apps/', '/settings/', '/marketplace/',
-                'github.blog', 'help.github.com', 'docs.github.com'
-            ]):
-                return {}
-            
-            # Extract owner and repo using a more specific regex
-            match = re.match(r'https?://github\.com/([^/\s]+)/([^/\s#?]+)', github_url)
-            if not match:
+            repo_path = self._repo_path(github_url)
+            if not repo_path:
                 return {}
             
-            owner, repo = match.groups()
-            # Skip if owner or repo looks invalid
-            if not owner or not repo or len(owner) < 1 or len(repo) < 1:
-                return {}
-            
-            # Clean up repo name (remove any trailing parts)
-            repo = repo.split('#')[0].split('?')[0]
-            
-            api_url = f"https://api.github.com/repos/{owner}/{repo}"
-            
-            response = requests.get(api_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self.github.get_json(repo_path)
             
             # Only return metrics if we got valid data
             if not isinstance(data, dict) or 'message' in data:
                 return {}
-                
-            return {
-                'stars': data.get('stargazers_count', 0),
-                'forks': data.get('forks_count', 0),
-                'updated_at': data.get('updated_at'),
-                'created_at': data.get('created_at')
-            }
+            
+            metrics = self._metrics_from_repo(data)
+            self._record_metrics(repo_path, metrics)
+            return metrics
         except requests.exceptions.Timeout:
             logger.error(f"GitHub metrics timed out for {github_url}")
             return {}
-        except requests.exceptions.RequestException as e:
-            if hasattr(e.response, 'status_code') and e.response.status_code == 404:
-                # Silently ignore 404 errors as they're expected for invalid repos
-                return {}
-            logger.error(f"Error fetching GitHub metrics for {github_url}: {e}")
-            return {}
         except Exception as e:
             logger.error(f"Unexpected error fetching GitHub metrics for {github_url}: {e}")
             return {}
@@ -327,63 +528,201 @@ class ContentFetcher:
             score += 3.0
             
         # Venue impact (0-2 points)
-        if any(venue in item.get('description', '') for venue in self.important_venues):
+        if any(venue in (item.get('description') or '') for venue in self.important_venues):
             score += 2.0
             
         # Lab/Institution impact (0-2 points)
-        if any(lab in item.get('description', '') for lab in self.important_labs):
+        if item.get('lab') in self.important_labs or \
+                any(lab in (item.get('description') or '') for lab in self.important_labs):
             score += 2.0
             
         # Recency impact (0-1 points)
-        if 'published_date' in item:
-            days_old = (datetime.now() - item['published_date']).days
+        try:
+            published = self._parse_date(item.get('published_date'))
+        except (TypeError, ValueError):
+            published = None
+        if published:
+            days_old = (datetime.now(pytz.UTC) - published).days
             recency_score = max(0, 1 - (days_old / 365))  # Linear decay over a year
             score += recency_score
             
+        # Citation impact (0-2 points), log-scaled: 2 points at 1000 citations
+        citations = item.get('citations') or 0
+        if citations > 0:
+            score += min(2.0, math.log10(1 + citations) / 1.5)
+            
         # GitHub stars impact (0-2 points)
         if 'metrics' in item and 'stars' in item['metrics']:
             stars = item['metrics']['stars']
             stars_score = min(2.0, stars / 1000)  # Up to 2 points, scales with stars
             score += stars_score
         
+        # Star momentum from local snapshots (0-2.5 points), no extra API calls
+        repo = self._item_repo(item)
+        if repo:
+            momentum = self.metrics_store.momentum(repo)
+            velocity = momentum['stars_per_day']
+            if velocity:
+                item['star_velocity'] = velocity
+                score += min(2.0, max(0.0, velocity * 7 / 250))  # 2 points at 500 stars/week
+            if momentum['acceleration'] and momentum['acceleration'] > 0:
+                score += min(0.5, momentum['acceleration'])
+        
         return score
 
-    def _fetch_arxiv_papers(self) -> List[Dict[Any, Any]]:
-        search_queries = [
-            'ti:"embodied ai" OR ti:"world model" OR ti:"foundation model" robotics',
-            'ti:"physical intelligence" OR ti:"humanoid" OR ti:"manipulation"',
-            'cat:cs.RO AND (ti:"learning" OR ti:"neural" OR ti:"deep")'
-        ]
+    def _fetch_arxiv_papers(self, deadline: Optional[Deadline] = None) -> List[Dict[Any, Any]]:
+        deadline = deadline or Deadline()
+        papers = []
+        # Windowed by submission date, so only recent papers are ever downloaded
+        queries = {query: self._windowed_arxiv_query(query) for query in self.profile.arxiv_queries}
+        if self.jobs:
+            by_query = self.jobs.run('arxiv_query', {query: {'query': windowed} for query, windowed in queries.items()},
+                                     self.job_handlers(), deadline)
+        for query, windowed in queries.items():
+            if self.jobs:
+                results = by_query.get(query) or []
+            else:
+                results = self.fetch_cache.items(('arxiv', windowed),
+                                                 lambda windowed=windowed: self._arxiv_query(windowed, deadline),
+                                                 self.profile.name)
+            for paper in results:
+                paper['is_important'] = any(author in self.important_authors for author in paper['authors'])
+            papers.extend(results)
+        
+        return papers
+
+    def _arxiv_query(self, query: str, deadline: Deadline) -> List[Dict[Any, Any]]:
+        """Run one arXiv query through the breaker; an empty list if it fails."""
+        search = arxiv.Search(
+            query=query,
+            max_results=100,
+            sort_by=arxiv.SortCriterion.SubmittedDate
+        )
+        attempts = []
         
+        def run_query(timeout: float) -> List[Dict[Any, Any]]:
+            attempts.append(timeout)
+            self._arxiv_timeout = timeout
+            return self._run_arxiv_search(search, deadline)
+        
+        with tracer.span("arxiv.query", source="arxiv", query=query) as span:
+            try:
+                results = call_with_resilience(
+                    self.breakers['arxiv'],
+                    run_query,
+                    deadline=deadline,
+                    retry_budget=self.retry_budget,
+                    timeout=self.timeouts['arxiv'],
+                    max_attempts=self.max_attempts
+                )
+            except (CircuitOpenError, DeadlineExceeded) as e:
+                logger.warning(f"Skipping arXiv query '{query}': {e}")
+                span.set_status("skipped")
+                return []
+            except Exception as e:
+                logger.error(f"arXiv query '{query}' failed: {e}")
+                span.set_status(f"error: {type(e).__name__}")
+                return []
+            finally:
+                span.set_attribute("retries", max(0, len(attempts) - 1))
+            span.set_attribute("results", len(results))
+        return results
+
+    def _run_arxiv_search(self, search: arxiv.Search, deadline: Deadline) -> List[Dict[Any, Any]]:
+        """Page through one arXiv search, stopping early if the deadline passes."""
         papers = []
-        for query in search_queries:
-            search = arxiv.Search(
-                query=query,
-                max_results=100,
-                sort_by=arxiv.SortCriterion.SubmittedDate
-            )
+        for paper in self.arxiv_client.results(search):
+            # Check if paper is from important authors or venues
+            is_important = any(author in self.important_authors for author in paper.authors)
             
-            for paper in search.results():
-                # Check if paper is from important authors or venues
-                is_important = any(author in self.important_authors for author in paper.authors)
-                
-                papers.append({
-                    'title': paper.title,
-                    'authors': [str(author) for author in paper.authors],
-                    'description': paper.summary,
-                    'links': [paper.pdf_url],
-                    'type': 'research',
-                    'published_date': paper.published,
-                    'is_important': is_important
-                })
-        
+            papers.append({
+                'title': paper.title,
+                'authors': [str(author) for author in paper.authors],
+                'description': paper.summary,
+                'links': [paper.pdf_url],
+                'type': 'research',
+                'published_date': paper.published,
+                'is_important': is_important
+            })
+            if deadline.expired():
+                logger.warning(f"Run deadline reached, keeping {len(papers)} papers from this query")
+                break
         return papers
 
-    def _fetch_lab_content(self) -> List[Dict[Any, Any]]:
-        # Implementation to fetch from lab websites
-        # This would require specific scrapers for each lab's website
-        pass
+    def _fetch_lab_content(self, deadline: Optional[Deadline] = None) -> List[Dict[Any, Any]]:
+        """New posts from the configured sites of this profile's important labs."""
+        if not self.lab_scraper:
+            return []
+        posts = self.fetch_cache.items(('labs',), lambda: self.lab_scraper.scrape(deadline), self.profile.name)
+        posts = [post for post in posts if post.get('lab') in self.important_labs]
+        for post in posts:
+            self.lab_posts.setdefault(post['lab'], []).extend(post['links'][:1])
+        return posts
+
+    def _fetch_github_repos(self, deadline: Optional[Deadline] = None) -> List[Dict[Any, Any]]:
+        """Discover repositories for every ``github.search.query_terms`` entry.
+        
+        Each term is streamed through the paginated, date-sharded search, so results
+        are processed as pages arrive rather than after every page is loaded.
+        """
+        settings = dict((self.config.get('github') or {}).get('search') or {})
+        start = self._window_start('github')
+        if start is not None:
+            # Part of the payload, so queue workers apply the same window
+            settings['since'] = start.date().isoformat()
+            settings['since_field'] = self.recency.get('github_field', 'pushed')
+        repos = []
+        if self.jobs:
+            by_term = self.jobs.run('github_search', {
+                term: {'term': term, 'settings': settings} for term in settings.get('query_terms', [])
+            }, self.job_handlers(), deadline)
+            for term in settings.get('query_terms', []):
+                found = by_term.get(term) or []
+                # Job results are shared by every profile in the run; snapshot them once
+                if found:
+                    self.fetch_cache.get_or_compute(('github.search.recorded', term), lambda found=found: [
+                        self._record_metrics(repo['title'], repo['metrics']) for repo in found
+                    ])
+                repos.extend(found)
+            return repos
+        for term in settings.get('query_terms', []):
+            key = ('github.search', term, settings.get('sort', 'stars'), settings.get('max_repos'),
+                   settings.get('shard_by', 'created'), settings.get('since'), settings.get('since_field'))
+            repos.extend(self.fetch_cache.items(
+                key, lambda term=term: self._discover_term(term, settings, deadline), self.profile.name
+            ))
+        return repos
+
+    def _discover_term(self, term: str, settings: Dict[str, Any],
+                       deadline: Optional[Deadline] = None, record: bool = True) -> List[Dict[Any, Any]]:
+        """Search one term; ``record=False`` leaves snapshots to the coordinator (queued jobs)."""
+        repos = []
+        with tracer.span("github.search", source="github", query=term) as span:
+            try:
+                window = self._github_window(term, settings.get('shard_by', 'created'),
+                                             settings.get('since'), settings.get('since_field'))
+                for repo in self.github.iter_search_repos(
+                    **window,
+                    sort=settings.get('sort', 'stars'),
+                    max_results=settings.get('max_repos'),
+                    deadline=deadline
+                ):
+                    processed = self._process_github_results([repo], 'tool')
+                    if record:
+                        self._record_metrics(repo.get('full_name', ''), processed[0]['metrics'])
+                    repos.extend(processed)
+            except DeadlineExceeded as e:
+                logger.warning(f"Stopping GitHub discovery for '{term}': {e}")
+            except Exception as e:
+                logger.error(f"GitHub discovery error for '{term}': {e}")
+                span.set_status(f"error: {type(e).__name__}")
+            span.set_attribute("results", len(repos))
+        logger.info(f"GitHub discovery for '{term}' found {len(repos)} repositories")
+        return repos
+
 
-    def _fetch_github_repos(self) -> List[Dict[Any, Any]]:
-        # Implementation to fetch relevant GitHub repositories
-        pass
\ No newline at end of file
+def _batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split a stream into lists of at most ``size`` items."""
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
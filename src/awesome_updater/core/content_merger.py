@@ -1,30 +1,41 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+import contextvars
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from utils.logger import logger
 from utils.gpt_service import GPTService
 from awesome_updater.core.awesome_gpt_service import AwesomeGPTService
+from awesome_updater.core.profiles import DEFAULT_SECTIONS
+from awesome_updater.core.candidate_selector import estimate_tokens
+from awesome_updater.core.section_merge import route_entries, split_sections
+from utils.tracing import tracer
 
 class ContentMerger:
-    def __init__(self, readme_path: str, gpt_service: GPTService):
+    def __init__(self, readme_path: str, gpt_service: GPTService,
+                 sections: Optional[Dict[str, str]] = None, max_removals: int = 0,
+                 mode: str = "auto", whole_max_tokens: int = 3000, max_workers: int = 4,
+                 max_output_tokens: int = 16000):
+        """Merge into the README either in one GPT call or one call per affected section.
+
+        ``mode`` is "whole", "sharded", or "auto", which shards once the README is
+        larger than ``whole_max_tokens`` (a whole merge has to fit the response limit).
+        """
         # Ensure we're targeting the root README.md, not the tools one
         self.readme_path = os.path.abspath(readme_path)
         if os.path.basename(os.path.dirname(self.readme_path)) == "tools":
             raise ValueError("README path should point to root README.md, not tools/README.md")
             
         # Initialize specialized GPT service
-        self.awesome_gpt = AwesomeGPTService(gpt_service)
+        self.awesome_gpt = AwesomeGPTService(gpt_service, max_removals=max_removals)
+        
+        # Section headers come from the list profile
+        self.sections = sections or dict(DEFAULT_SECTIONS)
         
-        # Define section headers
-        self.sections = {
-            'foundation_models': '## Foundation Models & World Models',
-            'perception': '## Perception & Understanding',
-            'learning': '## Learning & Control',
-            'simulation': '## Simulation & Environments',
-            'hardware': '## Hardware & Platforms',
-            'datasets': '## Datasets & Benchmarks',
-            'companies': '## Companies & Research Labs'
-        }
+        self.mode = mode
+        self.whole_max_tokens = whole_max_tokens
+        self.max_workers = max_workers
+        self.max_output_tokens = max_output_tokens
         
     def merge_content(self, new_content: str) -> bool:
         """Merge new content into the README file."""
@@ -34,7 +45,12 @@ class ContentMerger:
                 current_content = f.read()
             
             # Merge content using specialized GPT service
-            merged_content = self.awesome_gpt.merge_content(current_content, new_content)
+            sharded = self.mode == "sharded" or (
+                self.mode == "auto" and estimate_tokens(current_content) > self.whole_max_tokens)
+            if sharded:
+                merged_content = self._merge_sharded(current_content, new_content)
+            else:
+                merged_content = self.awesome_gpt.merge_content(current_content, new_content)
             
             # If content was successfully merged and changed
             if merged_content and merged_content != current_content:
@@ -51,6 +67,34 @@ class ContentMerger:
             logger.error(f"Error merging content: {e}")
             return False
     
+    def _merge_sharded(self, current_content: str, new_content: str) -> str:
+        """Route new entries to their sections and merge the affected sections concurrently.
+
+        Sections without new entries are passed through unchanged.
+        """
+        sections = split_sections(current_content)
+        entries = [line for line in new_content.splitlines() if line.strip()]
+        routed = route_entries(sections, entries)
+        logger.info(f"Sharded merge: {len(entries)} entries into "
+                    f"{len(routed)}/{len(sections)} sections")
+
+        parts = [section.text for section in sections]
+        if not routed:
+            return current_content
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(routed))) as executor:
+            futures = {
+                index: executor.submit(contextvars.copy_context().run, self._merge_section,
+                                       sections[index].heading, sections[index].text, section_entries)
+                for index, section_entries in routed.items()
+            }
+            for index, future in futures.items():
+                parts[index] = future.result()
+        return "".join(parts)
+
+    def _merge_section(self, heading: str, text: str, entries: List[str]) -> str:
+        with tracer.span("merge.section", section=heading, entries=len(entries)):
+            return self.awesome_gpt.merge_section(text, entries, self.max_output_tokens)
+
     def _organize_content(self, content: str) -> Dict[str, List[str]]:
         # Use GPT to categorize content into sections
         prompt = f"""
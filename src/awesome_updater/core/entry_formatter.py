@@ -0,0 +1,45 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """Shorten text to at most ``max_chars`` characters, cutting at a word boundary."""
+    if len(text) <= max_chars:
+        return text
+    if max_chars <= 1:
+        return ""
+    cut = text[:max_chars - 1].rsplit(" ", 1)[0] or text[:max_chars - 1]
+    return cut.rstrip(" ,;:.") + "…"
+
+
+def format_entry(item: Dict[Any, Any], description: Optional[str] = None) -> str:
+    """Format a content item in the awesome list's table or list structure.
+
+    ``description`` replaces the item's own description, e.g. a shortened one.
+    """
+    if description is None:
+        description = item.get('description', '')
+    if item.get('type') == 'research':
+        paper_link = next((link for link in item.get('links', []) if 'arxiv.org' in link or 'doi.org' in link), '')
+        code_link = next((link for link in item.get('links', []) if 'github.com' in link), '')
+        return (
+            f"| {item.get('title')} | {description} | "
+            f"[Paper]({paper_link}) | [Code]({code_link}) |"
+        )
+
+    if item.get('type') == 'blog':
+        # Lab posts have no paper, code or stars; credit the lab instead
+        main_link = (item.get('links') or [''])[0]
+        return f"- [{item.get('title')}]({main_link}) - {description} ({item.get('lab')})"
+
+    # Format as a list item for tools, products, etc.
+    main_link = (item.get('links') or [''])[0]
+    stars = item.get('metrics', {}).get('stars', 0)
+    return (
+        f"- [{item.get('title')}]({main_link}) - {description} "
+        f"[⭐{stars}]"
+    )
+
+
+def format_entries(items: Iterable[Dict[Any, Any]]) -> List[str]:
+    """Format content items for merging into the README."""
+    return [format_entry(item) for item in items]
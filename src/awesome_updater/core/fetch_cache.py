@@ -0,0 +1,97 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set
+
+from utils.logger import logger
+
+
+class FetchCache:
+    """Thread-safe, run-scoped memo shared by the fetchers of several list profiles.
+
+    The first caller for a key computes the value; concurrent callers for the same
+    key wait for that result instead of repeating the fetch. Failures are not
+    cached, so a later caller may try again.
+
+    Item lists fetched through ``items`` on behalf of a named consumer (a list
+    profile) are evicted once each of the run's ``consumers`` has either taken its
+    copy or called ``finish``, so full source results are not held for the whole run.
+    """
+
+    def __init__(self, consumers: int = 1):
+        self.consumers = consumers
+        self._entries: Dict[Hashable, Future] = {}
+        self._readers: Dict[Hashable, Set[Hashable]] = {}
+        self._finished: Set[Hashable] = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._entries.get(key)
+            owner = future is None
+            if owner:
+                future = self._entries[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._entries[key]
+            future.set_exception(e)
+            raise
+        future.set_result(value)
+        return value
+
+    def get(self, key: Hashable) -> Any:
+        """Return a finished value for ``key`` without waiting; None if there is none."""
+        with self._lock:
+            future = self._entries.get(key)
+        if future is None or not future.done() or future.exception() is not None:
+            return None
+        self.hits += 1
+        return future.result()
+
+    def put(self, key: Hashable, value: Any) -> None:
+        future: Future = Future()
+        future.set_result(value)
+        with self._lock:
+            self._entries[key] = future
+
+    def items(self, key: Hashable, compute: Callable[[], List[Dict[Any, Any]]],
+              consumer: Optional[Hashable] = None) -> List[Dict[Any, Any]]:
+        """Like ``get_or_compute`` for lists of items, returning per-caller copies.
+
+        Callers annotate items in place (scores, metrics), so each one gets its own
+        shallow copy of every item. With ``consumer``, the list is evicted once every
+        consumer has read it or finished.
+        """
+        copies = [dict(item) for item in self.get_or_compute(key, compute)]
+        if consumer is not None:
+            with self._lock:
+                self._readers.setdefault(key, set()).add(consumer)
+                self._evict_consumed([key])
+        return copies
+
+    def finish(self, consumer: Hashable) -> None:
+        """Mark ``consumer`` as done reading, releasing lists only it was still due to read."""
+        with self._lock:
+            self._finished.add(consumer)
+            self._evict_consumed(list(self._readers))
+
+    def _evict_consumed(self, keys: List[Hashable]) -> None:
+        for key in keys:
+            if len(self._readers[key] | self._finished) >= self.consumers:
+                del self._readers[key]
+                if self._entries.pop(key, None) is not None:
+                    self.evictions += 1
+
+    def log_stats(self) -> None:
+        logger.info(f"Shared fetch cache: {self.hits} hits, {self.misses} misses, "
+                    f"{self.evictions} item lists evicted once consumed")
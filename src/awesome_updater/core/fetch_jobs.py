@@ -0,0 +1,120 @@
+import os
+import socket
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from utils.job_queue import Job, JobQueue
+from utils.logger import logger
+from utils.resilience import Deadline
+from utils.tracing import tracer
+
+# A handler runs one job: handler(payload, deadline) -> JSON-serializable result
+Handler = Callable[[Dict[str, Any], Deadline], Any]
+
+
+def new_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def new_run_id() -> str:
+    return f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+def execute(queue: JobQueue, job: Job, worker_id: str, handlers: Dict[str, Handler],
+            deadline: Optional[Deadline] = None) -> None:
+    """Run a leased job and record its result or failure."""
+    handler = handlers.get(job.kind)
+    if handler is None:
+        queue.fail(job, worker_id, f"no handler for job kind {job.kind}")
+        return
+    with tracer.span("job", kind=job.kind, key=job.key, attempt=job.attempts) as span:
+        try:
+            result = handler(job.payload, deadline or Deadline())
+        except Exception as e:
+            span.set_status(f"error: {type(e).__name__}")
+            logger.warning(f"Job {job.kind}:{job.key} attempt {job.attempts} failed: {e}")
+            queue.fail(job, worker_id, f"{type(e).__name__}: {e}")
+            return
+        if not queue.complete(job, worker_id, result):
+            span.set_status("duplicate")
+            logger.debug(f"Discarded late result for job {job.kind}:{job.key}")
+
+
+class FetchCoordinator:
+    """Fans fetch and enrichment work out through the job queue and collects the results.
+
+    The coordinator enqueues one job per query or repository and then helps drain
+    its own run while waiting, so a run completes even with no separate workers.
+    Extra ``awesome_worker`` processes on the same host just make it finish sooner.
+    """
+
+    def __init__(self, queue: JobQueue, run_id: Optional[str] = None,
+                 poll_interval: float = 1.0, wait_seconds: Optional[float] = None):
+        self.queue = queue
+        self.run_id = run_id or new_run_id()
+        self.worker_id = new_worker_id()
+        self.poll_interval = poll_interval
+        self.wait_seconds = wait_seconds
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict], run_id: Optional[str] = None) -> Optional["FetchCoordinator"]:
+        queue = JobQueue.from_config(config)
+        if queue is None:
+            return None
+        settings = (config or {}).get('queue') or {}
+        return cls(queue, run_id, poll_interval=settings.get('poll_interval_seconds', 1.0),
+                   wait_seconds=settings.get('wait_seconds'))
+
+    def run(self, kind: str, payloads: Dict[str, Dict[str, Any]], handlers: Dict[str, Handler],
+            deadline: Optional[Deadline] = None,
+            priorities: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Enqueue one ``kind`` job per key and wait for all of them to finish.
+
+        Returns results by key; keys whose job failed or did not finish before the
+        deadline are missing.
+        """
+        deadline = deadline or Deadline(self.wait_seconds)
+        priorities = priorities or {}
+        added = self.queue.enqueue_many(self.run_id, kind, (
+            (key, payload, priorities.get(key, 0.0)) for key, payload in payloads.items()
+        ))
+        logger.info(f"Queued {added} {kind} jobs for run {self.run_id} "
+                    f"({len(payloads) - added} already queued)")
+
+        with tracer.span("jobs.wait", kind=kind, jobs=len(payloads)) as span:
+            while self.queue.pending(self.run_id, kind) and not deadline.expired():
+                job = self.queue.lease(self.worker_id, run_id=self.run_id, kinds=[kind])
+                if job is not None:
+                    execute(self.queue, job, self.worker_id, handlers, deadline)
+                else:
+                    # Everything left is leased by other workers
+                    time.sleep(self.poll_interval)
+            results = self.queue.results(self.run_id, kind)
+            span.set_attributes(done=sum(1 for value in results.values() if value is not None),
+                                unfinished=len(payloads) - len(results))
+        if len(results) < len(payloads):
+            logger.warning(f"{len(payloads) - len(results)} {kind} jobs unfinished at the deadline")
+        return {key: value for key, value in results.items() if key in payloads and value is not None}
+
+
+def run_worker(queue: JobQueue, handlers: Dict[str, Handler], idle_timeout: float = 60.0,
+               poll_interval: float = 1.0, worker_id: Optional[str] = None) -> int:
+    """Drain jobs from any run until the queue has been empty for ``idle_timeout``.
+
+    Returns the number of jobs processed.
+    """
+    worker_id = worker_id or new_worker_id()
+    processed = 0
+    idle_since = time.monotonic()
+    logger.info(f"Worker {worker_id} started")
+    while time.monotonic() - idle_since < idle_timeout:
+        job = queue.lease(worker_id, kinds=list(handlers))
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+        execute(queue, job, worker_id, handlers)
+        processed += 1
+        idle_since = time.monotonic()
+    logger.info(f"Worker {worker_id} exiting after {processed} jobs")
+    return processed
@@ -3,6 +3,7 @@ import git
 import tempfile
 from datetime import datetime
 from utils.logger import logger
+from utils.tracing import tracer
 
 class GitManager:
     def __init__(self, repo_path=None, target_repo_url=None):
@@ -17,11 +18,12 @@ class GitManager:
             # Clone the target repository
             try:
                 logger.info(f"Cloning repository from {target_repo_url}...")
-                self.repo = git.Repo.clone_from(
-                    self.target_repo_url, 
-                    self.temp_dir,
-                    env={"GIT_ASKPASS": "echo", "GIT_USERNAME": os.getenv("GITHUB_USERNAME"), "GIT_PASSWORD": os.getenv("GITHUB_TOKEN")}
-                )
+                with tracer.span("git.clone", source="git", url=target_repo_url):
+                    self.repo = git.Repo.clone_from(
+                        self.target_repo_url, 
+                        self.temp_dir,
+                        env={"GIT_ASKPASS": "echo", "GIT_USERNAME": os.getenv("GITHUB_USERNAME"), "GIT_PASSWORD": os.getenv("GITHUB_TOKEN")}
+                    )
                 latest_commit = self.repo.head.commit
                 logger.info(f"Successfully cloned repository:")
                 logger.info(f"  - Latest commit: {latest_commit.hexsha[:8]}")
@@ -92,14 +94,15 @@ class GitManager:
             
             # Push changes
             logger.info("Pushing changes to remote repository...")
-            if hasattr(self, 'temp_dir'):
-                self.repo.git.push('origin', 'main')
-                logger.info("Successfully pushed to origin/main")
-            else:
-                origin = self.repo.remote(name='origin')
-                push_info = origin.push()
-                for info in push_info:
-                    logger.info(f"Pushed to {info.remote_ref_string}")
+            with tracer.span("git.push", source="git"):
+                if hasattr(self, 'temp_dir'):
+                    self.repo.git.push('origin', 'main')
+                    logger.info("Successfully pushed to origin/main")
+                else:
+                    origin = self.repo.remote(name='origin')
+                    push_info = origin.push()
+                    for info in push_info:
+                        logger.info(f"Pushed to {info.remote_ref_string}")
             
             logger.info("Git operations completed successfully")
             return True
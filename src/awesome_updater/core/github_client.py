@@ -1,45 +1,525 @@
-from typing import List, Optional, Dict
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
 import requests
+from requests.adapters import HTTPAdapter
 from utils.logger import logger
+from utils.resilience import CircuitBreaker, Deadline, DeadlineExceeded, RetryBudget, backoff_delay
+from utils.tracing import tracer
+
+# Lower numbers are sent first; search always beats metric enrichment
+PRIORITY_SEARCH = 0.0
+PRIORITY_ENRICHMENT = 10.0
+
+# GitHub search serves at most this many results per query
+SEARCH_RESULT_CAP = 1000
+SEARCH_PAGE_SIZE = 100
+# Earliest date a repository can have been created
+SEARCH_EPOCH = date(2008, 1, 1)
+
+README_WORKERS = 8
+# READMEs beyond this size are truncated while streaming
+README_MAX_BYTES = 512 * 1024
+
+
+@dataclass
+class RateLimitBudget:
+    """Primary and secondary rate-limit state for one GitHub API resource.
+
+    Shared by every thread using the client: read and change it under ``lock``.
+    """
+
+    resource: str
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: float = 0.0
+    secondary_until: float = 0.0
+    min_interval: float = 0.0
+    last_request_at: float = 0.0
+    requests: int = 0
+    primary_hits: int = 0
+    secondary_hits: int = 0
+    skipped: int = 0
+    waited_seconds: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def update(self, headers: Any) -> None:
+        """Refresh the budget from ``X-RateLimit-*`` response headers."""
+        with self.lock:
+            if headers.get("X-RateLimit-Limit"):
+                self.limit = int(headers["X-RateLimit-Limit"])
+            reset_at = float(headers["X-RateLimit-Reset"]) if headers.get("X-RateLimit-Reset") else self.reset_at
+            if headers.get("X-RateLimit-Remaining"):
+                remaining = int(headers["X-RateLimit-Remaining"])
+                # Within one window, a response that overtook later requests must not
+                # hand back the quota those requests already reserved
+                if self.remaining is None or reset_at != self.reset_at or remaining < self.remaining:
+                    self.remaining = remaining
+            self.reset_at = reset_at
+
+    def count(self, counter: str, amount: float = 1) -> None:
+        """Add ``amount`` to one of the usage counters."""
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset_at": self.reset_at,
+                "requests": self.requests,
+                "primary_limit_hits": self.primary_hits,
+                "secondary_limit_hits": self.secondary_hits,
+                "skipped_requests": self.skipped,
+                "waited_seconds": round(self.waited_seconds, 3),
+            }
+
+
+@dataclass
+class ReadmeResult:
+    """Outcome of fetching one repository README."""
+
+    repo: str
+    content: Optional[str] = None
+    not_modified: bool = False
+    truncated: bool = False
+
+
+@dataclass(order=True)
+class _QueuedRequest:
+    priority: float
+    seq: int
+    key: Any = field(compare=False)
+    path: str = field(compare=False)
+    params: Optional[Dict[str, Any]] = field(compare=False, default=None)
+    resource: str = field(compare=False, default="core")
+
 
 class GitHubClient:
-    def __init__(self, token: str):
-        self.headers = {"Authorization": f"Bearer {token}"}
+    """GitHub REST client that tracks rate limits per resource and backs off adaptively.
+
+    The ``search`` and ``core`` resources have separate primary budgets
+    (``X-RateLimit-*``) and are throttled independently when a secondary limit
+    (``Retry-After``) is hit. Batches submitted through ``run_prioritized`` are sent
+    in priority order, so low-priority work is what gets skipped when quota runs out.
+    """
+
+    def __init__(self, token: str, max_wait: float = 60.0, reserve: int = 0,
+                 max_retries: int = 3, max_pacing: float = 2.0, timeout: float = 10.0,
+                 session: Optional[requests.Session] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 retry_budget: Optional[RetryBudget] = None,
+                 readme_cache_path: Optional[str] = None):
+        self.headers = {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
         self.base_url = "https://api.github.com"
-    
+        self.max_wait = max_wait
+        self.reserve = reserve
+        self.max_retries = max_retries
+        self.max_pacing = max_pacing
+        self.timeout = timeout
+        # Shared with the fetch layer so GitHub outages short-circuit every caller
+        self.breaker = breaker or CircuitBreaker("github")
+        self.retry_budget = retry_budget
+        if session is None:
+            session = requests.Session()
+            # Large enough for the concurrent README fetches below to reuse connections
+            session.mount("https://", HTTPAdapter(pool_maxsize=README_WORKERS * 2))
+        self.session = session
+        self.session.headers.update(self.headers)
+        # full_name -> (etag, text) for conditional README requests, kept across runs
+        self.readme_cache_path = readme_cache_path
+        self.readme_cache: Dict[str, Tuple[str, str]] = self._load_readme_cache()
+        self.budgets = {name: RateLimitBudget(name) for name in ("core", "search")}
+        self._seq = itertools.count()
+
+    @classmethod
+    def from_config(cls, token: str, config: Optional[Dict] = None) -> "GitHubClient":
+        """Build a client from the ``github.rate_limit`` section of the config."""
+        settings = ((config or {}).get("github") or {}).get("rate_limit") or {}
+        return cls(
+            token,
+            max_wait=settings.get("max_wait_seconds", 60),
+            reserve=settings.get("reserve", 0),
+            max_retries=settings.get("max_retries", 3),
+            max_pacing=settings.get("max_pacing_seconds", 2.0),
+            readme_cache_path=((config or {}).get("github") or {}).get("readme_cache_path"),
+        )
+
+    def _budget_for(self, path: str, resource: Optional[str]) -> RateLimitBudget:
+        if resource is None:
+            resource = "search" if path.lstrip("/").startswith("search/") else "core"
+        return self.budgets.setdefault(resource, RateLimitBudget(resource))
+
+    def _sleep(self, budget: RateLimitBudget, seconds: float) -> None:
+        if seconds > 0:
+            budget.count("waited_seconds", seconds)
+            time.sleep(seconds)
+
+    def _wait_for_budget(self, budget: RateLimitBudget, deadline: Deadline) -> bool:
+        """Block until a request may be sent; False if that would take too long.
+
+        The budget is checked and a send slot and one request of quota are reserved
+        under the budget's lock; the waiting itself happens outside it, so concurrent
+        callers queue up behind each other's slots instead of sending together.
+        """
+        # The reserve protects the large core budget; search only allows ~30 calls a minute
+        reserve = self.reserve if budget.resource == "core" else 0
+        while True:
+            max_wait = self.max_wait
+            if deadline.remaining() is not None:
+                max_wait = min(max_wait, deadline.remaining())
+            exhausted = False
+            with budget.lock:
+                now = time.time()
+                if budget.secondary_until > now:
+                    wait = budget.secondary_until - now
+                elif budget.remaining is not None and budget.remaining <= reserve and budget.reset_at > now:
+                    wait = budget.reset_at - now + 1
+                    exhausted = True
+                else:
+                    # Spread the remaining quota over the time left in the window when it runs low
+                    interval = budget.min_interval
+                    if budget.remaining is not None and budget.limit and budget.reset_at > now:
+                        if budget.remaining < budget.limit * 0.1:
+                            interval = max(interval, (budget.reset_at - now) / max(1, budget.remaining - reserve))
+                    send_at = max(now, budget.last_request_at + min(interval, self.max_pacing))
+                    budget.last_request_at = send_at
+                    if budget.remaining is not None:
+                        budget.remaining -= 1
+                    wait = None
+            if wait is None:
+                self._sleep(budget, send_at - now)
+                return True
+            if wait > max_wait:
+                return False
+            if exhausted:
+                logger.info(f"GitHub {budget.resource} quota exhausted, waiting {wait:.0f}s for reset")
+            self._sleep(budget, wait)
+
+    def request(self, path: str, params: Optional[Dict[str, Any]] = None,
+                resource: Optional[str] = None,
+                headers: Optional[Dict[str, str]] = None,
+                deadline: Optional[Deadline] = None,
+                stream: bool = False) -> Optional[requests.Response]:
+        """Send a GET request, honouring rate limits, the circuit breaker and the deadline.
+
+        Returns the response (which may be an error status other than a rate limit),
+        or None when the request was skipped or retries ran out. With ``stream`` the
+        body is left unread for the caller to consume and close.
+        """
+        url = path if path.startswith("http") else f"{self.base_url}/{path.lstrip('/')}"
+        budget = self._budget_for(path, resource)
+        deadline = deadline or Deadline()
+
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                budget.count("skipped")
+                return None
+            if not self._wait_for_budget(budget, deadline):
+                budget.count("skipped")
+                logger.warning(f"Skipping GitHub request to {path}: {budget.resource} quota unavailable")
+                return None
+
+            with tracer.span("github.request", source="github", resource=budget.resource,
+                             path=path, retries=attempt) as span:
+                sent_at = time.time()
+                budget.count("requests")
+                try:
+                    response = self.session.get(url, params=params, headers=headers,
+                                                timeout=deadline.timeout(self.timeout),
+                                                stream=stream)
+                except DeadlineExceeded:
+                    budget.count("skipped")
+                    span.set_status("deadline")
+                    return None
+                except requests.exceptions.RequestException as e:
+                    span.set_status(f"error: {type(e).__name__}")
+                    self.breaker.record_failure(f"({type(e).__name__})")
+                    if not self._retry(attempt, deadline):
+                        logger.error(f"GitHub request to {path} failed: {e}")
+                        return None
+                    continue
+                latency = time.time() - sent_at
+                budget.update(response.headers)
+                size = (int(response.headers.get("Content-Length") or 0) if stream
+                        else len(response.content))
+                span.set_attributes(status=response.status_code, bytes=size)
+
+            if response.status_code >= 500:
+                self.breaker.record_failure(f"(HTTP {response.status_code})")
+                if attempt < self.max_retries:
+                    response.close()
+                if self._retry(attempt, deadline):
+                    continue
+                return response
+            self.breaker.record_success(latency)
+
+            if response.status_code not in (403, 429):
+                # Let the pacing interval decay again after a quiet stretch
+                with budget.lock:
+                    budget.min_interval /= 2
+                return response
+
+            retry_after = response.headers.get("Retry-After")
+            if retry_after is not None:
+                wait = float(retry_after)
+                with budget.lock:
+                    budget.secondary_hits += 1
+                    budget.secondary_until = max(budget.secondary_until, time.time() + wait)
+                    budget.min_interval = max(1.0, budget.min_interval * 2)
+                logger.warning(f"GitHub secondary rate limit on {budget.resource}, retry after {wait:.0f}s")
+            elif budget.remaining is not None and budget.remaining <= 0:
+                budget.count("primary_hits")
+                logger.warning(f"GitHub primary rate limit on {budget.resource} until {budget.reset_at:.0f}")
+            else:
+                # A plain 403 (permissions, blocked repo) will not improve with retries
+                return response
+            response.close()
+
+        logger.error(f"Giving up on GitHub request to {path} after {self.max_retries} retries")
+        return None
+
+    def _retry(self, attempt: int, deadline: Deadline) -> bool:
+        """Sleep before retrying a failed call; False if no retry is allowed."""
+        if attempt >= self.max_retries:
+            return False
+        if self.retry_budget and not self.retry_budget.acquire():
+            return False
+        delay = backoff_delay(attempt)
+        remaining = deadline.remaining()
+        if remaining is not None and delay >= remaining:
+            return False
+        time.sleep(delay)
+        return True
+
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None,
+                 resource: Optional[str] = None,
+                 deadline: Optional[Deadline] = None) -> Optional[Any]:
+        """GET a path and decode the JSON body; None on any failure."""
+        response = self.request(path, params=params, resource=resource, deadline=deadline)
+        if response is None:
+            return None
+        try:
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.HTTPError as e:
+            if response.status_code != 404:
+                logger.error(f"GitHub request to {path} failed: {e}")
+            return None
+
+    def run_prioritized(self, jobs: List[Tuple[float, Any, str, Optional[Dict[str, Any]]]],
+                        deadline: Optional[Deadline] = None) -> Dict[Any, Any]:
+        """Run ``(priority, key, path, params)`` jobs in priority order.
+
+        Returns a mapping of key to decoded JSON (None for failed or skipped jobs).
+        Once a resource's quota cannot be recovered within ``max_wait``, the
+        remaining lower-priority jobs for that resource are skipped without a call.
+        """
+        queue = [
+            _QueuedRequest(priority, next(self._seq), key, path, params,
+                           self._budget_for(path, None).resource)
+            for priority, key, path, params in jobs
+        ]
+        heapq.heapify(queue)
+        results: Dict[Any, Any] = {}
+        exhausted = set()
+        while queue:
+            job = heapq.heappop(queue)
+            if job.resource in exhausted:
+                self.budgets[job.resource].count("skipped")
+                results[job.key] = None
+                continue
+            skipped_before = self.budgets[job.resource].skipped
+            results[job.key] = self.get_json(job.path, job.params, job.resource, deadline)
+            if self.budgets[job.resource].skipped > skipped_before:
+                exhausted.add(job.resource)
+        return results
+
+    def quota_report(self) -> Dict[str, Any]:
+        report = {name: budget.to_dict() for name, budget in self.budgets.items()}
+        report["circuit"] = self.breaker.to_dict()
+        return report
+
+    def write_quota_report(self, path: str) -> None:
+        """Write the per-run quota usage report as JSON."""
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"generated_at": time.time(), "resources": self.quota_report()}, f, indent=2)
+            logger.info(f"GitHub quota report written to {path}")
+        except OSError as e:
+            logger.error(f"Failed to write GitHub quota report: {e}")
+
     def discover_repos(self, query: str, per_page: int = 10) -> List[Dict]:
         """Discover relevant repositories using GitHub search."""
-        url = f"{self.base_url}/search/repositories"
-        params = {
-            "q": query,
-            "per_page": per_page,
-            "sort": "stars",
-            "order": "desc"
-        }
-        
         try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json().get("items", [])
+            return list(self.iter_search_repos(query, max_results=per_page))
         except Exception as e:
             logger.error(f"Failed to discover repositories: {e}")
             return []
-    
+
+    def iter_search_repos(self, query: str, sort: str = "stars",
+                          max_results: Optional[int] = None, shard_by: str = "created",
+                          since: Optional[date] = None, until: Optional[date] = None,
+                          deadline: Optional[Deadline] = None) -> Iterator[Dict]:
+        """Yield repositories matching ``query``, page by page, as they arrive.
+
+        Pages are followed through the ``Link`` header. GitHub only serves the first
+        1000 results of a search, so when a query matches more than that (and more
+        than ``max_results`` are wanted) it is split into ``shard_by`` date ranges,
+        newest first, until every shard fits under the cap.
+        """
+        since = since or SEARCH_EPOCH
+        until = until or datetime.now(timezone.utc).date()
+        seen = set()
+        for repo in self._search_shard(query, sort, max_results, shard_by, since, until,
+                                       deadline or Deadline()):
+            # pushed: ranges can shift while we page, so a repo may show up twice
+            if repo.get("id") in seen:
+                continue
+            seen.add(repo.get("id"))
+            yield repo
+            if max_results is not None and len(seen) >= max_results:
+                return
+
+    def _search_shard(self, query: str, sort: str, max_results: Optional[int], shard_by: str,
+                      since: date, until: date, deadline: Deadline) -> Iterator[Dict]:
+        qualified = f"{query} {shard_by}:{since.isoformat()}..{until.isoformat()}"
+        params = {"q": qualified, "sort": sort, "order": "desc", "per_page": SEARCH_PAGE_SIZE}
+        url = "search/repositories"
+        if (max_results is None or max_results > SEARCH_RESULT_CAP) and since < until:
+            # Count the matches with a one-result page, so a range that gets split
+            # does not cost a full page that would be thrown away
+            data = self._search_page(url, {**params, "per_page": 1}, qualified, deadline)[0]
+            if data is None:
+                return
+            total = data.get("total_count", 0)
+            if total > SEARCH_RESULT_CAP:
+                middle = since + (until - since) / 2
+                logger.debug("Sharding '{}' ({} results) at {}", query, total, middle)
+                yield from self._search_shard(query, sort, max_results, shard_by,
+                                              middle + timedelta(days=1), until, deadline)
+                yield from self._search_shard(query, sort, max_results, shard_by,
+                                              since, middle, deadline)
+                return
+            if total <= 1:
+                yield from data.get("items", [])
+                return
+        while url:
+            data, response = self._search_page(url, params, qualified, deadline)
+            if data is None:
+                return
+            yield from data.get("items", [])
+            # The next link already carries the query string
+            url = response.links.get("next", {}).get("url")
+            params = None
+
+    def _search_page(self, url: str, params: Optional[Dict[str, Any]], qualified: str,
+                     deadline: Deadline) -> Tuple[Optional[Dict], Optional[requests.Response]]:
+        """One page of search results and its response; (None, None) on failure."""
+        response = self.request(url, params=params, resource="search", deadline=deadline)
+        if response is None or response.status_code != 200:
+            if response is not None:
+                logger.error(f"GitHub search for '{qualified}' failed: HTTP {response.status_code}")
+            return None, None
+        return response.json(), response
+
     def fetch_readme(self, owner: str, repo: str) -> Optional[str]:
         """Fetch README content from a repository."""
-        url = f"{self.base_url}/repos/{owner}/{repo}/readme"
-        
+        return next(self.fetch_readmes([f"{owner}/{repo}"], max_workers=1)).content
+
+    def fetch_readmes(self, repos: Iterable[str], max_workers: int = README_WORKERS,
+                      max_bytes: int = README_MAX_BYTES,
+                      deadline: Optional[Deadline] = None) -> Iterator[ReadmeResult]:
+        """Fetch many ``owner/repo`` READMEs concurrently, yielding results as they complete.
+
+        READMEs are requested in the raw media type, so no base64 JSON wrapper is
+        downloaded or decoded. Previously fetched READMEs are revalidated with
+        ``If-None-Match``; a 304 reuses the cached text and costs no primary quota.
+        Bodies are streamed and cut off at ``max_bytes``.
+        """
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="readme")
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            content = response.json().get("content", "")
-            return self._decode_content(content)
-        except Exception as e:
-            logger.error(f"Failed to fetch README for {owner}/{repo}: {e}")
-            return None
-    
+            futures = [executor.submit(self._fetch_raw_readme, repo, max_bytes, deadline)
+                       for repo in dict.fromkeys(repos)]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Stop queued fetches if the caller stops iterating early
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.save_readme_cache()
+
+    def _load_readme_cache(self) -> Dict[str, Tuple[str, str]]:
+        if not self.readme_cache_path or not os.path.exists(self.readme_cache_path):
+            return {}
+        try:
+            with open(self.readme_cache_path, encoding="utf-8") as f:
+                return {repo: tuple(entry) for repo, entry in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable README cache {self.readme_cache_path}: {e}")
+            return {}
+
+    def save_readme_cache(self) -> None:
+        if not self.readme_cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.readme_cache_path) or ".", exist_ok=True)
+            with open(self.readme_cache_path, "w", encoding="utf-8") as f:
+                json.dump(dict(self.readme_cache), f)
+        except OSError as e:
+            logger.error(f"Failed to write README cache: {e}")
+
+    def _fetch_raw_readme(self, repo: str, max_bytes: int,
+                          deadline: Optional[Deadline]) -> ReadmeResult:
+        headers = {"Accept": "application/vnd.github.raw"}
+        cached = self.readme_cache.get(repo)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        try:
+            response = self.request(f"repos/{repo}/readme", headers=headers,
+                                    deadline=deadline, stream=True)
+            if response is None:
+                return ReadmeResult(repo)
+            with response:
+                if response.status_code == 304 and cached:
+                    return ReadmeResult(repo, cached[1], not_modified=True)
+                if response.status_code != 200:
+                    if response.status_code != 404:
+                        logger.error(f"Failed to fetch README for {repo}: HTTP {response.status_code}")
+                    return ReadmeResult(repo)
+                body, truncated = self._read_capped(response, max_bytes)
+                etag = response.headers.get("ETag")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to fetch README for {repo}: {e}")
+            return ReadmeResult(repo)
+
+        if truncated:
+            logger.warning(f"README for {repo} exceeds {max_bytes} bytes, truncated")
+        content = body.decode("utf-8", errors="ignore")
+        if etag and not truncated:
+            self.readme_cache[repo] = (etag, content)
+        return ReadmeResult(repo, content, truncated=truncated)
+
     @staticmethod
-    def _decode_content(content: str) -> str:
-        """Decode base64 encoded content."""
-        import base64
-        return base64.b64decode(content).decode('utf-8') 
\ No newline at end of file
+    def _read_capped(response: requests.Response, max_bytes: int) -> Tuple[bytes, bool]:
+        """Read a streamed body, stopping once ``max_bytes`` have been received."""
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > max_bytes:
+                return b"".join(chunks)[:max_bytes], True
+        return b"".join(chunks), False
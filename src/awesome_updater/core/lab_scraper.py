@@ -0,0 +1,359 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import pytz
+import requests
+from lxml import etree, html
+from requests.adapters import HTTPAdapter
+from awesome_updater.core.parser_pool import ParserPool
+from utils.logger import logger
+from utils.resilience import Deadline, DeadlineExceeded
+from utils.tracing import tracer
+
+FEED_TYPES = ("application/rss+xml", "application/atom+xml")
+# Anchors on an index page that look like individual posts rather than navigation
+POST_PATH_PATTERN = re.compile(r"/(?:blog|news|research|posts?|publications?|\d{4})/[^?#]+", re.IGNORECASE)
+# Seen-URL state kept per site, enough to cover several feed pages
+MAX_SEEN_PER_SITE = 2000
+
+
+@dataclass
+class LabSite:
+    name: str
+    url: str  # blog or news index page
+    feed: Optional[str] = None
+    sitemap: Optional[str] = None
+    # Regex that post URLs match, for sitemaps and the HTML fallback
+    post_pattern: Optional[str] = None
+    max_posts: int = 20
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LabSite":
+        return cls(**{key: value for key, value in data.items() if key in cls.__dataclass_fields__})
+
+
+def _local(tag: Any) -> str:
+    return etree.QName(tag).localname if isinstance(tag, str) else ""
+
+
+def _text(element: Optional[Any]) -> str:
+    return " ".join("".join(element.itertext()).split()) if element is not None else ""
+
+
+def parse_document(kind: str, content: bytes, base_url: str) -> Dict[str, List[Dict[str, str]]]:
+    """Parse a feed, sitemap or HTML page into candidate posts (and, for HTML, feed links).
+
+    Runs in a worker process, so it only takes and returns plain data.
+    """
+    posts: List[Dict[str, str]] = []
+    feeds: List[str] = []
+    if kind == "html":
+        tree = html.fromstring(content, base_url=base_url)
+        for link in tree.xpath('//link[@rel="alternate"][@href]'):
+            if (link.get("type") or "").lower() in FEED_TYPES:
+                feeds.append(urljoin(base_url, link.get("href")))
+        for anchor in tree.xpath("//a[@href]"):
+            title = _text(anchor)
+            if title:
+                posts.append({"url": urljoin(base_url, anchor.get("href")).split("#")[0], "title": title})
+        return {"posts": posts, "feeds": feeds}
+
+    parser = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
+    root = etree.fromstring(content, parser)
+    if root is None:
+        return {"posts": posts, "feeds": feeds}
+    for element in root.iter():
+        name = _local(element.tag)
+        children = {_local(child.tag): child for child in element}
+        if kind == "sitemap" and name == "url":
+            loc = _text(children.get("loc"))
+            if loc:
+                posts.append({"url": loc, "title": "", "date": _text(children.get("lastmod"))})
+        elif kind == "feed" and name in ("item", "entry"):
+            link = children.get("link")
+            url = ""
+            if link is not None:
+                # Atom: <link rel="alternate" href="..."/>; RSS: <link>...</link>
+                url = link.get("href") or _text(link)
+                for child in element:
+                    if _local(child.tag) == "link" and child.get("rel", "alternate") == "alternate" and child.get("href"):
+                        url = child.get("href")
+                        break
+            url = url or _text(children.get("guid"))
+            date = next((_text(children[tag]) for tag in ("pubDate", "published", "updated", "date")
+                         if tag in children), "")
+            summary = next((_text(children[tag]) for tag in ("description", "summary", "content")
+                            if tag in children), "")
+            if url:
+                posts.append({"url": urljoin(base_url, url), "title": _text(children.get("title")),
+                              "date": date, "summary": summary[:1000]})
+    return {"posts": posts, "feeds": feeds}
+
+
+def _parse_post_date(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)  # RFC 822, used by RSS
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else pytz.UTC.localize(parsed)
+
+
+def _title_from_url(url: str) -> str:
+    """Best-effort title for sitemap entries, which carry none: the URL slug."""
+    slug = urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+    return re.sub(r"[-_]+", " ", os.path.splitext(slug)[0]).strip().capitalize() or url
+
+
+class DomainThrottle:
+    """Per-domain politeness: bounded concurrency and a minimum gap between requests."""
+
+    def __init__(self, concurrency: int = 2, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self._semaphores: Dict[str, threading.Semaphore] = defaultdict(lambda: threading.Semaphore(concurrency))
+        self._next_slot: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> threading.Semaphore:
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            semaphore = self._semaphores[host]
+        semaphore.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot[host])
+            self._next_slot[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+        return semaphore
+
+
+class LabScraper:
+    """Incrementally discovers new posts on lab blogs and news pages.
+
+    Each site is read from its RSS/Atom feed when it has one (configured or
+    advertised by the index page), else from its sitemap, else from the post-like
+    links on the index page. Requests are conditional (ETag / Last-Modified) and
+    throttled per domain; documents are parsed with lxml in the run's parser pool.
+    URLs already returned in earlier runs are remembered per site and skipped.
+    The seen URLs and validators of a run are only recorded by ``commit``, once the
+    run that used its posts succeeded, so a failed run returns the same posts again.
+    """
+
+    def __init__(self, sites: List[LabSite], state_path: Optional[str] = None,
+                 per_domain_concurrency: int = 2, min_interval: float = 1.0,
+                 max_workers: int = 8, timeout: float = 15.0, max_age_days: float = 30,
+                 parsers: Optional[ParserPool] = None):
+        self.sites = sites
+        self.state_path = state_path
+        self.max_workers = max_workers
+        self.parsers = parsers or ParserPool()
+        self.timeout = timeout
+        self.max_age = timedelta(days=max_age_days)
+        self.throttle = DomainThrottle(per_domain_concurrency, min_interval)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["User-Agent"] = "awesome-tools-lab-scraper/0.1"
+        self._lock = threading.Lock()
+        # {"validators": {url: {"etag", "last_modified"}}, "seen": {site: {url: first_seen}}}
+        self.state: Dict[str, Dict[str, Any]] = self._load_state()
+        # What this run fetched and returned, recorded in ``state`` by ``commit``
+        self._pending: Dict[str, Dict[str, Any]] = {"validators": {}, "seen": {}}
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict], parsers: Optional[ParserPool] = None) -> Optional["LabScraper"]:
+        """Build a scraper from the ``labs`` config section; None when disabled or empty."""
+        settings = (config or {}).get('labs') or {}
+        sites = [LabSite.from_dict(site) for site in settings.get('sites') or []]
+        if not settings.get('enabled') or not sites:
+            return None
+        return cls(
+            sites,
+            state_path=settings.get('state_path'),
+            per_domain_concurrency=settings.get('per_domain_concurrency', 2),
+            min_interval=settings.get('min_interval_seconds', 1.0),
+            max_workers=settings.get('max_workers', 8),
+            timeout=settings.get('timeout_seconds', 15),
+            max_age_days=settings.get('max_age_days', 30),
+            parsers=parsers,
+        )
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        state = {"validators": {}, "seen": {}}
+        if not self.state_path or not os.path.exists(self.state_path):
+            return state
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state.update(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable lab scraper state {self.state_path}: {e}")
+        return state
+
+    def save_state(self) -> None:
+        if not self.state_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+            with self._lock, open(self.state_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f)
+        except OSError as e:
+            logger.error(f"Failed to write lab scraper state: {e}")
+
+    def _fetch(self, url: str, deadline: Deadline) -> Tuple[Optional[int], Optional[bytes]]:
+        """Conditional GET; returns (status, body), body None unless the document changed."""
+        with self._lock:
+            validators = dict(self.state["validators"].get(url) or {})
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        semaphore = self.throttle.acquire(url)
+        try:
+            response = self.session.get(url, headers=headers, timeout=deadline.timeout(self.timeout))
+        except (requests.exceptions.RequestException, DeadlineExceeded) as e:
+            logger.warning(f"Could not fetch {url}: {e}")
+            return None, None
+        finally:
+            semaphore.release()
+        if response.status_code != 200:
+            if response.status_code != 304:
+                logger.warning(f"Could not fetch {url}: HTTP {response.status_code}")
+            return response.status_code, None
+        with self._lock:
+            self._pending["validators"][url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+        return 200, response.content
+
+    def _read(self, kind: str, url: str, deadline: Deadline) -> Tuple[Optional[int], Dict[str, List]]:
+        status, content = self._fetch(url, deadline)
+        if content is None:
+            return status, {"posts": [], "feeds": []}
+        try:
+            return status, self.parsers.submit(parse_document, kind, content, url).result()
+        except Exception as e:
+            logger.warning(f"Failed to parse {url}: {e}")
+            return None, {"posts": [], "feeds": []}
+
+    def _discover(self, site: LabSite, deadline: Deadline) -> Tuple[List[Dict[str, str]], List[str]]:
+        """Candidate posts of one site, from the best source that responds, and the URLs read."""
+        pattern = re.compile(site.post_pattern) if site.post_pattern else POST_PATH_PATTERN
+        host = urlsplit(site.url).hostname
+        page = None
+        sources = []
+
+        def read(kind: str, url: str) -> Tuple[Optional[int], Dict[str, List]]:
+            sources.append(url)
+            return self._read(kind, url, deadline)
+
+        feed = site.feed
+        if not feed:
+            status, page = read("html", site.url)
+            if status == 304:
+                return [], sources  # The index page is unchanged, so nothing new was published
+            feed = next(iter(page["feeds"]), None)
+        if feed:
+            status, parsed = read("feed", feed)
+            if status in (200, 304):
+                return parsed["posts"], sources
+
+        if site.sitemap:
+            status, parsed = read("sitemap", site.sitemap)
+            if status in (200, 304):
+                return [post for post in parsed["posts"] if pattern.search(post["url"])], sources
+
+        if page is None:
+            _, page = read("html", site.url)
+        return [post for post in page["posts"]
+                if urlsplit(post["url"]).hostname == host and pattern.search(post["url"])
+                and post["url"].rstrip("/") != site.url.rstrip("/")], sources
+
+    def _scrape_site(self, site: LabSite, deadline: Deadline) -> List[Dict[str, Any]]:
+        with tracer.span("labs.site", site=site.name) as span:
+            posts, sources = self._discover(site, deadline)
+            cutoff = datetime.now(pytz.UTC) - self.max_age
+            now = time.time()
+            items = []
+            with self._lock:
+                seen = self.state["seen"].get(site.name) or {}
+                returned = self._pending["seen"].setdefault(site.name, {})
+                for post in dict((post["url"], post) for post in posts).values():
+                    if len(items) >= site.max_posts:
+                        # Left unseen, and the documents are fetched in full again next
+                        # run (not answered with a 304), so the rest are picked up then
+                        for url in sources:
+                            self._pending["validators"].pop(url, None)
+                        break
+                    if post["url"] in seen:
+                        continue
+                    published = _parse_post_date(post.get("date", ""))
+                    if published and published < cutoff:
+                        continue
+                    returned[post["url"]] = now
+                    items.append({
+                        'title': post.get("title") or _title_from_url(post["url"]),
+                        'description': post.get("summary") or "",
+                        'links': [post["url"]],
+                        'type': 'blog',
+                        'lab': site.name,
+                        'published_date': published.isoformat() if published else None,
+                    })
+            span.set_attributes(candidates=len(posts), new=len(items))
+        return items
+
+    def scrape(self, deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+        """New posts from every site since the last committed run."""
+        deadline = deadline or Deadline()
+        items: List[Dict[str, Any]] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._scrape_site, site, deadline): site for site in self.sites}
+            for future in as_completed(futures):
+                site = futures[future]
+                try:
+                    site_items = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to scrape {site.name}: {e}")
+                    continue
+                logger.info(f"{site.name}: {len(site_items)} new posts")
+                items.extend(site_items)
+        return items
+
+    def mark_seen(self, posts: Dict[str, List[str]]) -> None:
+        """Record post URLs by site, returned by an earlier attempt of this run, on ``commit``."""
+        now = time.time()
+        with self._lock:
+            for site, urls in posts.items():
+                returned = self._pending["seen"].setdefault(site, {})
+                for url in urls:
+                    returned.setdefault(url, now)
+
+    def commit(self) -> None:
+        """Record the posts returned and the validators fetched this run as seen."""
+        with self._lock:
+            self.state["validators"].update(self._pending["validators"])
+            for site, returned in self._pending["seen"].items():
+                seen = self.state["seen"].setdefault(site, {})
+                seen.update(returned)
+                if len(seen) > MAX_SEEN_PER_SITE:
+                    for url in sorted(seen, key=seen.get)[:len(seen) - MAX_SEEN_PER_SITE]:
+                        del seen[url]
+            self._pending = {"validators": {}, "seen": {}}
+        self.save_state()
@@ -0,0 +1,187 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from utils.logger import log_sampler, logger
+
+# Markdown links "[text](url)", autolinks "<url>" and bare URLs
+URL_PATTERN = re.compile(r"\]\((https?://[^)\s]+)\)|<(https?://[^>\s]+)>|(?<![(<\[])(https?://[^\s)<>\]|]+)")
+PERMANENT_REDIRECTS = (301, 308)
+# Statuses that mean the link is gone rather than temporarily unavailable
+DEAD_STATUSES = (404, 410)
+
+
+@dataclass
+class LinkResult:
+    url: str
+    status: str  # ok, redirected, dead, error
+    http_status: Optional[int] = None
+    final_url: Optional[str] = None
+    error: Optional[str] = None
+    checked_at: float = 0.0
+    failures: int = 0  # consecutive dead results across runs
+
+
+def extract_urls(readme: str) -> List[str]:
+    """Return every distinct http(s) URL in a README, in order of appearance."""
+    seen = {}
+    for match in URL_PATTERN.finditer(readme):
+        url = next(group for group in match.groups() if group).rstrip(".,;")
+        seen.setdefault(url, None)
+    return list(seen)
+
+
+class LinkChecker:
+    """Checks many URLs concurrently with per-host limits and a persistent TTL cache.
+
+    Requests share one pooled session, so connections to the same host are reused.
+    HEAD is tried first and GET is used when a server rejects HEAD. Results are cached
+    on disk; only links whose cached result is older than the TTL are re-checked.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, ttl_hours: float = 72,
+                 per_host_concurrency: int = 4, max_workers: int = 32, timeout: float = 10):
+        self.cache_path = cache_path
+        self.ttl = ttl_hours * 3600
+        self.per_host_concurrency = per_host_concurrency
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["User-Agent"] = "awesome-tools-link-audit/0.1"
+        self._host_limits: Dict[str, threading.Semaphore] = defaultdict(
+            lambda: threading.Semaphore(self.per_host_concurrency)
+        )
+        self._host_lock = threading.Lock()
+        self.cache: Dict[str, LinkResult] = self._load_cache()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "LinkChecker":
+        settings = (config or {}).get('link_audit') or {}
+        return cls(
+            cache_path=settings.get('cache_path'),
+            ttl_hours=settings.get('ttl_hours', 72),
+            per_host_concurrency=settings.get('per_host_concurrency', 4),
+            max_workers=settings.get('max_workers', 32),
+            timeout=settings.get('timeout_seconds', 10),
+        )
+
+    def _load_cache(self) -> Dict[str, LinkResult]:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                return {url: LinkResult(**data) for url, data in json.load(f).items()}
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable link cache {self.cache_path}: {e}")
+            return {}
+
+    def save_cache(self) -> None:
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump({url: asdict(result) for url, result in self.cache.items()}, f)
+
+    def _is_fresh(self, result: LinkResult) -> bool:
+        # Transient errors are always re-checked; settled results live for the TTL
+        return result.status != "error" and time.time() - result.checked_at < self.ttl
+
+    def _host_semaphore(self, url: str) -> threading.Semaphore:
+        host = urlsplit(url).hostname or ""
+        with self._host_lock:
+            return self._host_limits[host]
+
+    def check(self, url: str) -> LinkResult:
+        """Check a single URL, following redirects."""
+        with self._host_semaphore(url):
+            try:
+                response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+                if response.status_code in (403, 405, 429, 501) or response.status_code >= 500:
+                    # Many servers reject or mishandle HEAD; confirm with a streamed GET
+                    response = self.session.get(url, allow_redirects=True, timeout=self.timeout,
+                                                stream=True)
+                    response.close()
+            except requests.exceptions.RequestException as e:
+                return LinkResult(url, "error", error=type(e).__name__, checked_at=time.time())
+
+        result = LinkResult(url, "ok", http_status=response.status_code, checked_at=time.time())
+        if response.status_code in DEAD_STATUSES:
+            result.status = "dead"
+        elif response.status_code >= 400:
+            result.status = "error"
+        elif response.history and all(r.status_code in PERMANENT_REDIRECTS for r in response.history):
+            result.status = "redirected"
+            result.final_url = response.url
+        return result
+
+    def check_all(self, urls: Iterable[str]) -> Dict[str, LinkResult]:
+        """Check every URL whose cached result is stale; returns results for all of them."""
+        urls = list(dict.fromkeys(urls))
+        stale = [url for url in urls if url not in self.cache or not self._is_fresh(self.cache[url])]
+        logger.info(f"Checking {len(stale)} of {len(urls)} links ({len(urls) - len(stale)} cached)")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.check, url): url for url in stale}
+            for future in as_completed(futures):
+                result = future.result()
+                previous = self.cache.get(result.url)
+                if result.status == "dead":
+                    result.failures = (previous.failures if previous else 0) + 1
+                self.cache[result.url] = result
+
+        self.save_cache()
+        return {url: self.cache[url] for url in urls}
+
+
+def build_report(results: Dict[str, LinkResult]) -> Dict[str, object]:
+    by_status: Dict[str, List[Dict]] = defaultdict(list)
+    for result in results.values():
+        by_status[result.status].append(asdict(result))
+    return {
+        "checked": len(results),
+        "counts": {status: len(entries) for status, entries in by_status.items()},
+        "dead": by_status.get("dead", []),
+        "redirected": by_status.get("redirected", []),
+        "errors": by_status.get("error", []),
+    }
+
+
+def apply_fixes(readme: str, results: Dict[str, LinkResult], remove_dead: bool = True,
+                rewrite_redirects: bool = True, remove_after_failures: int = 2) -> str:
+    """Rewrite permanently redirected links and drop entries whose links are all dead.
+
+    An entry (table row or list item) is only removed once its links have been dead
+    for ``remove_after_failures`` consecutive checks, so one bad run cannot prune it.
+    """
+    lines = []
+    for line in readme.splitlines(keepends=True):
+        urls = extract_urls(line)
+        is_entry = line.lstrip().startswith(("|", "- ", "* "))
+        if remove_dead and is_entry and urls and all(
+            results.get(url) and results[url].status == "dead"
+            and results[url].failures >= remove_after_failures
+            for url in urls
+        ):
+            if log_sampler.allow("link_removed"):
+                logger.info("Removing dead entry: {}", line.strip()[:100])
+            continue
+        if rewrite_redirects:
+            for url in urls:
+                result = results.get(url)
+                if result and result.status == "redirected" and result.final_url:
+                    # Only whole URLs, so "/repo" is not rewritten inside "/repo-extra"
+                    line = re.sub(re.escape(url) + r"(?![\w/\-.])", lambda _: result.final_url, line)
+        lines.append(line)
+    return "".join(lines)
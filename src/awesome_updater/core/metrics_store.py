@@ -0,0 +1,230 @@
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from utils.logger import logger
+
+# series index, timestamp, pushed_at, stars, forks
+RECORD = struct.Struct("<Iddqq")
+DAY = 86400.0
+
+
+@dataclass
+class Snapshot:
+    timestamp: float
+    stars: int
+    forks: int
+    pushed_at: float  # 0 when unknown
+
+
+class Series:
+    """Parallel, time-ordered arrays of snapshots for one repository."""
+
+    __slots__ = ("times", "stars", "forks", "pushed")
+
+    def __init__(self):
+        self.times = array("d")
+        self.stars = array("q")
+        self.forks = array("q")
+        self.pushed = array("d")
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def append(self, timestamp: float, stars: int, forks: int, pushed_at: float) -> None:
+        # Snapshots almost always arrive in order; fall back to an insert otherwise
+        i = len(self.times) if not self.times or timestamp >= self.times[-1] \
+            else bisect_right(self.times, timestamp)
+        self.times.insert(i, timestamp)
+        self.stars.insert(i, stars)
+        self.forks.insert(i, forks)
+        self.pushed.insert(i, pushed_at)
+
+    def snapshot(self, i: int) -> Snapshot:
+        return Snapshot(self.times[i], self.stars[i], self.forks[i], self.pushed[i])
+
+    def range(self, start: float, end: float) -> List[Snapshot]:
+        lo, hi = bisect_left(self.times, start), bisect_right(self.times, end)
+        return [self.snapshot(i) for i in range(lo, hi)]
+
+    def at_or_before(self, timestamp: float) -> Optional[int]:
+        i = bisect_right(self.times, timestamp) - 1
+        return i if i >= 0 else None
+
+    def downsample(self, before: float, bucket: float) -> int:
+        """Keep only the last point per ``bucket`` seconds among points older than ``before``."""
+        cut = bisect_left(self.times, before)
+        keep = [i for i in range(cut)
+                if i == cut - 1 or self.times[i] // bucket != self.times[i + 1] // bucket]
+        removed = cut - len(keep)
+        if removed:
+            keep.extend(range(cut, len(self.times)))
+            for name in self.__slots__:
+                column = getattr(self, name)
+                setattr(self, name, array(column.typecode, (column[i] for i in keep)))
+        return removed
+
+
+class MetricsStore:
+    """Append-only store of repository metric snapshots, one series per repo.
+
+    Snapshots live in memory as array-backed columns and on disk as fixed-size
+    binary records appended to ``points.bin``, with repo names listed once each in
+    ``series.names``. Old points can be thinned with ``downsample``, which rewrites
+    the log; everything else only ever appends.
+    """
+
+    def __init__(self, path: Optional[str] = None, velocity_window_days: float = 7):
+        self.path = path
+        self.velocity_window = velocity_window_days * DAY
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.series: Dict[int, Series] = {}
+        self._pending = bytearray()
+        self._pending_names: List[str] = []
+        # Fetchers for several list profiles may share one store
+        self._lock = threading.RLock()
+        if path:
+            self._load()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "MetricsStore":
+        settings = (config or {}).get('metrics_store') or {}
+        return cls(settings.get('path'), settings.get('velocity_window_days', 7))
+
+    @staticmethod
+    def key(repo: str) -> str:
+        """Normalize ``owner/repo`` (or ``repos/owner/repo``) to a series name."""
+        return repo.lower().removeprefix("repos/").strip("/")
+
+    def _load(self) -> None:
+        names_path = os.path.join(self.path, "series.names")
+        points_path = os.path.join(self.path, "points.bin")
+        try:
+            if os.path.exists(names_path):
+                with open(names_path, encoding="utf-8") as f:
+                    for line in f:
+                        self._register(line.rstrip("\n"))
+            if os.path.exists(points_path):
+                with open(points_path, "rb") as f:
+                    data = f.read()
+                # Ignore a torn record at the end of the log
+                usable = len(data) - len(data) % RECORD.size
+                for index, ts, pushed, stars, forks in RECORD.iter_unpack(data[:usable]):
+                    if index < len(self.names):
+                        self.series[index].append(ts, stars, forks, pushed)
+        except OSError as e:
+            logger.warning(f"Could not load metrics store from {self.path}: {e}")
+        self._pending_names.clear()
+        logger.info(f"Loaded {sum(len(s) for s in self.series.values())} metric snapshots "
+                    f"for {len(self.names)} repos")
+
+    def _register(self, name: str) -> int:
+        index = self.index.get(name)
+        if index is None:
+            index = self.index[name] = len(self.names)
+            self.names.append(name)
+            self.series[index] = Series()
+            self._pending_names.append(name)
+        return index
+
+    def record(self, repo: str, stars: int, forks: int = 0, pushed_at: Optional[str] = None,
+               timestamp: Optional[float] = None) -> None:
+        """Append one snapshot for ``repo``; call ``flush`` to persist pending snapshots."""
+        timestamp = timestamp or time.time()
+        pushed = _to_timestamp(pushed_at)
+        with self._lock:
+            index = self._register(self.key(repo))
+            self.series[index].append(timestamp, int(stars or 0), int(forks or 0), pushed)
+            self._pending += RECORD.pack(index, timestamp, pushed, int(stars or 0), int(forks or 0))
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self.path or not (self._pending or self._pending_names):
+            return
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            # Names first, so every record on disk refers to a known series
+            with open(os.path.join(self.path, "series.names"), "a", encoding="utf-8") as f:
+                f.writelines(f"{name}\n" for name in self._pending_names)
+            with open(os.path.join(self.path, "points.bin"), "ab") as f:
+                f.write(self._pending)
+            self._pending.clear()
+            self._pending_names.clear()
+        except OSError as e:
+            logger.error(f"Failed to write metrics snapshots: {e}")
+
+    def get(self, repo: str) -> Optional[Series]:
+        index = self.index.get(self.key(repo))
+        return self.series.get(index) if index is not None else None
+
+    def range(self, repo: str, start: float = 0.0, end: float = float("inf")) -> List[Snapshot]:
+        series = self.get(repo)
+        return series.range(start, end) if series else []
+
+    def _rate(self, series: Series, start: float, end: float) -> Optional[float]:
+        """Stars per day between the points nearest ``start`` and ``end``."""
+        first, last = series.at_or_before(start), series.at_or_before(end)
+        if first is None:
+            # Young series: measure from the oldest point if it is inside the window
+            first = 0 if series.times[0] < end else None
+        if first is None or last is None or series.times[last] - series.times[first] < DAY / 4:
+            return None
+        return (series.stars[last] - series.stars[first]) / ((series.times[last] - series.times[first]) / DAY)
+
+    def momentum(self, repo: str) -> Dict[str, Optional[float]]:
+        """Star velocity (stars/day over the window) and its change versus the window before."""
+        series = self.get(repo)
+        if not series or len(series) < 2:
+            return {"stars_per_day": None, "acceleration": None}
+        now = series.times[-1]
+        velocity = self._rate(series, now - self.velocity_window, now)
+        previous = self._rate(series, now - 2 * self.velocity_window, now - self.velocity_window)
+        acceleration = None
+        if velocity is not None and previous is not None:
+            acceleration = (velocity - previous) / (self.velocity_window / DAY)
+        return {"stars_per_day": velocity, "acceleration": acceleration}
+
+    def downsample(self, older_than_days: float = 30, bucket_hours: float = 24) -> int:
+        """Thin points older than the cutoff to one per bucket and rewrite the log."""
+        cutoff = time.time() - older_than_days * DAY
+        with self._lock:
+            removed = sum(s.downsample(cutoff, bucket_hours * 3600) for s in self.series.values())
+            if removed and self.path:
+                self._flush()
+                self._rewrite()
+                logger.info(f"Downsampled {removed} old metric snapshots")
+        return removed
+
+    def _rewrite(self) -> None:
+        points_path = os.path.join(self.path, "points.bin")
+        tmp_path = points_path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                for index, series in self.series.items():
+                    f.write(b"".join(
+                        RECORD.pack(index, series.times[i], series.pushed[i],
+                                    series.stars[i], series.forks[i])
+                        for i in range(len(series))
+                    ))
+            os.replace(tmp_path, points_path)
+        except OSError as e:
+            logger.error(f"Failed to compact metrics store: {e}")
+
+
+def _to_timestamp(value: Optional[str]) -> float:
+    if not value:
+        return 0.0
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
@@ -0,0 +1,45 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from utils.logger import logger
+
+
+def _context() -> multiprocessing.context.BaseContext:
+    """A start method that does not fork the (multi-threaded) parent process."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class ParserPool:
+    """Run-wide process pool for CPU-bound parsing (PDF prefixes, lab pages and feeds).
+
+    The worker processes are started on first use and reused until ``close``, so a
+    run pays the start-up cost once rather than per batch. Workers are started with
+    ``forkserver`` (``spawn`` where unavailable): forking a process that already runs
+    HTTP and profile threads can copy locks held by those threads into the child.
+    """
+
+    def __init__(self, processes: int = 2):
+        self.processes = max(1, processes)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "ParserPool":
+        return cls(((config or {}).get('runner') or {}).get('parser_processes', 2))
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        with self._lock:
+            if self._executor is None:
+                logger.debug("Starting {} parser processes", self.processes)
+                self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=_context())
+            executor = self._executor
+        return executor.submit(fn, *args)
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
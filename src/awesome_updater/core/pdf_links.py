@@ -0,0 +1,202 @@
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from awesome_updater.core.parser_pool import ParserPool
+from utils.logger import logger
+from utils.resilience import Deadline, DeadlineExceeded
+from utils.tracing import tracer
+
+ARXIV_ID_PATTERN = re.compile(r"arxiv\.org/(?:abs|pdf)/([\w.\-/]+?)(?:v\d+)?(?:\.pdf)?$")
+STREAM_PATTERN = re.compile(rb"stream\r?\n(.*?)(?:(?:\r?\n)?endstream|$)", re.DOTALL)
+# Strings shown by text operators: "(...) Tj" and "[(...) -250 (...)] TJ"
+TEXT_STRING_PATTERN = re.compile(rb"\(((?:[^()\\]|\\.)*)\)")
+TEXT_SHOW_PATTERN = re.compile(rb"\[((?:[^\]\\]|\\.)*)\]\s*TJ|(\((?:[^()\\]|\\.)*\))\s*Tj")
+CODE_LINK_PATTERN = re.compile(
+    r"https?://(?:www\.)?(?:github\.com/[\w.\-]+/[\w.\-]+|[\w\-]+\.github\.io(?:/[\w.\-/]*)?"
+    r"|sites\.google\.com/view/[\w.\-/]+)",
+    re.IGNORECASE,
+)
+# Escape sequences inside PDF string literals
+ESCAPES = {rb"\(": b"(", rb"\)": b")", rb"\\": b"\\"}
+
+
+def arxiv_id(url: str) -> Optional[str]:
+    """The version-less arXiv ID of an abs or pdf URL."""
+    match = ARXIV_ID_PATTERN.search(url or "")
+    return match.group(1) if match else None
+
+
+def _inflate(data: bytes) -> bytes:
+    """Inflate as much of a (possibly truncated) Flate stream as is available."""
+    try:
+        return zlib.decompressobj().decompress(data)
+    except zlib.error:
+        return b""
+
+
+def extract_links(pdf_prefix: bytes) -> List[str]:
+    """Find code and project links in the first bytes of a PDF.
+
+    Looks at link annotations (``/URI``) and at the strings drawn by text operators,
+    both in uncompressed objects and in Flate streams. Runs in a worker process.
+    """
+    chunks = [pdf_prefix]
+    for match in STREAM_PATTERN.finditer(pdf_prefix):
+        inflated = _inflate(match.group(1))
+        if inflated:
+            chunks.append(inflated)
+
+    texts = []
+    for chunk in chunks:
+        texts.append(chunk)
+        # Join the pieces of each TJ array so URLs split by kerning become whole again
+        shown = [b"".join(TEXT_STRING_PATTERN.findall(array or single))
+                 for array, single in TEXT_SHOW_PATTERN.findall(chunk)]
+        if shown:
+            joined = b"\n".join(shown)
+            for escaped, plain in ESCAPES.items():
+                joined = joined.replace(escaped, plain)
+            texts.append(joined)
+
+    links: Dict[str, None] = {}
+    for text in texts:
+        for link in CODE_LINK_PATTERN.findall(text.decode("latin-1")):
+            links.setdefault(link.rstrip(".,;)"), None)
+    return list(links)
+
+
+class PdfLinkScanner:
+    """Finds code links in arXiv PDFs by downloading only their first few kilobytes.
+
+    Downloads use HTTP range requests over a pooled session on a thread pool; the
+    CPU-bound inflate and text scan run in the run's parser pool. Results, including
+    papers without links, are cached per arXiv ID so each paper is scanned once.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, max_bytes: int = 256 * 1024,
+                 download_workers: int = 4, timeout: float = 20.0, max_papers: int = 100,
+                 pdf_base_url: str = "https://arxiv.org/pdf", parsers: Optional[ParserPool] = None):
+        self.cache_path = cache_path
+        self.max_bytes = max_bytes
+        self.download_workers = download_workers
+        self.parsers = parsers or ParserPool()
+        self.timeout = timeout
+        self.max_papers = max_papers
+        self.pdf_base_url = pdf_base_url.rstrip("/")
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=download_workers))
+        self.cache: Dict[str, Dict[str, Any]] = self._load_cache()
+        # Shared by the fetchers of all list profiles in a run
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict],
+                    parsers: Optional[ParserPool] = None) -> Optional["PdfLinkScanner"]:
+        """Build a scanner from the ``pdf_links`` config section; None when disabled."""
+        settings = (config or {}).get('pdf_links') or {}
+        if not settings.get('enabled'):
+            return None
+        return cls(
+            cache_path=settings.get('cache_path'),
+            max_bytes=settings.get('max_kb', 256) * 1024,
+            download_workers=settings.get('download_workers', 4),
+            timeout=settings.get('timeout_seconds', 20),
+            max_papers=settings.get('max_papers', 100),
+            parsers=parsers,
+        )
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable PDF link cache {self.cache_path}: {e}")
+            return {}
+
+    def save_cache(self) -> None:
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            with self._lock, open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump(self.cache, f)
+        except OSError as e:
+            logger.error(f"Failed to write PDF link cache: {e}")
+
+    def _download_prefix(self, url: str, deadline: Deadline) -> Optional[bytes]:
+        try:
+            response = self.session.get(url, headers={"Range": f"bytes=0-{self.max_bytes - 1}"},
+                                        stream=True, timeout=deadline.timeout(self.timeout))
+        except (requests.exceptions.RequestException, DeadlineExceeded) as e:
+            logger.warning(f"Could not fetch PDF prefix of {url}: {e}")
+            return None
+        with response:
+            if response.status_code not in (200, 206):
+                logger.warning(f"Could not fetch PDF prefix of {url}: HTTP {response.status_code}")
+                return None
+            # Servers that ignore Range send the whole file; stop reading at the cap
+            data = bytearray()
+            for chunk in response.iter_content(chunk_size=32 * 1024):
+                data += chunk
+                if len(data) >= self.max_bytes:
+                    break
+            return bytes(data[:self.max_bytes])
+
+    def scan(self, items: List[Dict[Any, Any]], deadline: Optional[Deadline] = None) -> int:
+        """Attach ``code_links`` to research items without a GitHub link; returns how many gained one.
+
+        Found links are also appended to ``links`` so metric enrichment sees them.
+        """
+        deadline = deadline or Deadline()
+        candidates = {}
+        for item in items:
+            links = item.get('links') or []
+            if item.get('type') != 'research' or any('github.com' in link for link in links if link):
+                continue
+            paper_id = next((arxiv_id(link) for link in links if arxiv_id(link)), None)
+            if paper_id:
+                candidates.setdefault(paper_id, []).append(item)
+
+        to_fetch = [paper_id for paper_id in candidates if paper_id not in self.cache][:self.max_papers]
+        with tracer.span("pdf_links.scan", papers=len(candidates), downloads=len(to_fetch)) as span:
+            if to_fetch:
+                urls = [f"{self.pdf_base_url}/{paper_id}" for paper_id in to_fetch]
+                with ThreadPoolExecutor(max_workers=self.download_workers) as downloads:
+                    prefixes = downloads.map(lambda url: self._download_prefix(url, deadline), urls)
+                    # Hand each prefix to the parser pool as soon as it is downloaded
+                    pending = {paper_id: self.parsers.submit(extract_links, prefix)
+                               for paper_id, prefix in zip(to_fetch, prefixes) if prefix}
+                    for paper_id, future in pending.items():
+                        try:
+                            links = future.result()
+                            with self._lock:
+                                self.cache[paper_id] = {"links": links, "scanned_at": time.time()}
+                        except Exception as e:
+                            logger.warning(f"Failed to scan PDF of {paper_id}: {e}")
+                self.save_cache()
+
+            found = 0
+            for paper_id, papers in candidates.items():
+                code_links = (self.cache.get(paper_id) or {}).get("links") or []
+                if not code_links:
+                    continue
+                found += len(papers)
+                for item in papers:
+                    item['code_links'] = code_links
+                    item['links'] = list(item.get('links') or []) + [
+                        link for link in code_links if link not in item.get('links', [])
+                    ]
+            span.set_attribute("found", found)
+        logger.info(f"PDF scan: {len(to_fetch)} PDFs fetched, code links found for {found} of "
+                    f"{sum(len(papers) for papers in candidates.values())} papers")
+        return found
@@ -0,0 +1,99 @@
+import copy
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from utils.logger import logger
+
+DEFAULT_TARGET_REPO = "https://github.com/dustland/awesome-embodied-ai"
+
+DEFAULT_ARXIV_QUERIES = [
+    'ti:"embodied ai" OR ti:"world model" OR ti:"foundation model" robotics',
+    'ti:"physical intelligence" OR ti:"humanoid" OR ti:"manipulation"',
+    'cat:cs.RO AND (ti:"learning" OR ti:"neural" OR ti:"deep")'
+]
+
+DEFAULT_WATCH_LISTS = {
+    'authors': [
+        "Yann LeCun", "Sergey Levine", "Pieter Abbeel", "Chelsea Finn",
+        "Lerrel Pinto", "Ashish Kumar", "Jitendra Malik"
+    ],
+    'venues': ["ICML", "NeurIPS", "ICLR", "RSS", "CoRL", "ICRA", "IROS"],
+    'labs': [
+        "Meta AI", "Google Research", "DeepMind", "BAIR", "Stanford REAL",
+        "CMU RED", "MIT CSAIL"
+    ],
+}
+
+DEFAULT_SECTIONS = {
+    'foundation_models': '## Foundation Models & World Models',
+    'perception': '## Perception & Understanding',
+    'learning': '## Learning & Control',
+    'simulation': '## Simulation & Environments',
+    'hardware': '## Hardware & Platforms',
+    'datasets': '## Datasets & Benchmarks',
+    'companies': '## Companies & Research Labs'
+}
+
+
+def deep_merge(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of ``base`` with ``overrides`` merged in, recursing into dicts."""
+    merged = copy.deepcopy(base)
+    for key, value in (overrides or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+@dataclass
+class ListProfile:
+    """One awesome list: where it lives, what to search for and how to organize it."""
+
+    name: str
+    target_repo: str = DEFAULT_TARGET_REPO
+    arxiv_queries: List[str] = field(default_factory=lambda: list(DEFAULT_ARXIV_QUERIES))
+    important_authors: List[str] = field(default_factory=lambda: list(DEFAULT_WATCH_LISTS['authors']))
+    important_venues: List[str] = field(default_factory=lambda: list(DEFAULT_WATCH_LISTS['venues']))
+    important_labs: List[str] = field(default_factory=lambda: list(DEFAULT_WATCH_LISTS['labs']))
+    sections: Dict[str, str] = field(default_factory=lambda: dict(DEFAULT_SECTIONS))
+    # The base config with this profile's ``overrides`` applied
+    config: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], base_config: Dict[str, Any]) -> "ListProfile":
+        watch_lists = {**DEFAULT_WATCH_LISTS, **(data.get('watch_lists') or {})}
+        return cls(
+            name=data['name'],
+            target_repo=data.get('target_repo', DEFAULT_TARGET_REPO),
+            arxiv_queries=data.get('arxiv_queries') or list(DEFAULT_ARXIV_QUERIES),
+            important_authors=watch_lists['authors'],
+            important_venues=watch_lists['venues'],
+            important_labs=watch_lists['labs'],
+            sections=data.get('sections') or dict(DEFAULT_SECTIONS),
+            config=deep_merge(base_config, data.get('overrides') or {}),
+        )
+
+    def state_path(self, path: Optional[str]) -> Optional[str]:
+        """Namespace a per-run report path by profile, e.g. ``.state/<name>/report.json``."""
+        if not path:
+            return path
+        return os.path.join(os.path.dirname(path), self.name, os.path.basename(path))
+
+
+def load_profiles(config: Dict[str, Any], names: Optional[List[str]] = None) -> List[ListProfile]:
+    """Build the profiles in the ``profiles`` config section, optionally filtered by name.
+
+    Without a ``profiles`` section a single default profile for the embodied AI list
+    is returned, matching the tool's original behaviour.
+    """
+    base = {key: value for key, value in config.items() if key != 'profiles'}
+    entries = config.get('profiles') or [{'name': 'default'}]
+    profiles = [ListProfile.from_dict(entry, base) for entry in entries]
+    if names:
+        unknown = set(names) - {profile.name for profile in profiles}
+        if unknown:
+            logger.warning(f"Unknown list profiles ignored: {', '.join(sorted(unknown))}")
+        profiles = [profile for profile in profiles if profile.name in names]
+    return profiles
@@ -0,0 +1,84 @@
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from utils.relevance import readme_entries, tokenize
+
+# Top-level sections start at "## " headings; "###" subsections stay inside them
+SECTION_SPLIT_PATTERN = re.compile(r"^(?=## )", re.MULTILINE)
+
+
+@dataclass
+class Section:
+    heading: str  # the "## ..." line, empty for the text before the first section
+    text: str
+
+    @property
+    def has_table(self) -> bool:
+        return "\n|" in self.text
+
+    @property
+    def has_list(self) -> bool:
+        return bool(re.search(r"^\s*[-*] \[", self.text, re.MULTILINE))
+
+
+def split_sections(readme: str) -> List[Section]:
+    """Split a README at its ``##`` headings; joining the texts gives back the README exactly."""
+    sections = []
+    for text in SECTION_SPLIT_PATTERN.split(readme):
+        if not text:
+            continue
+        first_line = text.split("\n", 1)[0]
+        sections.append(Section(first_line.strip() if first_line.startswith("## ") else "", text))
+    return sections
+
+
+def entry_kind(line: str) -> str:
+    return "table" if line.lstrip().startswith("|") else "list"
+
+
+def route_entries(sections: List[Section], entries: List[str]) -> Dict[int, List[str]]:
+    """Assign each new entry to the index of the section it fits best.
+
+    Sections and entries are compared as TF-IDF vectors over the same tokens the
+    relevance ranker uses (heading plus existing entries for a section). Table rows
+    only go to sections with a table and list items to sections with a list, when
+    such sections exist.
+    """
+    candidates = [i for i, section in enumerate(sections) if section.heading]
+    if not candidates:
+        return {0: list(entries)} if entries and sections else {}
+
+    docs = {i: Counter(tokenize(" ".join([sections[i].heading] + readme_entries(sections[i].text))))
+            for i in candidates}
+    df: Counter = Counter()
+    for doc in docs.values():
+        df.update(doc.keys())
+    idf = {term: math.log(1 + len(docs) / count) for term, count in df.items()}
+
+    def vector(doc: Counter) -> Dict[str, float]:
+        weights = {term: tf * idf.get(term, 0.0) for term, tf in doc.items()}
+        length = math.sqrt(sum(w * w for w in weights.values()))
+        return {term: w / length for term, w in weights.items()} if length else {}
+
+    # Inverted index term -> [(section, weight)], so scoring an entry only touches its own terms
+    postings: Dict[str, List[Tuple[int, float]]] = {}
+    for i, doc in docs.items():
+        for term, weight in vector(doc).items():
+            postings.setdefault(term, []).append((i, weight))
+    by_kind = {
+        "table": [i for i in candidates if sections[i].has_table] or candidates,
+        "list": [i for i in candidates if sections[i].has_list] or candidates,
+    }
+    routed: Dict[int, List[str]] = {}
+    for entry in entries:
+        scores: Dict[int, float] = {}
+        for term, weight in vector(Counter(tokenize(" ".join(readme_entries(entry)) or entry))).items():
+            for i, section_weight in postings.get(term, ()):
+                scores[i] = scores.get(i, 0.0) + weight * section_weight
+        # Ties (including no overlap at all) go to the first eligible section
+        best = max(by_kind[entry_kind(entry)], key=lambda i: (scores.get(i, 0.0), -i))
+        routed.setdefault(best, []).append(entry)
+    return routed
@@ -0,0 +1,37 @@
+import argparse
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from awesome_updater.core.code_index import PaperCodeIndex
+from utils.config import Config
+from utils.logger import logger
+from utils.tracing import tracer
+
+# Load environment variables from .env file
+load_dotenv()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import a paper/code link dump into the local index")
+    parser.add_argument("source", nargs="?",
+                        help="Dump file (.json or .json.gz) or URL (default: code_index.dump_url)")
+    args = parser.parse_args(argv)
+
+    settings = Config.load_config().get('code_index') or {}
+    source = args.source or settings.get('dump_url')
+    if not source:
+        parser.error("no dump given and code_index.dump_url is not set")
+
+    index = PaperCodeIndex(settings.get('path', '.state/paper_code.sqlite'))
+    with tracer.run("import_code_index"):
+        if source.startswith(("http://", "https://")):
+            stats = index.refresh(source)
+        else:
+            stats = index.import_dump(source)
+    logger.info(f"Paper/code index has {len(index)} links "
+                f"({stats.added} added, {stats.updated} updated, {stats.removed} removed)")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,116 @@
+import argparse
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from awesome_updater.core.git_manager import GitManager
+from awesome_updater.core.link_checker import LinkChecker, apply_fixes, build_report, extract_urls
+from awesome_updater.core.profiles import load_profiles
+from utils.config import Config
+from utils.logger import log_sampler, logger
+from utils.tracing import tracer
+
+# Load environment variables from .env file
+load_dotenv()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check every link in the awesome list READMEs")
+    parser.add_argument("--readme", help="Audit a local README instead of cloning the profiles' repos")
+    parser.add_argument("--fix", action="store_true",
+                        help="Rewrite permanent redirects and remove entries that stay dead")
+    parser.add_argument("--push", action="store_true",
+                        help="Commit and push the fixed README (implies --fix, cloned repos only)")
+    args = parser.parse_args(argv)
+    with tracer.run("link_audit"):
+        return audit_links(args.readme, fix=args.fix or args.push, push=args.push)
+
+
+def audit_links(readme_path: Optional[str] = None, fix: bool = False, push: bool = False,
+                names: Optional[List[str]] = None) -> int:
+    """Audit a local README, or the README of every list profile's target repo.
+
+    Profiles can be limited with ``names`` or the comma-separated ``AWESOME_PROFILES``
+    environment variable. One link checker (and its cache) is shared by all profiles.
+    """
+    config = Config.load_config()
+    checker = LinkChecker.from_config(config)
+    if readme_path is not None:
+        audit_readme(readme_path, checker, config, (config.get('link_audit') or {}).get('report_path'), fix)
+        return 0
+
+    if names is None and os.getenv("AWESOME_PROFILES"):
+        names = [name.strip() for name in os.getenv("AWESOME_PROFILES").split(",") if name.strip()]
+    profiles = load_profiles(config, names)
+    if not profiles:
+        logger.error("No list profiles to audit")
+        return 1
+    failed = []
+    for profile in profiles:
+        settings = profile.config.get('link_audit') or {}
+        with logger.contextualize(profile=profile.name):
+            try:
+                with tracer.span("stage.clone"):
+                    git_manager = GitManager(target_repo_url=profile.target_repo)
+                changed = audit_readme(git_manager.get_readme_path(), checker, profile.config,
+                                       profile.state_path(settings.get('report_path')), fix)
+                if push and changed and git_manager.has_changes():
+                    with tracer.span("stage.push"):
+                        git_manager.commit_and_push("Fix dead and redirected links")
+            except Exception as e:
+                logger.error(f"Link audit of {profile.target_repo} failed: {e}")
+                failed.append(profile.name)
+    if failed:
+        logger.error(f"Link audit failed for: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+def audit_readme(readme_path: str, checker: LinkChecker, config: Dict[str, Any],
+                 report_path: Optional[str] = None, fix: bool = False) -> bool:
+    """Check every link in one README and apply fixes when ``fix``; returns whether it changed."""
+    settings = config.get('link_audit') or {}
+    with open(readme_path, encoding="utf-8") as f:
+        readme = f.read()
+
+    urls = extract_urls(readme)
+    logger.info(f"Found {len(urls)} distinct links in {readme_path}")
+
+    with tracer.span("stage.check_links", links=len(urls)) as span:
+        results = checker.check_all(urls)
+        report = build_report(results)
+        span.set_attributes(**{f"links.{status}": count for status, count in report["counts"].items()})
+
+    logger.info(f"Link audit: {report['counts']}")
+    for entry in report["dead"]:
+        if log_sampler.allow("dead_link"):
+            logger.warning("Dead link ({}, {} checks): {}", entry['http_status'], entry['failures'], entry['url'])
+    for entry in report["redirected"]:
+        if log_sampler.allow("moved_link"):
+            logger.info("Moved: {} -> {}", entry['url'], entry['final_url'])
+    log_sampler.flush()
+
+    if report_path:
+        try:
+            os.makedirs(os.path.dirname(report_path) or ".", exist_ok=True)
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            logger.info(f"Link audit report written to {report_path}")
+        except OSError as e:
+            logger.error(f"Failed to write link audit report: {e}")
+
+    if not fix:
+        return False
+
+    fixed = apply_fixes(readme, results, remove_after_failures=settings.get('remove_after_failures', 2))
+    if fixed == readme:
+        logger.info("No link fixes to apply")
+        return False
+    with open(readme_path, "w", encoding="utf-8") as f:
+        f.write(fixed)
+    logger.info(f"Applied link fixes to {readme_path}")
+    return True
+
+
+if __name__ == "__main__":
+    exit(main())
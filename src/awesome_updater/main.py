@@ -1,144 +1,299 @@
+import contextvars
+import heapq
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
 from awesome_updater.core.github_client import GitHubClient
 from awesome_updater.core.content_merger import ContentMerger
 from utils.gpt_service import GPTService
 from awesome_updater.core.git_manager import GitManager
 from awesome_updater.core.content_fetcher import ContentFetcher
+from awesome_updater.core.candidate_selector import CandidateSelector, SelectionResult
+from awesome_updater.core.checkpoints import ProfileCheckpoints, RunCheckpoints, fingerprint
+from awesome_updater.core.fetch_cache import FetchCache
+from awesome_updater.core.fetch_jobs import FetchCoordinator
+from awesome_updater.core.lab_scraper import LabScraper
+from awesome_updater.core.metrics_store import MetricsStore
+from awesome_updater.core.parser_pool import ParserPool
+from awesome_updater.core.profiles import ListProfile, load_profiles
 from utils.config import Config
-from utils.logger import logger
+from utils.logger import logger, log_sampler
+from utils.relevance import RelevanceRanker
+from utils.tracing import tracer
 
 # Load environment variables from .env file
 load_dotenv()
 
 def main():
-    logger.info("=== Starting Awesome Embodied AI content update process ===")
+    with tracer.run("awesome_updater"):
+        ok = run_profiles()
+    # A non-zero exit lets the platform restart the run, which resumes from its checkpoints
+    if not ok:
+        sys.exit(1)
+
+def run_profiles(names: Optional[List[str]] = None) -> bool:
+    """Update every configured awesome list in parallel, sharing fetch work between them.
+    
+    Profiles can be limited with ``names`` or the comma-separated ``AWESOME_PROFILES``
+    environment variable. Returns True when every profile completed.
+    """
+    config = Config.load_config()
+    if names is None and os.getenv("AWESOME_PROFILES"):
+        names = [name.strip() for name in os.getenv("AWESOME_PROFILES").split(",") if name.strip()]
+    profiles = load_profiles(config, names)
+    if not profiles:
+        logger.error("No list profiles to update")
+        return False
+    
+    github_token = os.getenv("GITHUB_TOKEN")
+    if not github_token:
+        logger.error("GITHUB_TOKEN environment variable not set")
+        return False
+    
+    # One cache, GitHub client and metrics store for all profiles, so a repo or paper
+    # relevant to several lists is fetched, enriched and scored once
+    fetch_cache = FetchCache(consumers=len(profiles))
+    github_client = GitHubClient.from_config(github_token, config)
+    metrics_store = MetricsStore.from_config(config)
+    # Built up front, so profiles resuming past their fetch can still mark lab posts seen
+    parsers = fetch_cache.get_or_compute(('parser_pool',), lambda: ParserPool.from_config(config))
+    fetch_cache.get_or_compute(('lab_scraper',), lambda: LabScraper.from_config(config, parsers))
+    # A restarted run resumes the unfinished run's checkpoints and queued jobs
+    checkpoints = RunCheckpoints.from_config(config)
+    # With the job queue enabled, fetch work is shared through it (and with any workers)
+    jobs = FetchCoordinator.from_config(config, run_id=checkpoints.run_id if checkpoints else None)
+    if jobs:
+        logger.info(f"Using job queue {jobs.queue.path} for run {jobs.run_id}")
+        jobs.queue.purge((config.get('queue') or {}).get('retention_days', 7))
+    
+    def run(profile: ListProfile) -> bool:
+        with logger.contextualize(profile=profile.name):
+            try:
+                return update_content(profile, fetch_cache, github_client, metrics_store, jobs,
+                                      checkpoints.for_profile(profile.name) if checkpoints else None)
+            finally:
+                # Source results this profile did not read are no longer held for it
+                fetch_cache.finish(profile.name)
+    
+    max_workers = (config.get('runner') or {}).get('max_workers', 2)
+    logger.info(f"Updating {len(profiles)} list profile(s) with {min(max_workers, len(profiles))} workers")
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(profiles)))) as executor:
+        # Copy the context so each profile's spans nest under the run's root span
+        futures = {
+            profile.name: executor.submit(contextvars.copy_context().run, run, profile)
+            for profile in profiles
+        }
+        results = {name: future.result() for name, future in futures.items()}
+    
+    fetch_cache.log_stats()
+    failed = [name for name, ok in results.items() if not ok]
+    if failed:
+        logger.error(f"List profiles failed: {', '.join(failed)}")
+    if checkpoints:
+        checkpoints.finish(not failed)
+    parsers.close()
+    # Lab posts only count as seen once every list that could use them was updated
+    lab_scraper = fetch_cache.get(('lab_scraper',))
+    if lab_scraper and not failed:
+        lab_scraper.commit()
+    return not failed
+
+def mark_lab_posts_seen(fetch_cache: Optional[FetchCache], saved: Optional[dict]) -> None:
+    """Have the run's lab scraper record the lab posts of a checkpointed selection as seen."""
+    lab_scraper = fetch_cache.get(('lab_scraper',)) if fetch_cache else None
+    if lab_scraper and saved and saved.get("lab_posts"):
+        lab_scraper.mark_seen(saved["lab_posts"])
+
+def fetch_and_select(content_fetcher: ContentFetcher, profile: ListProfile) -> SelectionResult:
+    """Stream candidates through scoring into the selector and write the run reports."""
+    config = profile.config
+    found = 0
+    top: List[Tuple[float, int, dict]] = []
+
+    def observed(items: Iterable[dict]) -> Iterator[dict]:
+        # Count candidates and keep a bounded heap of the best five for the log
+        nonlocal found
+        for item in items:
+            found += 1
+            entry = (item.get('impact_score', 0), found, item)
+            if len(top) < 5:
+                heapq.heappush(top, entry)
+            elif entry > top[0]:
+                heapq.heapreplace(top, entry)
+            yield item
+
+    with tracer.span("stage.fetch_select") as span:
+        selection = CandidateSelector.from_config(config).select(
+            observed(content_fetcher.iter_content())
+        )
+        formatted_content = selection.entries
+        span.set_attributes(items=found, selected=len(formatted_content), tokens=selection.tokens)
+    logger.info(f"Found {found} relevant items")
+
+    # Record how much GitHub quota the fetch and enrichment used
+    report_path = profile.state_path(config.get('github', {}).get('rate_limit', {}).get('report_path'))
+    if report_path:
+        content_fetcher.github.write_quota_report(report_path)
+
+    # Log top 5 items, one structured record each; details are formatted only at DEBUG
+    logger.info("Top 5 items by impact score:")
+    for i, (_, _, item) in enumerate(sorted(top, reverse=True), 1):
+        logger.bind(
+            rank=i, type=item.get('type', 'unknown'),
+            stars=(item.get('metrics') or {}).get('stars', 0),
+            citations=item.get('citations'), relevance=item.get('relevance_score')
+        ).info("{}. {} (Score: {:.2f})", i, item.get('title', 'No title'), item.get('impact_score', 0))
+        logger.opt(lazy=True).debug("   Description: {}...",
+                                    lambda item=item: (item.get('description') or '')[:100])
+
+    report_path = profile.state_path(config.get('selection', {}).get('report_path'))
+    if report_path:
+        CandidateSelector.write_report(selection, report_path)
+    return selection
+
+def update_content(profile: Optional[ListProfile] = None, fetch_cache: Optional[FetchCache] = None,
+                   github_client: Optional[GitHubClient] = None,
+                   metrics_store: Optional[MetricsStore] = None,
+                   jobs: Optional[FetchCoordinator] = None,
+                   checkpoints: Optional[ProfileCheckpoints] = None) -> bool:
+    """Update one awesome list: fetch and select, merge, then commit and push.
     
+    With ``checkpoints``, each stage's output is saved and a resumed run skips the
+    stages whose inputs (config, README, selected entries) are unchanged.
+    """
     # Load configuration
     logger.info("Loading configuration...")
-    config = Config.load_config()
-    logger.info("Configuration loaded successfully")
+    if profile is None:
+        profile = load_profiles(Config.load_config())[0]
+    config = profile.config
+    logger.info(f"=== Starting content update process for {profile.name} ({profile.target_repo}) ===")
+    if checkpoints and checkpoints.load("push") is not None:
+        logger.info("This run already pushed its update; nothing left to do")
+        mark_lab_posts_seen(fetch_cache, checkpoints.load("select"))
+        return True
     
     # Initialize components
     logger.info("Initializing components...")
     github_token = os.getenv("GITHUB_TOKEN")
     if not github_token:
         logger.error("GITHUB_TOKEN environment variable not set")
-        return
-        
-    tavily_api_key = os.getenv("TAVILY_API_KEY")
-    if not tavily_api_key:
-        logger.error("TAVILY_API_KEY environment variable not set")
-        return
+        return False
         
     openai_api_key = os.getenv("OPENAI_API_KEY")
     if not openai_api_key:
         logger.error("OPENAI_API_KEY environment variable not set")
-        return
+        return False
     
     try:
         logger.info("Initializing GPT service...")
-        gpt_service = GPTService(openai_api_key)
+        gpt_service = GPTService.from_config(openai_api_key, config)
         
         logger.info("Initializing Git manager...")
-        git_manager = GitManager(target_repo_url="https://github.com/dustland/awesome-embodied-ai")
+        with tracer.span("stage.clone"):
+            git_manager = GitManager(target_repo_url=profile.target_repo)
         
         logger.info("Initializing content merger...")
-        content_merger = ContentMerger(git_manager.get_readme_path(), gpt_service)
+        merge_settings = config.get('merge') or {}
+        content_merger = ContentMerger(git_manager.get_readme_path(), gpt_service, sections=profile.sections,
+                                       max_removals=merge_settings.get('max_removals', 0),
+                                       mode=merge_settings.get('mode', 'auto'),
+                                       whole_max_tokens=merge_settings.get('whole_max_tokens', 3000),
+                                       max_workers=merge_settings.get('max_workers', 4),
+                                       max_output_tokens=merge_settings.get('max_output_tokens', 16000))
+        
+        logger.info("Building relevance ranker from the current README...")
+        with open(git_manager.get_readme_path(), encoding="utf-8") as f:
+            readme = f.read()
+        relevance_ranker = RelevanceRanker.from_config(config, readme)
         
         logger.info("Initializing content fetcher...")
-        content_fetcher = ContentFetcher(github_token, tavily_api_key)
+        content_fetcher = ContentFetcher(github_token, config=config,
+                                         github_client=github_client,
+                                         relevance_ranker=relevance_ranker,
+                                         metrics_store=metrics_store,
+                                         profile=profile, fetch_cache=fetch_cache, jobs=jobs)
         
         logger.info("All components initialized successfully")
     except Exception as e:
         logger.error(f"Error initializing components: {str(e)}")
-        return
+        return False
     
-    # Fetch content
+    # Fetch, score and select content as one stream; only the per-type top-K survive
     logger.info("Fetching content using aggregated search...")
     try:
-        all_content = content_fetcher.fetch_all_content()
-        logger.info(f"Found {len(all_content)} relevant items")
-        
-        # Sort content by impact score
-        all_content.sort(key=lambda x: x.get('impact_score', 0), reverse=True)
-        logger.info("Sorted content by impact score")
-        
-        # Log top 5 items
-        logger.info("\nTop 5 items by impact score:")
-        for i, item in enumerate(all_content[:5], 1):
-            logger.info(f"{i}. {item.get('title', 'No title')} (Score: {item.get('impact_score', 0):.2f})")
-            logger.info(f"   Type: {item.get('type', 'unknown')}")
-            logger.info(f"   Stars: {item.get('metrics', {}).get('stars', 0)}")
-            if 'citations' in item:
-                logger.info(f"   Citations: {item['citations']}")
-            if 'relevance_score' in item:
-                logger.info(f"   Relevance: {item['relevance_score']:.2f}")
-            logger.info(f"   Description: {item.get('description', '')[:100]}...")
-            
-    except Exception as e:
-        logger.error(f"Error fetching content: {str(e)}")
-        return
-    
-    # Prepare content for merging
-    try:
-        logger.info("\nPreparing content for merging...")
-        formatted_content = []
-        for item in all_content:
-            # Format content in the expected table structure
-            if item.get('type') == 'research':
-                paper_link = next((link for link in item.get('links', []) if 'arxiv.org' in link or 'doi.org' in link), '')
-                code_link = next((link for link in item.get('links', []) if 'github.com' in link), '')
-                formatted_content.append(
-                    f"| {item.get('title')} | {item.get('description', '')} | "
-                    f"[Paper]({paper_link}) | [Code]({code_link}) |"
-                )
-            else:
-                # Format as a list item for tools, products, etc.
-                main_link = item.get('links', [''])[0]
-                stars = item.get('metrics', {}).get('stars', 0)
-                formatted_content.append(
-                    f"- [{item.get('title')}]({main_link}) - {item.get('description', '')} "
-                    f"[⭐{stars}]"
-                )
-        
+        select_inputs = fingerprint(config, readme)
+        saved = checkpoints.load("select", select_inputs) if checkpoints else None
+        if saved is not None:
+            mark_lab_posts_seen(fetch_cache, saved)
+            saved.pop("lab_posts", None)
+            selection = SelectionResult(**saved)
+        else:
+            selection = fetch_and_select(content_fetcher, profile)
+            if checkpoints:
+                checkpoints.save("select", {"items": selection.items, "entries": selection.entries,
+                                            "tokens": selection.tokens, "budget": selection.budget,
+                                            "lab_posts": content_fetcher.lab_posts},
+                                 select_inputs)
+        formatted_content = selection.entries
         logger.info("Content prepared for merging")
         
     except Exception as e:
-        logger.error(f"Error preparing content for merging: {str(e)}")
-        return
+        logger.error(f"Error fetching and selecting content: {str(e)}")
+        return False
     
     # Merge content
     try:
         logger.info("\nMerging content with existing README...")
         has_updates = False
         if formatted_content:
-            if content_merger.merge_content("\n".join(formatted_content)):
+            merge_inputs = fingerprint(readme, formatted_content)
+            saved = checkpoints.load("merge", merge_inputs) if checkpoints else None
+            if saved is not None:
+                merged = saved["merged"]
+                if merged:
+                    with open(git_manager.get_readme_path(), "w", encoding="utf-8") as f:
+                        f.write(saved["readme"])
+            else:
+                with tracer.span("stage.merge") as span:
+                    merged = content_merger.merge_content("\n".join(formatted_content))
+                    span.set_attribute("merged", merged)
+                if checkpoints:
+                    with open(git_manager.get_readme_path(), encoding="utf-8") as f:
+                        checkpoints.save("merge", {"merged": merged, "readme": f.read() if merged else None},
+                                         merge_inputs)
+            if merged:
                 logger.info("Successfully merged formatted content")
                 has_updates = True
             else:
                 logger.info("No new content to merge")
+            logger.info(f"Model stats: {gpt_service.model_stats()}")
         
         # Commit and push changes
         if has_updates and git_manager.has_changes():
             logger.info("\nChanges detected, committing and pushing...")
-            git_manager.commit_and_push("Update awesome list with new high-impact resources")
+            with tracer.span("stage.push"):
+                git_manager.commit_and_push("Update awesome list with new high-impact resources")
             
             # After content is merged but before committing
-            logger.info("New content to be added:")
-            for item in all_content:
-                logger.info(f"- {item.get('title')}")
-                logger.info(f"  Authors: {item.get('authors', 'Unknown')}")
-                logger.info(f"  Link: {item.get('links', [''])[0]}")
-                logger.info(f"  Summary: {item.get('description', '')[:100]}...")
+            logger.info("New content to be added: {} entries", len(selection.items))
+            for item in selection.items:
+                if log_sampler.allow("new_content"):
+                    logger.bind(authors=item.get('authors', 'Unknown'),
+                                link=(item.get('links') or [''])[0]).info("- {}", item.get('title'))
+            log_sampler.flush()
         else:
             logger.info("\nNo changes detected, skipping commit")
+        if checkpoints:
+            checkpoints.save("push", {"pushed": has_updates})
             
     except Exception as e:
         logger.error(f"Error updating content: {str(e)}")
-        return
+        return False
         
     logger.info("\n=== Content update process completed successfully ===")
+    return True
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,46 @@
+import argparse
+import os
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from awesome_updater.core.change_probe import ChangeScheduler
+from awesome_updater.core.github_client import GitHubClient
+from awesome_updater.core.metrics_store import MetricsStore
+from awesome_updater.main import run_profiles
+from utils.config import Config
+from utils.tracing import tracer
+
+# Load environment variables from .env file
+load_dotenv()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Probe the sources and run the full update only when they have new data."""
+    parser = argparse.ArgumentParser(description="Run the awesome list update when sources changed")
+    parser.add_argument("--dry-run", action="store_true", help="Probe and report the decision only")
+    parser.add_argument("--force", action="store_true", help="Run the update whatever the probes say")
+    args = parser.parse_args(argv)
+
+    config = Config.load_config()
+    github_token = os.getenv("GITHUB_TOKEN")
+    github = GitHubClient.from_config(github_token, config) if github_token else None
+    scheduler = ChangeScheduler.from_config(config, github=github,
+                                            metrics_store=MetricsStore.from_config(config))
+
+    with tracer.run("awesome_schedule"):
+        decision = scheduler.probe()
+        if args.dry_run:
+            return 0
+        if not (decision.run or args.force):
+            scheduler.commit(decision)
+            return 0
+        ok = run_profiles()
+    # Probe results are only committed after a successful run, so a failure retries
+    if not ok:
+        return 1
+    scheduler.commit(decision, ran=True)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
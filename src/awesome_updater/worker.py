@@ -0,0 +1,37 @@
+import os
+from dotenv import load_dotenv
+from awesome_updater.core.content_fetcher import ContentFetcher
+from awesome_updater.core.fetch_jobs import run_worker
+from awesome_updater.core.metrics_store import MetricsStore
+from utils.config import Config
+from utils.job_queue import JobQueue
+from utils.logger import logger
+from utils.tracing import tracer
+
+# Load environment variables from .env file
+load_dotenv()
+
+def main():
+    """Drain fetch and enrichment jobs queued by the updater until the queue is idle."""
+    config = Config.load_config()
+    queue = JobQueue.from_config(config)
+    if queue is None:
+        logger.error("Job queue is disabled; set queue.enabled in config/config.yaml")
+        return 1
+    
+    github_token = os.getenv("GITHUB_TOKEN")
+    if not github_token:
+        logger.error("GITHUB_TOKEN environment variable not set")
+        return 1
+    
+    # Snapshots are recorded by the coordinator, which owns the metrics store files
+    fetcher = ContentFetcher(github_token, config=config, metrics_store=MetricsStore())
+    settings = config.get('queue') or {}
+    with tracer.run("awesome_worker"):
+        run_worker(queue, fetcher.job_handlers(),
+                   idle_timeout=settings.get('worker_idle_seconds', 60),
+                   poll_interval=settings.get('poll_interval_seconds', 1.0))
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -1,11 +1,19 @@
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from utils.config import Config
 from utils.logger import logger
+from utils.relevance import RelevanceRanker
+from utils.tracing import tracer
 from news_poster.news_poster import NewsPoster
 
 def main():
     """Main function to run the news posting process."""
+    with tracer.run("news_poster"):
+        return post_news()
+
+def post_news():
+    """Load credentials, then post news and engage with tweets."""
     try:
         # Try multiple environment sources
         # 1. Check system environment variables first
@@ -61,13 +69,16 @@ def main():
             logger.debug(f"{key} length: {len(value) if value else 0}")
         
         # Initialize news poster
+        config = Config.load_config()
         news_poster = NewsPoster(
             tavily_api_key=required_vars['TAVILY_API_KEY'],
             twitter_api_key=required_vars['TWITTER_API_KEY'],
             twitter_api_secret=required_vars['TWITTER_API_SECRET'],
             twitter_access_token=required_vars['TWITTER_ACCESS_TOKEN'],
             twitter_access_token_secret=required_vars['TWITTER_ACCESS_TOKEN_SECRET'],
-            openai_api_key=required_vars['OPENAI_API_KEY']
+            openai_api_key=required_vars['OPENAI_API_KEY'],
+            relevance_ranker=RelevanceRanker.from_config(config),
+            config=config
         )
         
         logger.info("Starting news posting process...")
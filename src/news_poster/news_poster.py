@@ -1,15 +1,24 @@
-from typing import List, Dict
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+import pytz
 import tweepy
 from tavily import TavilyClient
 from utils.logger import logger
+from utils.tracing import tracer
 from utils.gpt_service import GPTService
+from utils.relevance import RelevanceRanker
 
 class NewsPoster:
     def __init__(self, tavily_api_key: str, twitter_api_key: str, twitter_api_secret: str, 
-                 twitter_access_token: str, twitter_access_token_secret: str, openai_api_key: str):
+                 twitter_access_token: str, twitter_access_token_secret: str, openai_api_key: str,
+                 relevance_ranker: Optional[RelevanceRanker] = None, config: Optional[Dict] = None):
         self.tavily_client = TavilyClient(tavily_api_key)
+        self.relevance_ranker = relevance_ranker
+        # Freshness window (in days) pushed down into the Tavily searches; 0 disables it
+        recency = ((config or {}).get('fetch') or {}).get('recency') or {}
+        self.tavily_days = recency.get('tavily_days', 30)
         logger.debug(f"Initializing GPT service with key starting with: {openai_api_key[:8] if openai_api_key else 'None'}")
-        self.gpt_service = GPTService(openai_api_key)
+        self.gpt_service = GPTService.from_config(openai_api_key, config)
         logger.debug(f"Initializing Twitter client with credentials:")
         logger.debug(f"API Key length: {len(twitter_api_key)}")
         logger.debug(f"API Secret length: {len(twitter_api_secret)}")
@@ -54,36 +63,75 @@ class NewsPoster:
             logger.error(f"Failed to initialize Twitter client: {str(e)}")
             raise
         
+    def _rank_results(self, results: List[Dict]) -> List[Dict]:
+        """Attach a relevance score to Tavily results, dropping off-topic ones.
+        
+        With a ranker, Tavily's score is boosted by the topic relevance and results
+        below the ranker's threshold are dropped; without one, keyword boosts apply.
+        """
+        if self.relevance_ranker:
+            kept, dropped = self.relevance_ranker.filter(
+                results, text=lambda item: f"{item.get('title') or ''} {item.get('content') or ''}"
+            )
+            if dropped:
+                logger.debug(f"Dropped {len(dropped)} off-topic results")
+            for item in kept:
+                item['relevance'] = item.get('score', 0) * (1 + item['topic_relevance'])
+            return kept
+        
+        for item in results:
+            relevance = item.get('score', 0)
+            text = (item.get('content', '') + item.get('title', '')).lower()
+            if 'embodied' in text:
+                relevance *= 1.5
+            if 'robot' in text:
+                relevance *= 1.2
+            item['relevance'] = relevance
+        return results
+
+    def _is_recent(self, item: Dict) -> bool:
+        """Whether a dated Tavily result falls inside the recency window; undated ones pass."""
+        if not self.tavily_days or not item.get('published_date'):
+            return True
+        try:
+            published = datetime.fromisoformat(item['published_date'].replace('Z', '+00:00'))
+        except ValueError:
+            try:
+                # Tavily news results carry RFC 822 dates
+                published = datetime.strptime(item['published_date'], '%a, %d %b %Y %H:%M:%S %Z')
+            except ValueError:
+                return True
+        if published.tzinfo is None:
+            published = pytz.UTC.localize(published)
+        return published >= datetime.now(pytz.UTC) - timedelta(days=self.tavily_days)
+
     def fetch_top_news(self) -> List[Dict]:
         """Fetch top 3 news about Embodied AI using Tavily."""
         try:
-            response = self.tavily_client.search(
-                query="embodied AI robotics latest news and developments",
-                search_depth="advanced",  # Use news search
-                topic="news",
-                include_domains=[
-                    'techcrunch.com', 'wired.com', 'ieee.org', 'nature.com', 
-                    'science.org', 'robotics.org', 'technologyreview.com',
-                    'twitter.com', 'facebook.com', 'linkedin.com'  # Add social media platforms
-                ],
-                max_results=10  # Get more results to filter the best ones
-            )
+            with tracer.span("tavily.search", source="tavily", topic="news"):
+                response = self.tavily_client.search(
+                    query="embodied AI robotics latest news and developments",
+                    search_depth="advanced",  # Use news search
+                    topic="news",
+                    include_domains=[
+                        'techcrunch.com', 'wired.com', 'ieee.org', 'nature.com', 
+                        'science.org', 'robotics.org', 'technologyreview.com',
+                        'twitter.com', 'facebook.com', 'linkedin.com'  # Add social media platforms
+                    ],
+                    max_results=10,  # Get more results to filter the best ones
+                    **({'days': self.tavily_days} if self.tavily_days else {})
+                )
             
             # Filter and sort results
             news_items = []
-            for item in response.get('results', []):
-                # Calculate a simple relevance score
-                relevance = item.get('score', 0)
-                if 'embodied' in (item.get('content', '') + item.get('title', '')).lower():
-                    relevance *= 1.5
-                if 'robot' in (item.get('content', '') + item.get('title', '')).lower():
-                    relevance *= 1.2
-                    
+            for item in self._rank_results(response.get('results', [])):
+                if not self._is_recent(item):
+                    continue
                 news_items.append({
                     'title': item.get('title'),
                     'url': item.get('url'),
                     'published_date': item.get('published_date'),
-                    'relevance': relevance
+                    'relevance': item['relevance']
                 })
             
             # Sort by relevance and get top 3
@@ -124,7 +172,8 @@ The comment should demonstrate expertise and encourage engagement with the origi
                 prompt=prompt,
                 system_prompt="You are an expert in Embodied AI and robotics, providing insightful technical commentary.",
                 max_tokens=100,
-                temperature=0.7
+                temperature=0.7,
+                task="comment"
             )
             return comment if comment else "Fascinating insights on embodied AI! Looking forward to seeing more developments in this space."
         except Exception as e:
@@ -154,7 +203,8 @@ The comment should demonstrate expertise and encourage engagement with the origi
                 
                 try:
                     # Try v2 API first
-                    response = self.twitter_client.create_tweet(text=tweet)
+                    with tracer.span("twitter.create_tweet", source="twitter"):
+                        response = self.twitter_client.create_tweet(text=tweet)
                     tweet_id = response.data['id']
                     logger.info(f"Posted {'comment' if is_tweet else 'tweet'} about: {item['title']}")
                 except Exception as e:
@@ -191,23 +241,19 @@ The comment should demonstrate expertise and encourage engagement with the origi
     def fetch_top_tweets(self) -> List[Dict]:
         """Fetch top tweets about Embodied AI using Tavily."""
         try:
-            response = self.tavily_client.search(
-                query="embodied AI robotics",
-                search_depth="advanced",
-                include_domains=['twitter.com', 'x.com'],
-                max_results=5  # Get more results to filter the best ones
-            )
+            with tracer.span("tavily.search", source="tavily", topic="tweets"):
+                response = self.tavily_client.search(
+                    query="embodied AI robotics",
+                    search_depth="advanced",
+                    include_domains=['twitter.com', 'x.com'],
+                    max_results=5  # Get more results to filter the best ones
+                )
             
-            # Filter and sort results
+            # Filter and sort results; Tavily ignores ``days`` outside news searches
             tweet_items = []
-            for item in response.get('results', []):
-                # Calculate a relevance score
-                relevance = item.get('score', 0)
-                if 'embodied' in (item.get('content', '') + item.get('title', '')).lower():
-                    relevance *= 1.5
-                if 'robot' in (item.get('content', '') + item.get('title', '')).lower():
-                    relevance *= 1.2
-                
+            for item in self._rank_results(response.get('results', [])):
+                if not self._is_recent(item):
+                    continue
                 # Extract tweet ID from URL
                 url = item.get('url', '')
                 tweet_id = url.split('/')[-1].split('?')[0] if url else None
@@ -218,7 +264,7 @@ The comment should demonstrate expertise and encourage engagement with the origi
                         'url': url,
                         'tweet_id': tweet_id,
                         'published_date': item.get('published_date'),
-                        'relevance': relevance
+                        'relevance': item['relevance']
                     })
             
             # Sort by relevance and get top 3
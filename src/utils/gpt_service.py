@@ -1,16 +1,22 @@
+import time
 from typing import Optional, Dict, Any, List
 from openai import OpenAI
 from utils.logger import logger
+from utils.tracing import tracer
+from utils.merge_validator import validate_merge
+from utils.model_router import ModelRouter
 
 class GPTService:
     """A general-purpose GPT service for text generation and completion tasks."""
     
-    def __init__(self, api_key: str, model: str = "gpt-4o"):
+    def __init__(self, api_key: str, model: str = "gpt-4o", router: Optional[ModelRouter] = None):
         """Initialize the GPT service.
         
         Args:
             api_key: OpenAI API key
             model: GPT model to use (default: gpt-4o)
+            router: Optional task-to-model routing with fallbacks; without it every
+                call uses ``model``
         """
         logger.debug(f"Initializing GPT service with key starting with: {api_key[:8] if api_key else 'None'}")
         if not api_key:
@@ -21,8 +27,48 @@ class GPTService:
             
         self.api_key = api_key
         self.model = model
+        self.router = router
         self.client = OpenAI(api_key=api_key)
         logger.debug(f"GPT service initialized with model: {model}")
+
+    @classmethod
+    def from_config(cls, api_key: str, config: Optional[Dict]) -> "GPTService":
+        """Service using ``openai.model`` and the ``openai.routing`` tiers from config."""
+        router = ModelRouter.from_config(config)
+        return cls(api_key, model=router.tiers['default'][0], router=router)
+
+    def _chat(self, messages: List[Dict[str, str]], task: str, **kwargs: Any) -> Any:
+        """Create a chat completion, falling back along the task's model tier.
+
+        Every model but the last gets the tier's latency SLO as its request timeout and
+        no client retries, so a slow or failing model hands over to the next one after
+        one SLO rather than after each of the client's retries.
+        """
+        models = self.router.models_for(task) if self.router else [self.model]
+        slo = self.router.slo_for(task) if self.router else None
+        for i, model in enumerate(models):
+            last = i == len(models) - 1
+            client = self.client.with_options(max_retries=0, timeout=slo) if slo and not last else self.client
+            started = time.monotonic()
+            try:
+                with tracer.span("openai.complete", source="openai", model=model, task=task) as span:
+                    response = client.chat.completions.create(model=model, messages=messages, **kwargs)
+                    if response.usage:
+                        span.set_attribute("tokens", response.usage.total_tokens)
+            except Exception as e:
+                if self.router:
+                    self.router.record(model, time.monotonic() - started, False)
+                if last:
+                    raise
+                logger.warning(f"{model} failed for {task} ({e}), falling back to {models[i + 1]}")
+                continue
+            if self.router:
+                self.router.record(model, time.monotonic() - started, True)
+            return response
+
+    def model_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Rolling latency and error rate per model used so far."""
+        return self.router.summary() if self.router else {}
         
     def complete(
         self,
@@ -31,6 +77,7 @@ class GPTService:
         max_tokens: int = 1000,
         temperature: float = 0.7,
         messages: Optional[List[Dict[str, str]]] = None,
+        task: str = "default",
         **kwargs: Any
     ) -> Optional[str]:
         """Generate completion using GPT model.
@@ -41,6 +88,7 @@ class GPTService:
             max_tokens: Maximum tokens in response
             temperature: Sampling temperature (0-1)
             messages: Optional list of message dicts for chat history
+            task: Task type that selects the model tier when routing is configured
             **kwargs: Additional parameters to pass to OpenAI API
             
         Returns:
@@ -55,13 +103,7 @@ class GPTService:
                 messages.append({"role": "user", "content": prompt})
             
             # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                **kwargs
-            )
+            response = self._chat(messages, task, max_tokens=max_tokens, temperature=temperature, **kwargs)
             
             return response.choices[0].message.content.strip()
             
@@ -76,6 +118,7 @@ class GPTService:
         max_tokens: int = 1000,
         temperature: float = 0.7,
         messages: Optional[List[Dict[str, str]]] = None,
+        task: str = "default",
         **kwargs: Any
     ) -> Optional[str]:
         """Stream completion using GPT model.
@@ -90,9 +133,11 @@ class GPTService:
                     messages.append({"role": "system", "content": system_prompt})
                 messages.append({"role": "user", "content": prompt})
             
-            # Call OpenAI API with streaming
+            # Call OpenAI API with streaming; a partly streamed answer cannot fall back,
+            # so only the healthiest model of the tier is used
+            model = self.router.models_for(task)[0] if self.router else self.model
             response = self.client.chat.completions.create(
-                model=self.model,
+                model=model,
                 messages=messages,
                 max_tokens=max_tokens,
                 temperature=temperature,
@@ -113,7 +158,8 @@ class GPTService:
             logger.error(f"Error in GPT streaming: {e}")
             return None
 
-    def generate_text(self, prompt: str, system_prompt: str = None, max_tokens: int = 150, temperature: float = 0.7) -> Optional[str]:
+    def generate_text(self, prompt: str, system_prompt: str = None, max_tokens: int = 150, temperature: float = 0.7,
+                      task: str = "default") -> Optional[str]:
         """Generate text using GPT model."""
         try:
             messages = [
@@ -121,12 +167,7 @@ class GPTService:
                 {"role": "user", "content": prompt}
             ]
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
+            response = self._chat(messages, task, max_tokens=max_tokens, temperature=temperature)
             return response.choices[0].message.content.strip()
         except Exception as e:
             logger.error(f"Error generating text with GPT: {e}")
@@ -148,14 +189,19 @@ class GPTService:
         """
         
         try:
-            new_title = self.generate_text(prompt, max_tokens=100, temperature=0.7)
+            new_title = self.generate_text(prompt, max_tokens=100, temperature=0.7, task="title")
             return new_title if new_title else title
         except Exception as e:
             logger.error(f"Failed to generate attractive title: {e}")
             return title  # Fallback to original title
             
-    def merge_awesome_list_content(self, current_content: str, new_content: str) -> str:
-        """Merge new content into existing awesome list content."""
+    def merge_awesome_list_content(self, current_content: str, new_content: str,
+                                   max_removals: int = 0) -> str:
+        """Merge new content into existing awesome list content.
+        
+        Up to ``max_removals`` entries may be dropped by the merge; beyond that the
+        dropped entries are re-inserted.
+        """
         try:
             if not current_content.strip():
                 logger.warning("Current content is empty, cannot merge")
@@ -180,27 +226,16 @@ Focus on maintaining a high-quality, well-organized list while preserving the ex
                 prompt=prompt,
                 system_prompt="You are an expert curator for the Awesome Embodied AI list. Your task is to maintain a high-quality, focused list of the most impactful and relevant resources.",
                 max_tokens=4000,
-                temperature=0.1  # Low temperature for consistent curation
+                temperature=0.1,  # Low temperature for consistent curation
+                task="merge"
             )
             
             if not merged_content:
                 return current_content
                 
-            # Safety checks
-            if len(merged_content) < len(current_content) * 0.5:
-                logger.warning("Merged content is too short, might have lost valuable content")
-                return current_content
-            
-            content_indicators = ["github.com", "arxiv.org", "doi.org"]
-            current_indicators = sum(1 for i in content_indicators if i in current_content)
-            merged_indicators = sum(1 for i in content_indicators if i in merged_content)
-            
-            if merged_indicators < current_indicators * 0.7:
-                logger.warning("Merged content has lost too many valuable references")
-                return current_content
-            
-            if "| ----------" not in merged_content and "| ----------" in current_content:
-                logger.warning("Merged content has lost table formatting")
+            # Entry-level check: sections must survive, dropped entries are put back
+            merged_content, _ = validate_merge(current_content, merged_content, max_removals)
+            if merged_content is None:
                 return current_content
             
             logger.info("Successfully merged content using GPT")
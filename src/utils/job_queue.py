@@ -0,0 +1,222 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.logger import logger
+from utils.resilience import backoff_delay
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    available_at REAL NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (run_id, kind, key)
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority, id);
+"""
+
+FINAL_STATUSES = ("done", "failed")
+
+
+@dataclass
+class Job:
+    id: int
+    run_id: str
+    kind: str
+    key: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+class JobQueue:
+    """Durable SQLite job queue with leases, retries and idempotent results.
+
+    Jobs are unique per ``(run_id, kind, key)``, so enqueueing the same work twice
+    is a no-op. Workers lease a job for a fixed time; a lease that expires (the
+    worker died or hung) makes the job available again. Results are only accepted
+    from the current lease holder and never overwrite a finished job, so a job that
+    is retried after a slow worker still ends up with exactly one result. Several
+    processes on one host can share the queue file.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 300.0, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> Optional["JobQueue"]:
+        """Build the queue from the ``queue`` config section; None unless it is enabled."""
+        settings = (config or {}).get('queue') or {}
+        if not settings.get('enabled'):
+            return None
+        return cls(settings.get('path', '.state/jobs.sqlite'),
+                   lease_seconds=settings.get('lease_seconds', 300),
+                   max_attempts=settings.get('max_attempts', 3))
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets readers proceed while a worker writes
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, run_id: str, kind: str, key: str, payload: Dict[str, Any],
+                priority: float = 0.0, max_attempts: Optional[int] = None) -> bool:
+        """Add a job; False if the same job already exists for this run."""
+        now = time.time()
+        cursor = self._connect().execute(
+            "INSERT OR IGNORE INTO jobs (run_id, kind, key, payload, priority, max_attempts, "
+            "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (run_id, kind, key, json.dumps(payload), priority,
+             max_attempts or self.max_attempts, now, now)
+        )
+        return cursor.rowcount == 1
+
+    def enqueue_many(self, run_id: str, kind: str, jobs: Iterable[tuple]) -> int:
+        """Enqueue ``(key, payload, priority)`` tuples in one transaction."""
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            added = 0
+            for key, payload, priority in jobs:
+                added += conn.execute(
+                    "INSERT OR IGNORE INTO jobs (run_id, kind, key, payload, priority, max_attempts, "
+                    "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, kind, key, json.dumps(payload), priority, self.max_attempts, now, now)
+                ).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def lease(self, worker_id: str, run_id: Optional[str] = None,
+              kinds: Optional[List[str]] = None) -> Optional[Job]:
+        """Atomically claim the next ready job (lowest priority value first)."""
+        now = time.time()
+        clauses = ["((status = 'queued' AND available_at <= ?) OR (status = 'leased' AND lease_expires < ?))",
+                   "attempts < max_attempts"]
+        params: List[Any] = [now, now]
+        if run_id is not None:
+            clauses.append("run_id = ?")
+            params.append(run_id)
+        if kinds:
+            clauses.append(f"kind IN ({', '.join('?' for _ in kinds)})")
+            params.extend(kinds)
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id, run_id, kind, key, payload, attempts, max_attempts FROM jobs "
+                f"WHERE {' AND '.join(clauses)} ORDER BY priority, id LIMIT 1", params
+            ).fetchone()
+            if row is None:
+                self._expire_exhausted(conn, now)
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, updated_at = ? WHERE id = ?",
+                (worker_id, now + self.lease_seconds, now, row[0])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return Job(row[0], row[1], row[2], row[3], json.loads(row[4]), row[5] + 1, row[6])
+
+    @staticmethod
+    def _expire_exhausted(conn: sqlite3.Connection, now: float) -> None:
+        # Leases that timed out on their last attempt will never be picked up again
+        conn.execute(
+            "UPDATE jobs SET status = 'failed', error = COALESCE(error, 'lease expired'), "
+            "updated_at = ? WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+            (now, now)
+        )
+
+    def extend(self, job: Job, worker_id: str) -> bool:
+        """Renew a lease for long-running work; False if the lease was lost."""
+        now = time.time()
+        cursor = self._connect().execute(
+            "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (now + self.lease_seconds, now, job.id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job: Job, worker_id: str, result: Any) -> bool:
+        """Store a job's result; ignored (False) if the job already finished elsewhere."""
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = 'done', result = ?, lease_owner = NULL, lease_expires = NULL, "
+            "updated_at = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (json.dumps(result, default=str), time.time(), job.id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job: Job, worker_id: str, error: str) -> None:
+        """Release a failed job for a retry with backoff, or mark it failed for good."""
+        now = time.time()
+        final = job.attempts >= job.max_attempts
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_owner = NULL, "
+            "lease_expires = NULL, updated_at = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            ("failed" if final else "queued", error, now + backoff_delay(job.attempts - 1),
+             now, job.id, worker_id)
+        )
+        if final:
+            logger.error(f"Job {job.kind}:{job.key} failed after {job.attempts} attempts: {error}")
+
+    def results(self, run_id: str, kind: str) -> Dict[str, Any]:
+        """Decoded results of finished jobs, by key; failed jobs map to None."""
+        rows = self._connect().execute(
+            "SELECT key, status, result FROM jobs WHERE run_id = ? AND kind = ? AND status IN ('done', 'failed')",
+            (run_id, kind)
+        ).fetchall()
+        return {key: json.loads(result) if status == "done" and result else None
+                for key, status, result in rows}
+
+    def pending(self, run_id: str, kind: Optional[str] = None) -> int:
+        """Number of jobs in the run that have not finished yet."""
+        self._expire_exhausted(self._connect(), time.time())
+        query = "SELECT COUNT(*) FROM jobs WHERE run_id = ? AND status NOT IN ('done', 'failed')"
+        params: List[Any] = [run_id]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        return self._connect().execute(query, params).fetchone()[0]
+
+    def purge(self, older_than_days: float = 7) -> int:
+        """Delete jobs from runs last touched more than ``older_than_days`` ago."""
+        cutoff = time.time() - older_than_days * 86400
+        return self._connect().execute(
+            "DELETE FROM jobs WHERE run_id IN "
+            "(SELECT run_id FROM jobs GROUP BY run_id HAVING MAX(updated_at) < ?)", (cutoff,)
+        ).rowcount
@@ -1,14 +1,57 @@
 from loguru import logger
 import sys
 import os
+import threading
+import time
 
 # Configure logger
 log_level = os.getenv("LOG_LEVEL", "INFO")
 log_file = os.getenv("LOG_FILE", "awesome-embodied-ai.log")
+# The file sink writes one JSON record per line unless LOG_JSON=0
+log_json = os.getenv("LOG_JSON", "1") != "0"
 
-# Remove default handler and add our custom handlers
+# Remove default handler and add our custom handlers. Both sinks are enqueued, so
+# formatting and I/O happen on a background thread instead of the calling one.
 logger.remove()
-logger.add(sys.stderr, level=log_level)
-logger.add(log_file, rotation="10 MB", level=log_level)
+logger.add(sys.stderr, level=log_level, enqueue=True)
+logger.add(log_file, rotation="10 MB", level=log_level, enqueue=True, serialize=log_json)
 
-__all__ = ["logger"] 
\ No newline at end of file
+
+class LogSampler:
+    """Rate-limits repetitive per-item log lines.
+
+    ``allow(key)`` is True for the first ``limit`` calls per key in each
+    ``interval`` seconds. When a window closes with lines dropped, one summary
+    line reports how many were suppressed.
+    """
+
+    def __init__(self, limit: int = 5, interval: float = 60.0):
+        self.limit = limit
+        self.interval = interval
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            started, count = self._windows.get(key, (now, 0))
+            if now - started >= self.interval:
+                if count > self.limit:
+                    logger.info("Suppressed {} '{}' log lines", count - self.limit, key)
+                started, count = now, 0
+            self._windows[key] = (started, count + 1)
+            return count < self.limit
+
+    def flush(self) -> None:
+        """Report suppressed lines for every open window, e.g. at the end of a loop."""
+        with self._lock:
+            for key, (_, count) in self._windows.items():
+                if count > self.limit:
+                    logger.info("Suppressed {} '{}' log lines", count - self.limit, key)
+            self._windows.clear()
+
+
+log_sampler = LogSampler(int(os.getenv("LOG_SAMPLE_LIMIT", "5")),
+                         float(os.getenv("LOG_SAMPLE_INTERVAL", "60")))
+
+__all__ = ["logger", "log_sampler", "LogSampler"]
@@ -0,0 +1,177 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from utils.logger import logger
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+URL_PATTERN = re.compile(r"https?://[^\s)\]|>]+")
+LINK_TEXT_PATTERN = re.compile(r"\[([^\]]+)\]\(")
+TABLE_SEPARATOR_PATTERN = re.compile(r"^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$")
+ARXIV_VERSION_PATTERN = re.compile(r"(arxiv\.org/)(?:abs|pdf)/([\w.\-/]+?)(?:v\d+)?(?:\.pdf)?$")
+
+
+@dataclass
+class Entry:
+    key: str  # normalized primary URL
+    title: str
+    url: str
+    line: str
+    section: str
+    index: int  # line number in its document
+
+
+@dataclass
+class MergeReport:
+    """Entry-level differences between a README and its merged version."""
+
+    added: List[Entry] = field(default_factory=list)
+    removed: List[Entry] = field(default_factory=list)
+    modified: List[Tuple[Entry, Entry]] = field(default_factory=list)
+    restored: List[Entry] = field(default_factory=list)
+    missing_sections: List[str] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "modified": len(self.modified),
+            "restored": len(self.restored),
+            "missing_sections": len(self.missing_sections),
+        }
+
+
+def normalize_url(url: str) -> str:
+    """Identity of an entry's link: scheme, ``www.``, trailing slashes and arXiv versions ignored."""
+    url = url.strip().rstrip(".,;").lower()
+    url = re.sub(r"^https?://(www\.)?", "", url).rstrip("/")
+    return ARXIV_VERSION_PATTERN.sub(r"\1abs/\2", url)
+
+
+def extract_entries(content: str) -> Tuple[Dict[str, Entry], List[str]]:
+    """Entries (table rows and list items with a link) by key, and the section headings.
+
+    One pass over the lines; a repeated link keeps its first entry.
+    """
+    entries: Dict[str, Entry] = {}
+    headings: List[str] = []
+    section = ""
+    for index, line in enumerate(content.splitlines()):
+        stripped = line.strip()
+        heading = HEADING_PATTERN.match(stripped)
+        if heading:
+            section = heading.group(2)
+            headings.append(section)
+            continue
+        is_row = stripped.startswith("|") and not TABLE_SEPARATOR_PATTERN.match(stripped)
+        is_item = stripped[:2] in ("- ", "* ", "+ ")
+        if not (is_row or is_item):
+            continue
+        url = URL_PATTERN.search(stripped)
+        if not url:
+            continue  # Table headers and plain bullets carry no link
+        title_match = LINK_TEXT_PATTERN.search(stripped)
+        if is_row:
+            title = stripped.strip("|").split("|", 1)[0].strip()
+        else:
+            title = title_match.group(1) if title_match else stripped[2:].strip()
+        key = normalize_url(url.group(0))
+        entries.setdefault(key, Entry(key, title.strip("*_ "), url.group(0), line, section, index))
+    return entries, headings
+
+
+def diff_entries(old: str, new: str) -> MergeReport:
+    """Which entries a merge added, removed and modified, keyed by their primary URL."""
+    old_entries, old_headings = extract_entries(old)
+    new_entries, new_headings = extract_entries(new)
+    report = MergeReport()
+    new_heading_set = set(new_headings)
+    report.missing_sections = [heading for heading in old_headings if heading not in new_heading_set]
+    for key, entry in old_entries.items():
+        merged = new_entries.get(key)
+        if merged is None:
+            report.removed.append(entry)
+        elif merged.line.strip() != entry.line.strip():
+            report.modified.append((entry, merged))
+    report.added = [entry for key, entry in new_entries.items() if key not in old_entries]
+    return report
+
+
+def restore_entries(old: str, new: str, dropped: List[Entry]) -> Tuple[str, List[Entry]]:
+    """Re-insert dropped entries next to the neighbours they had in the old README.
+
+    Each entry goes after the nearest earlier entry of its old section that survived
+    the merge, else before the nearest later one, else at the end of its section.
+    Returns the repaired text and the entries that were put back.
+    """
+    if not dropped:
+        return new, []
+    old_entries, _ = extract_entries(old)
+    new_entries, _ = extract_entries(new)
+    lines = new.splitlines()
+    old_order = sorted(old_entries.values(), key=lambda entry: entry.index)
+    position = {entry.key: i for i, entry in enumerate(old_order)}
+
+    # Last line of every section in the merged README, for entries with no surviving neighbour
+    section_end: Dict[str, int] = {}
+    section = ""
+    for index, line in enumerate(lines):
+        heading = HEADING_PATTERN.match(line.strip())
+        if heading:
+            section = heading.group(2)
+            section_end.setdefault(section, index)
+        elif line.strip():
+            section_end[section] = index
+
+    insertions: Dict[int, List[str]] = {}
+    restored = []
+    for entry in sorted(dropped, key=lambda entry: entry.index):
+        anchor = None
+        i = position[entry.key]
+        for neighbour in reversed(old_order[:i]):
+            if neighbour.section != entry.section:
+                break
+            if neighbour.key in new_entries:
+                anchor = new_entries[neighbour.key].index
+                break
+        if anchor is None:
+            for neighbour in old_order[i + 1:]:
+                if neighbour.section != entry.section:
+                    break
+                if neighbour.key in new_entries:
+                    anchor = new_entries[neighbour.key].index - 1
+                    break
+        if anchor is None:
+            anchor = section_end.get(entry.section)
+        if anchor is None:
+            logger.warning(f"Cannot restore '{entry.title}': section '{entry.section}' is gone")
+            continue
+        insertions.setdefault(anchor, []).append(entry.line)
+        restored.append(entry)
+
+    repaired: List[str] = []
+    for line in insertions.get(-1, []):
+        repaired.append(line)
+    for index, line in enumerate(lines):
+        repaired.append(line)
+        repaired.extend(insertions.get(index, []))
+    text = "\n".join(repaired)
+    return (text + "\n" if new.endswith("\n") else text), restored
+
+
+def validate_merge(current: str, merged: str, max_removals: int = 0) -> Tuple[Optional[str], MergeReport]:
+    """Check a merged README against the current one and repair dropped entries.
+
+    A merge that loses a whole section is rejected (None). Up to ``max_removals``
+    removed entries are accepted as deliberate curation; if more entries went missing,
+    every one of them is put back, since the merge cannot tell which drops were meant.
+    """
+    report = diff_entries(current, merged)
+    if report.missing_sections:
+        logger.warning(f"Merged content lost sections: {', '.join(report.missing_sections)}")
+        return None, report
+    if len(report.removed) > max_removals:
+        merged, report.restored = restore_entries(current, merged, report.removed)
+        report.removed = [entry for entry in report.removed if entry not in report.restored]
+    logger.info(f"Merge validation: {report.summary()}")
+    return merged, report
@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from utils.logger import logger
+
+DEFAULT_TIERS = {
+    "cheap": ["gpt-4o-mini", "gpt-4o"],
+    "default": ["gpt-4o", "gpt-4o-mini"],
+}
+DEFAULT_TASKS = {
+    "title": "cheap",
+    "comment": "cheap",
+    "merge": "default",
+    "merge_section": "default",
+}
+DEFAULT_LATENCY_SLO = {
+    "cheap": 15.0,
+    "default": 120.0,
+}
+
+
+class ModelStats:
+    """Rolling latency and error rate of one model over its last ``window`` calls."""
+
+    def __init__(self, window: int = 50):
+        self.calls: Deque[Tuple[float, bool]] = deque(maxlen=window)
+        self.last_call = 0.0  # wall-clock, so it stays meaningful across processes
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.calls.append((latency, ok))
+        self.last_call = time.time()
+
+    @property
+    def error_rate(self) -> float:
+        if not self.calls:
+            return 0.0
+        return sum(1 for _, ok in self.calls if not ok) / len(self.calls)
+
+    @property
+    def p50_latency(self) -> float:
+        latencies = sorted(latency for latency, ok in self.calls if ok)
+        return latencies[len(latencies) // 2] if latencies else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": len(self.calls),
+            "error_rate": round(self.error_rate, 3),
+            "p50_latency": round(self.p50_latency, 3),
+        }
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"calls": [list(call) for call in self.calls], "last_call": self.last_call}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], window: int = 50) -> "ModelStats":
+        stats = cls(window)
+        stats.calls.extend((float(latency), bool(ok)) for latency, ok in state.get("calls") or [])
+        stats.last_call = float(state.get("last_call") or 0.0)
+        return stats
+
+
+class ModelRouter:
+    """Maps task types to model tiers and orders each tier's models by health.
+
+    A tier is an ordered list of models: the first is preferred, the rest are
+    fallbacks. A model whose rolling error rate exceeds ``max_error_rate`` or whose
+    median latency exceeds the tier's SLO is tried after the healthy ones; once it
+    has not been called for ``retry_after`` seconds it is preferred again for a trial.
+
+    Each run is a separate process making only a few calls, so with ``state_path``
+    the stats are loaded at start and saved after every call; otherwise they start
+    empty each run and ``min_calls`` is rarely reached. Routers running in parallel
+    keep, per model, the stats of whichever called it last.
+    """
+
+    def __init__(self, tiers: Optional[Dict[str, List[str]]] = None,
+                 tasks: Optional[Dict[str, str]] = None,
+                 latency_slo: Optional[Dict[str, float]] = None,
+                 window: int = 50, max_error_rate: float = 0.5, min_calls: int = 5,
+                 retry_after: float = 300.0, state_path: Optional[str] = None):
+        self.tiers = tiers or dict(DEFAULT_TIERS)
+        self.tasks = tasks or dict(DEFAULT_TASKS)
+        self.latency_slo = latency_slo or dict(DEFAULT_LATENCY_SLO)
+        self.window = window
+        self.max_error_rate = max_error_rate
+        self.min_calls = min_calls
+        self.retry_after = retry_after
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self.stats: Dict[str, ModelStats] = {
+            model: ModelStats.from_state(state, window) for model, state in self._load_state().items()
+        }
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "ModelRouter":
+        """Build from the ``openai`` section; ``openai.model`` heads the default tier."""
+        settings = (config or {}).get('openai') or {}
+        routing = settings.get('routing') or {}
+        tiers = {name: list(models) for name, models in (routing.get('tiers') or DEFAULT_TIERS).items()}
+        model = settings.get('model')
+        if model:
+            tiers['default'] = [model] + [m for m in tiers.get('default', []) if m != model]
+        return cls(
+            tiers=tiers,
+            tasks={**DEFAULT_TASKS, **(routing.get('tasks') or {})},
+            latency_slo={**DEFAULT_LATENCY_SLO, **(routing.get('latency_slo_seconds') or {})},
+            window=routing.get('window', 50),
+            max_error_rate=routing.get('max_error_rate', 0.5),
+            retry_after=routing.get('retry_after_seconds', 300),
+            state_path=routing.get('state_path'),
+        )
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable model stats {self.state_path}: {e}")
+            return {}
+
+    def _save_state(self) -> None:
+        state = self._load_state()
+        for model, stats in self.stats.items():
+            if stats.last_call >= (state.get(model) or {}).get("last_call", 0.0):
+                state[model] = stats.to_state()
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+            tmp_path = self.state_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.error(f"Failed to write model stats: {e}")
+
+    def tier_for(self, task: str) -> str:
+        tier = self.tasks.get(task, 'default')
+        return tier if tier in self.tiers else 'default'
+
+    def slo_for(self, task: str) -> Optional[float]:
+        return self.latency_slo.get(self.tier_for(task))
+
+    def _healthy(self, model: str, slo: Optional[float]) -> bool:
+        stats = self.stats.get(model)
+        if stats is None or len(stats.calls) < self.min_calls:
+            return True
+        if time.time() - stats.last_call > self.retry_after:
+            return True
+        if stats.error_rate > self.max_error_rate:
+            return False
+        return not (slo and stats.p50_latency > slo)
+
+    def models_for(self, task: str) -> List[str]:
+        """Models to try for ``task``, healthy ones first, in tier order."""
+        models = self.tiers.get(self.tier_for(task)) or []
+        slo = self.slo_for(task)
+        with self._lock:
+            healthy = [m for m in models if self._healthy(m, slo)]
+        unhealthy = [m for m in models if m not in healthy]
+        if unhealthy and healthy:
+            logger.debug(f"Routing {task} around degraded models: {', '.join(unhealthy)}")
+        return healthy + unhealthy
+
+    def record(self, model: str, latency: float, ok: bool) -> None:
+        with self._lock:
+            self.stats.setdefault(model, ModelStats(self.window)).record(latency, ok)
+            if self.state_path:
+                self._save_state()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {model: stats.to_dict() for model, stats in self.stats.items()}
@@ -0,0 +1,145 @@
+import math
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.logger import logger
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9\-]+")
+STOPWORDS = frozenset("""
+a about above after again against all also an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having here how if in into is it its itself just more most no nor not now of off on once
+only or other our out over own same she should so some such than that the their them then there
+these they this those through to too under until up very was we were what when where which while
+who whom why will with would you your new via using based towards toward paper code github com
+https http www org arxiv abs pdf html
+""".split())
+
+# Awesome-list entries: "| Name | Description | ..." rows and "- [Name](link) - Description" items
+ENTRY_PATTERN = re.compile(r"^\s*(?:\|(?!\s*-{3,})(.+)\||[-*]\s+\[(.+?)\]\([^)]*\)\s*-?\s*(.*))$", re.MULTILINE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase unigrams plus adjacent bigrams (``world_model``), without stopwords."""
+    words = [w.strip("-") for w in TOKEN_PATTERN.findall((text or "").lower())]
+    words = [w[:-1] if len(w) > 4 and w.endswith("s") and not w.endswith("ss") else w
+             for w in words if w and w not in STOPWORDS]
+    return words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+
+
+def readme_entries(readme: str) -> List[str]:
+    """Extract the text of every table row and list entry in an awesome-list README."""
+    entries = []
+    for match in ENTRY_PATTERN.finditer(readme or ""):
+        row, name, description = match.groups()
+        if row is not None:
+            cells = [cell.strip() for cell in row.split("|")]
+            # Drop link-only cells such as "[Paper](...)" and the header row
+            text = " ".join(cell for cell in cells if cell and not cell.startswith("["))
+            if text.lower() not in ("name description", "name description paper code"):
+                entries.append(text)
+        else:
+            entries.append(f"{name} {description}")
+    return entries
+
+
+class RelevanceRanker:
+    """Scores candidate texts against a topic profile with sparse BM25-weighted vectors.
+
+    The profile combines weighted seed terms with the centroid of a positive corpus
+    (typically the entries already in the awesome list). Each candidate is turned into
+    a BM25-saturated, IDF-weighted term vector and scored by cosine similarity to the
+    profile, giving a value in [0, 1] that can be compared against a fixed threshold.
+    IDF, the average length and the profile are fitted once, on the corpus plus the
+    seed terms, so a text's score does not depend on the texts scored with it.
+    """
+
+    def __init__(self, seed_terms: Sequence[str], corpus: Optional[Iterable[str]] = None,
+                 threshold: float = 0.05, seed_weight: float = 3.0, profile_size: int = 200,
+                 k1: float = 1.5, b: float = 0.75):
+        self.seed_tokens = Counter()
+        for term in seed_terms:
+            tokens = tokenize(term)
+            # Multi-word seeds like "world model" count through their bigrams
+            self.seed_tokens.update([t for t in tokens if "_" in t] or tokens)
+        self.corpus = [Counter(tokenize(doc)) for doc in corpus or []]
+        self.corpus = [doc for doc in self.corpus if doc]
+        self.threshold = threshold
+        self.seed_weight = seed_weight
+        self.profile_size = profile_size
+        self.k1 = k1
+        self.b = b
+        # Each seed term also counts as a document, so the statistics exist without a corpus
+        fitted = self.corpus + [Counter(tokenize(term)) for term in seed_terms if tokenize(term)]
+        self.idf = self._idf(fitted)
+        # Terms never seen while fitting weigh as if they occurred in one document
+        self.unseen_idf = math.log(1 + (len(fitted) - 0.5) / 1.5)
+        self.avg_len = (sum(sum(doc.values()) for doc in fitted) / len(fitted) if fitted else 0.0) or 1.0
+        self.profile = self._profile()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict], readme: Optional[str] = None) -> "RelevanceRanker":
+        """Build a ranker from the ``relevance`` config section and an optional README."""
+        settings = (config or {}).get("relevance") or {}
+        corpus = readme_entries(readme) if readme else []
+        ranker = cls(
+            settings.get("seed_terms", []),
+            corpus,
+            threshold=settings.get("threshold", 0.05),
+            seed_weight=settings.get("seed_weight", 3.0),
+            profile_size=settings.get("profile_size", 200),
+        )
+        logger.info(f"Relevance ranker built from {len(ranker.seed_tokens)} seed terms "
+                    f"and {len(ranker.corpus)} README entries")
+        return ranker
+
+    def _idf(self, docs: List[Counter]) -> Dict[str, float]:
+        df: Counter = Counter()
+        for doc in docs:
+            df.update(doc.keys())
+        n = len(docs)
+        return {term: math.log(1 + (n - count + 0.5) / (count + 0.5)) for term, count in df.items()}
+
+    def _vector(self, doc: Counter) -> Dict[str, float]:
+        length = sum(doc.values())
+        norm = self.k1 * (1 - self.b + self.b * length / self.avg_len)
+        return {term: self.idf.get(term, self.unseen_idf) * tf * (self.k1 + 1) / (tf + norm)
+                for term, tf in doc.items()}
+
+    @staticmethod
+    def _normalize(vector: Dict[str, float]) -> Dict[str, float]:
+        length = math.sqrt(sum(w * w for w in vector.values()))
+        return {t: w / length for t, w in vector.items()} if length else {}
+
+    def _profile(self) -> Dict[str, float]:
+        centroid: Counter = Counter()
+        for doc in self.corpus:
+            centroid.update(self._normalize(self._vector(doc)))
+        if self.corpus:
+            centroid = Counter({t: w / len(self.corpus) for t, w in centroid.most_common(self.profile_size)})
+        profile = self._normalize(dict(centroid))
+        seeds = self._normalize({t: self.idf.get(t, 1.0) * n for t, n in self.seed_tokens.items()})
+        for term, weight in seeds.items():
+            profile[term] = profile.get(term, 0.0) + self.seed_weight * weight
+        return self._normalize(profile)
+
+    def score_texts(self, texts: Sequence[str]) -> List[float]:
+        """Score texts against the fitted profile; each score depends on its own text only."""
+        scores = []
+        for text in texts:
+            vector = self._normalize(self._vector(Counter(tokenize(text))))
+            scores.append(sum(weight * self.profile.get(term, 0.0) for term, weight in vector.items()))
+        return scores
+
+    def filter(self, items: List[Dict[Any, Any]],
+               text: Callable[[Dict[Any, Any]], str] = lambda item: f"{item.get('title') or ''} "
+                                                                   f"{item.get('description') or ''}",
+               key: str = "topic_relevance") -> Tuple[List[Dict[Any, Any]], List[Dict[Any, Any]]]:
+        """Annotate items with their score under ``key`` and split them at the threshold."""
+        scores = self.score_texts([text(item) for item in items])
+        kept, dropped = [], []
+        for item, score in zip(items, scores):
+            item[key] = score
+            (kept if score >= self.threshold else dropped).append(item)
+        return kept, dropped
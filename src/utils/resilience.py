@@ -0,0 +1,167 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from requests.adapters import HTTPAdapter
+
+from utils.logger import logger
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the run-level deadline has passed."""
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited by an open breaker."""
+
+
+class Deadline:
+    """A point in time after which no further outbound calls should start."""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.expires_at = time.monotonic() + seconds if seconds else None
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def timeout(self, default: float) -> float:
+        """Per-call timeout: ``default`` capped by the time left before the deadline."""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        if remaining <= 0:
+            raise DeadlineExceeded("Run deadline exceeded")
+        return min(default, remaining)
+
+    def check(self) -> None:
+        if self.expired():
+            raise DeadlineExceeded("Run deadline exceeded")
+
+
+class CircuitBreaker:
+    """Per-source breaker that opens after consecutive failures or slow calls.
+
+    While open, calls are rejected immediately; after ``reset_timeout`` one trial
+    call is let through (half-open) and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3,
+                 latency_threshold: Optional[float] = None, reset_timeout: float = 120.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.latency_threshold = latency_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.short_circuited = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    self.short_circuited += 1
+                    return False
+                self.state = "half_open"
+            return True
+
+    def record_success(self, latency: float = 0.0) -> None:
+        if self.latency_threshold and latency > self.latency_threshold:
+            # A latency spike counts against the source just like an error
+            self.record_failure(f"slow call ({latency:.1f}s)")
+            return
+        with self._lock:
+            self.consecutive_failures = 0
+            self.state = "closed"
+
+    def record_failure(self, reason: str = "") -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.warning(f"Circuit for {self.name} opened after "
+                                   f"{self.consecutive_failures} failures {reason}".rstrip())
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "short_circuited": self.short_circuited,
+        }
+
+
+class RetryBudget:
+    """A run-wide cap on retries, shared by every source."""
+
+    def __init__(self, max_retries: int = 10):
+        self.max_retries = max_retries
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        with self._lock:
+            if self.used >= self.max_retries:
+                return False
+            self.used += 1
+            return True
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Full-jitter exponential backoff for the given (0-based) retry attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """Applies a timeout to sessions whose callers never pass one (e.g. arxiv.Client)."""
+
+    def __init__(self, timeout: Callable[[], float], **kwargs: Any):
+        self._timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request: Any, **kwargs: Any) -> Any:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self._timeout()
+        return super().send(request, **kwargs)
+
+
+def call_with_resilience(breaker: CircuitBreaker, func: Callable[[float], Any],
+                         deadline: Optional[Deadline] = None,
+                         retry_budget: Optional[RetryBudget] = None,
+                         timeout: float = 30.0, max_attempts: int = 3,
+                         backoff_base: float = 1.0) -> Any:
+    """Call ``func(timeout)`` through a breaker, deadline and retry budget.
+
+    Raises ``CircuitOpenError`` when the breaker rejects the call and
+    ``DeadlineExceeded`` when no time is left; otherwise re-raises the last error.
+    """
+    deadline = deadline or Deadline()
+    for attempt in range(max_attempts):
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit for {breaker.name} is open")
+        call_timeout = deadline.timeout(timeout)
+        started = time.monotonic()
+        try:
+            result = func(call_timeout)
+        except Exception as e:
+            breaker.record_failure(f"({type(e).__name__})")
+            last_attempt = attempt == max_attempts - 1
+            if last_attempt or (retry_budget and not retry_budget.acquire()):
+                raise
+            delay = backoff_delay(attempt, backoff_base)
+            remaining = deadline.remaining()
+            if remaining is not None and delay >= remaining:
+                raise
+            logger.warning(f"{breaker.name} call failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        breaker.record_success(time.monotonic() - started)
+        return result
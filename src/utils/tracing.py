@@ -0,0 +1,200 @@
+import atexit
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from utils.logger import logger
+
+# Tracing is off unless TRACE_FILE is set; spans are exported there as OTLP/JSON
+trace_file = os.getenv("TRACE_FILE")
+trace_top_n = int(os.getenv("TRACE_TOP_N", "10"))
+
+
+class Span:
+    """A timed unit of work with attributes, recorded by the ``Tracer``."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes", "status",
+                 "start_ns", "end_ns")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str],
+                 attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = "ok"
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+
+    @property
+    def duration_s(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def set_status(self, status: str) -> None:
+        self.status = status
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 1 if self.status == "ok" else 2, "message": self.status},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class _NoopSpan:
+    """Shared stand-in returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+    def set_status(self, status: str) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Tracer:
+    """Lightweight span recorder for pipeline stages and outbound calls.
+
+    When disabled, ``span`` returns a shared no-op object and ``traced`` leaves the
+    decorated function untouched, so instrumentation costs nothing in normal runs.
+    """
+
+    def __init__(self, export_path: Optional[str] = None, top_n: int = 10):
+        self.export_path = export_path
+        self.enabled = bool(export_path)
+        self.top_n = top_n
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+            "current_span", default=None
+        )
+        self._trace_id = uuid.uuid4().hex
+        if self.enabled:
+            atexit.register(self.flush)
+
+    def span(self, name: str, **attributes: Any) -> Any:
+        """Open a span as a context manager; a no-op when tracing is disabled."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return self._span(name, attributes)
+
+    @contextmanager
+    def _span(self, name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+        parent = self._current.get()
+        span = Span(name, self._trace_id, parent.span_id if parent else None, attributes)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_status(f"error: {type(e).__name__}")
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            self._current.reset(token)
+            with self._lock:
+                self._spans.append(span)
+
+    def traced(self, name: str, **attributes: Any) -> Callable[[Callable], Callable]:
+        """Decorator form of ``span``; returns the function unchanged when disabled."""
+        def decorator(func: Callable) -> Callable:
+            if not self.enabled:
+                return func
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self._span(name, dict(attributes)):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def slowest(self, n: Optional[int] = None) -> List[Span]:
+        with self._lock:
+            spans = list(self._spans)
+        return sorted(spans, key=lambda s: s.end_ns - s.start_ns, reverse=True)[: n or self.top_n]
+
+    def log_summary(self) -> None:
+        """Log the top-N slowest spans of the run."""
+        if not self.enabled or not self._spans:
+            return
+        logger.info(f"Top {self.top_n} slowest spans:")
+        for span in self.slowest():
+            details = ", ".join(f"{k}={v}" for k, v in span.attributes.items())
+            logger.info(f"  {span.duration_s:8.3f}s  {span.name} [{span.status}] {details}")
+
+    def flush(self) -> None:
+        """Write all finished spans to the export file as OTLP/JSON."""
+        if not self.enabled:
+            return
+        with self._lock:
+            spans = [span.to_otlp() for span in self._spans]
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", "awesome-tools")]},
+                "scopeSpans": [{"scope": {"name": "utils.tracing"}, "spans": spans}],
+            }]
+        }
+        try:
+            with open(self.export_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+        except OSError as e:
+            logger.error(f"Failed to export trace to {self.export_path}: {e}")
+
+    @contextmanager
+    def run(self, name: str) -> Iterator[Any]:
+        """Wrap a whole run: a root span, then the summary and export at the end."""
+        try:
+            with self.span(name) as root:
+                yield root
+        finally:
+            self.log_summary()
+            self.flush()
+
+
+tracer = Tracer(trace_file, trace_top_n)
+
+__all__ = ["tracer", "Tracer", "Span"]
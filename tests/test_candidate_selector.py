@@ -0,0 +1,48 @@
+from awesome_updater.core.candidate_selector import CandidateSelector, estimate_tokens
+
+# A typical arXiv abstract is 1000-1900 characters
+ABSTRACT = (
+    "We present a vision-language-action model for embodied agents that learns manipulation "
+    "skills from large-scale teleoperation data and internet video. "
+) * 12
+
+
+def paper(title, score, description=ABSTRACT):
+    return {
+        'type': 'research',
+        'title': title,
+        'description': description,
+        'links': ['https://arxiv.org/abs/2401.00001', 'https://github.com/example/vla'],
+        'impact_score': score,
+    }
+
+
+def test_realistic_abstracts_are_shortened_not_cut():
+    assert 1500 <= len(ABSTRACT) <= 1900
+    selector = CandidateSelector(token_budget=3000, quotas={'research': 5}, max_entry_tokens=250)
+
+    result = selector.select([paper(f"Paper {i}", score=i) for i in range(5)])
+
+    assert len(result.entries) == 5
+    assert result.cut_by_reason == {}
+    for entry in result.entries:
+        assert estimate_tokens(entry) <= 250
+        assert "…" in entry
+        assert "[Paper](https://arxiv.org/abs/2401.00001)" in entry
+
+
+def test_short_descriptions_are_kept_whole():
+    selector = CandidateSelector(max_entry_tokens=250)
+
+    result = selector.select([paper("Short", 1.0, description="A compact robot policy.")])
+
+    assert "| Short | A compact robot policy. |" in result.entries[0]
+
+
+def test_entry_is_cut_when_it_cannot_fit_without_description():
+    selector = CandidateSelector(max_entry_tokens=20)
+
+    result = selector.select([paper("A very long title " * 20, 1.0)])
+
+    assert result.entries == []
+    assert result.cut_by_reason == {'entry_too_long': 1}
@@ -0,0 +1,177 @@
+import time
+
+import pytest
+
+import awesome_updater.schedule as schedule
+from awesome_updater.core.change_probe import HOUR, ChangeScheduler, Decision, ProbeResult
+from awesome_updater.core.metrics_store import MetricsStore
+
+FEED = "<rss><channel><lastBuildDate>{}</lastBuildDate></channel></rss>"
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text="", headers=None, data=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode()
+        self.headers = headers or {}
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class FakeFeed:
+    """arXiv listing feed: answers 304 to the current ETag and rebuilds on ``publish``."""
+
+    def __init__(self):
+        self.built = "Mon, 06 Jan 2025 00:00:00 -0500"
+        self.requests = []
+
+    def publish(self, built):
+        self.built = built
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(url)
+        etag = f'"{self.built}"'
+        if (headers or {}).get('If-None-Match') == etag:
+            return FakeResponse(304)
+        return FakeResponse(text=FEED.format(self.built), headers={'ETag': etag})
+
+
+class FakeGitHub:
+    def __init__(self, pushed):
+        self.pushed = pushed
+        self.paths = []
+
+    def request(self, path, headers=None, deadline=None):
+        self.paths.append(path)
+        repo = path.removeprefix("repos/")
+        etag = f'"{self.pushed[repo]}"'
+        if (headers or {}).get('If-None-Match') == etag:
+            return FakeResponse(304)
+        return FakeResponse(headers={'ETag': etag}, data={'pushed_at': self.pushed[repo]})
+
+
+@pytest.fixture
+def store():
+    store = MetricsStore()
+    store.record("octo-models/octo", 1200)
+    store.record("google-deepmind/open_x_embodiment", 1500)
+    store.record("small/repo", 3)
+    return store
+
+
+@pytest.fixture
+def build(tmp_path, store):
+    def build(github=None, feed=None):
+        scheduler = ChangeScheduler(str(tmp_path / "scheduler.json"), github=github, metrics_store=store,
+                                    arxiv_categories=["cs.RO"], github_repos=2, max_staleness_hours=48)
+        scheduler.session = feed or FakeFeed()
+        return scheduler
+    return build
+
+
+def test_runs_on_new_data_and_skips_when_nothing_changed(build):
+    feed = FakeFeed()
+    github = FakeGitHub({"octo-models/octo": "2025-01-05", "google-deepmind/open_x_embodiment": "2025-01-01"})
+
+    first = build(github, feed).probe()
+    assert first.run and first.reason == "new data from arxiv, github"
+    # Only the most-starred watched repos are probed
+    assert sorted(github.paths) == ["repos/google-deepmind/open_x_embodiment", "repos/octo-models/octo"]
+    build(github, feed).commit(first, ran=True)
+
+    # Probe intervals have not elapsed yet
+    again = build(github, feed).probe()
+    assert (again.run, again.reason, again.results) == (False, "no source changed", [])
+
+
+def test_unchanged_sources_skip_until_the_staleness_limit(build, tmp_path):
+    feed = FakeFeed()
+    github = FakeGitHub({"octo-models/octo": "2025-01-05", "google-deepmind/open_x_embodiment": "2025-01-01"})
+    scheduler = build(github, feed)
+    scheduler.commit(scheduler.probe(), ran=True)
+
+    later = build(github, feed)
+    for source in later.state['sources'].values():
+        source['last_probe'] -= 25 * HOUR
+    decision = later.probe()
+    assert not decision.run
+    assert [result.changed for result in decision.results] == [False, False]
+
+    later.state['last_run'] -= 49 * HOUR
+    assert later.probe().reason == "no full run within the staleness limit"
+
+    feed.publish("Tue, 07 Jan 2025 00:00:00 -0500")
+    github.pushed["octo-models/octo"] = "2025-01-07"
+    assert later.probe().reason == "new data from arxiv, github"
+
+
+def test_learned_interval_follows_the_gap_between_changes(build):
+    scheduler = build()
+    changed = ProbeResult('arxiv', True, {})
+    quiet = ProbeResult('arxiv', False, {})
+    now = time.time()
+
+    scheduler._learn('arxiv', changed, now)
+    assert scheduler._source('arxiv').interval == HOUR  # Clamped to min_hours
+
+    scheduler._learn('arxiv', changed, now + 10 * HOUR)
+    source = scheduler._source('arxiv')
+    assert (source.mean_gap, source.interval) == (10 * HOUR, 5 * HOUR)
+
+    scheduler._learn('arxiv', changed, now + 30 * HOUR)
+    # Moving average: 0.3 * 20h + 0.7 * 10h
+    assert scheduler._source('arxiv').mean_gap == pytest.approx(13 * HOUR)
+
+    # A quiet spell longer than the usual gap stretches the interval, up to max_hours
+    scheduler._learn('arxiv', quiet, now + 50 * HOUR)
+    assert scheduler._source('arxiv').interval == pytest.approx(10 * HOUR)
+    scheduler._learn('arxiv', quiet, now + 130 * HOUR)
+    assert scheduler._source('arxiv').interval == 12 * HOUR
+
+
+class FakeScheduler:
+    def __init__(self, run):
+        self.run = run
+        self.commits = []
+
+    def probe(self):
+        return Decision(self.run, "test", [ProbeResult('arxiv', self.run, {})])
+
+    def commit(self, decision, ran=False):
+        self.commits.append(ran)
+
+
+@pytest.fixture
+def scheduled(monkeypatch):
+    def scheduled(run, ok=True):
+        scheduler = FakeScheduler(run)
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        monkeypatch.setattr(schedule.Config, "load_config", staticmethod(lambda: {}))
+        monkeypatch.setattr(schedule.ChangeScheduler, "from_config",
+                            staticmethod(lambda config, github=None, metrics_store=None: scheduler))
+        monkeypatch.setattr(schedule, "run_profiles", lambda: ok)
+        return scheduler
+    return scheduled
+
+
+def test_failed_run_does_not_commit_the_probe(scheduled):
+    scheduler = scheduled(run=True, ok=False)
+    assert schedule.main([]) == 1
+    assert scheduler.commits == []
+
+
+def test_successful_and_skipped_runs_commit(scheduled):
+    scheduler = scheduled(run=True)
+    assert schedule.main([]) == 0
+    assert scheduler.commits == [True]
+
+    scheduler = scheduled(run=False)
+    assert schedule.main([]) == 0
+    assert scheduler.commits == [False]
+
+    scheduler = scheduled(run=False)
+    assert schedule.main(["--dry-run"]) == 0
+    assert scheduler.commits == []
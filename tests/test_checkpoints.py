@@ -0,0 +1,72 @@
+import json
+import os
+import time
+
+from awesome_updater.core.checkpoints import RunCheckpoints, fingerprint
+
+
+def manifest(root, run_id):
+    with open(os.path.join(root, run_id, "run.json")) as f:
+        return json.load(f)
+
+
+def age(root, run_id, hours):
+    data = manifest(root, run_id)
+    data["started_at"] = time.time() - hours * 3600
+    with open(os.path.join(root, run_id, "run.json"), "w") as f:
+        json.dump(data, f)
+
+
+def test_fingerprint_is_stable_and_input_sensitive():
+    assert fingerprint({"a": 1, "b": [1, 2]}, "readme") == fingerprint({"b": [1, 2], "a": 1}, "readme")
+    assert fingerprint({"a": 1}, "readme") != fingerprint({"a": 2}, "readme")
+    # Parts are delimited, so moving text between them changes the digest
+    assert fingerprint("ab", "c") != fingerprint("a", "bc")
+
+
+def test_completed_stages_are_reused_only_with_the_same_inputs(tmp_path):
+    run = RunCheckpoints(str(tmp_path))
+    stages = run.for_profile("embodied")
+    inputs = fingerprint({"quotas": {"research": 20}}, "# README\n")
+    stages.save("select", {"entries": ["| Octo | ... |"]}, inputs)
+
+    assert stages.load("select", inputs) == {"entries": ["| Octo | ... |"]}
+    assert stages.load("select", fingerprint({"quotas": {"research": 10}}, "# README\n")) is None
+    # Stages saved without inputs (such as the push marker) load unconditionally
+    stages.save("push", {"pushed": True})
+    assert stages.load("push") == {"pushed": True}
+    assert stages.load("merge") is None
+    assert run.for_profile("other").load("select", inputs) is None
+
+
+def test_failed_run_is_resumed_and_completed_run_is_not(tmp_path):
+    root = str(tmp_path)
+    first = RunCheckpoints(root)
+    first.for_profile("embodied").save("select", ["entry"], "inputs")
+    first.finish(False)
+
+    retry = RunCheckpoints(root)
+    assert retry.run_id == first.run_id
+    assert manifest(root, retry.run_id)["attempts"] == 2
+    assert retry.for_profile("embodied").load("select", "inputs") == ["entry"]
+    retry.finish(True)
+
+    fresh = RunCheckpoints(root)
+    assert fresh.run_id != first.run_id
+    assert fresh.for_profile("embodied").load("select", "inputs") is None
+
+
+def test_unfinished_run_outside_the_window_is_not_resumed(tmp_path):
+    root = str(tmp_path)
+    crashed = RunCheckpoints(root, resume_within_hours=2)  # never finished
+    age(root, crashed.run_id, hours=3)
+
+    assert RunCheckpoints(root, resume_within_hours=2).run_id != crashed.run_id
+
+
+def test_pinned_run_id_and_pruning(tmp_path):
+    root = str(tmp_path)
+    for i in range(4):
+        RunCheckpoints(root, run_id=f"2026010{i}T000000-run", keep_runs=2).finish(True)
+
+    assert sorted(os.listdir(root)) == ["20260102T000000-run", "20260103T000000-run"]
@@ -0,0 +1,86 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from awesome_updater.core.citations import CitationEnricher
+
+
+class FakeGraphAPI(BaseHTTPRequestHandler):
+    """Batch endpoint: papers ending in 9 are unknown; ``responses`` overrides replies in order."""
+
+    batches = []
+    responses = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.batches.append((self.path, body["ids"]))
+        if self.responses:
+            reply = self.responses.pop(0)
+        else:
+            reply = [None if paper_id.endswith("9") else {"paperId": paper_id, "citationCount": int(paper_id[-1]) * 10}
+                     for paper_id in body["ids"]]
+        data = json.dumps(reply).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = HTTPServer(("127.0.0.1", 0), FakeGraphAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def reset_fake():
+    FakeGraphAPI.batches.clear()
+    FakeGraphAPI.responses.clear()
+
+
+def papers(*numbers):
+    return [{'type': 'research', 'links': [f"https://arxiv.org/abs/2401.0000{n}v2"]} for n in numbers]
+
+
+def test_counts_are_fetched_in_batches_and_cached(base_url, tmp_path):
+    cache_path = str(tmp_path / "citations.json")
+    items = papers(1, 2, 3, 4, 9)
+
+    found = CitationEnricher(base_url=base_url, cache_path=cache_path, batch_size=3).enrich(items)
+
+    assert found == 4
+    assert [item.get('citations') for item in items] == [10, 20, 30, 40, None]
+    assert [ids for _, ids in FakeGraphAPI.batches] == [
+        ["ARXIV:2401.00001", "ARXIV:2401.00002", "ARXIV:2401.00003"],
+        ["ARXIV:2401.00004", "ARXIV:2401.00009"],
+    ]
+    assert FakeGraphAPI.batches[0][0] == "/graph/v1/paper/batch?fields=citationCount"
+
+    # Known and unknown papers alike are served from the cache within their TTL
+    FakeGraphAPI.batches.clear()
+    assert CitationEnricher(base_url=base_url, cache_path=cache_path).enrich(papers(1, 9)) == 1
+    assert FakeGraphAPI.batches == []
+
+
+@pytest.mark.parametrize("reply", [
+    {"error": "Too many requests"},
+    [{"paperId": "x", "citationCount": 5}],
+    ["ARXIV:2401.00001", "ARXIV:2401.00002"],
+])
+def test_malformed_batch_is_a_failed_batch(base_url, reply):
+    FakeGraphAPI.responses.append(reply)
+    enricher = CitationEnricher(base_url=base_url, batch_size=2)
+    items = papers(1, 2, 3)
+
+    assert enricher.enrich(items) == 1
+
+    assert [item.get('citations') for item in items] == [None, None, 30]
+    assert "2401.00001" not in enricher.cache
@@ -0,0 +1,74 @@
+import gzip
+import io
+import json
+import os
+import shutil
+
+import pytest
+
+from awesome_updater.core.code_index import PaperCodeIndex, iter_json_records
+
+DUMP = os.path.join(os.path.dirname(__file__), "fixtures", "paper_code_links.json")
+
+
+@pytest.fixture
+def records():
+    with open(DUMP, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_gz(path, records):
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(records, f)
+    return str(path)
+
+
+def test_import_and_lookup(tmp_path):
+    index = PaperCodeIndex(str(tmp_path / "index.sqlite"))
+
+    stats = index.import_dump(DUMP)
+
+    assert (stats.rows, stats.added, stats.updated, stats.removed) == (4, 4, 0, 0)
+    assert len(index) == 4
+    # Any version resolves; official implementations come first, trailing slashes are dropped
+    assert index.lookup("2405.12213v1") == [
+        "https://github.com/octo-models/octo",
+        "https://github.com/community/octo-pytorch",
+    ]
+    # Rows without paper_arxiv_id fall back to the abstract URL
+    assert index.lookup("2406.09246") == ["https://github.com/openvla/openvla"]
+    assert index.lookup("2401.00001") == []
+    assert index.lookup_many(["2307.15818", "2401.00001"]) == {"2307.15818": ["https://github.com/kyegomez/RT-2"]}
+
+
+def test_reimport_writes_only_the_differences(tmp_path, records):
+    index = PaperCodeIndex(str(tmp_path / "index.sqlite"))
+    index.import_dump(write_gz(tmp_path / "old.json.gz", records))
+
+    records[0]["is_official"] = True  # RT-2 link now marked official
+    del records[2]  # community Octo port gone
+    records.append({"paper_arxiv_id": "2410.24164", "repo_url": "https://github.com/Physical-Intelligence/openpi",
+                    "is_official": True})
+    stats = index.import_dump(write_gz(tmp_path / "new.json.gz", records))
+
+    assert (stats.rows, stats.added, stats.updated, stats.removed) == (4, 1, 1, 1)
+    assert index.lookup("2405.12213") == ["https://github.com/octo-models/octo"]
+    assert index.lookup("2410.24164") == ["https://github.com/Physical-Intelligence/openpi"]
+
+
+def test_unchanged_dump_is_skipped(tmp_path):
+    index = PaperCodeIndex(str(tmp_path / "index.sqlite"))
+    index.import_dump(DUMP)
+    copy = shutil.copy(DUMP, tmp_path / "copy.json")
+
+    stats = index.import_dump(str(copy))
+
+    assert stats.skipped
+    assert len(index) == 4
+
+
+def test_json_lines_and_records_split_across_chunks(records):
+    lines = "\n".join(json.dumps(record) for record in records)
+
+    assert list(iter_json_records(io.StringIO(lines), chunk_size=7)) == records
+    assert list(iter_json_records(io.StringIO(json.dumps(records)), chunk_size=7)) == records
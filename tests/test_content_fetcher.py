@@ -0,0 +1,28 @@
+from awesome_updater.core.content_fetcher import ContentFetcher
+from awesome_updater.core.fetch_cache import FetchCache
+from awesome_updater.core.fetch_jobs import FetchCoordinator
+from awesome_updater.core.metrics_store import MetricsStore
+from utils.job_queue import JobQueue
+
+CONFIG = {'github': {'search': {'query_terms': ["embodied ai"]}}}
+
+
+class FakeGitHub:
+    retry_budget = None
+
+    def iter_search_repos(self, **kwargs):
+        yield {'full_name': "octo-models/octo", 'html_url': "https://github.com/octo-models/octo",
+               'stargazers_count': 1200, 'forks_count': 100}
+
+
+def test_queued_search_results_are_snapshotted_once_per_run(tmp_path):
+    store = MetricsStore()
+    cache = FetchCache(consumers=2)
+    jobs = FetchCoordinator(JobQueue(str(tmp_path / "jobs.sqlite")), poll_interval=0)
+    fetchers = [ContentFetcher("token", config=CONFIG, github_client=FakeGitHub(), metrics_store=store,
+                               fetch_cache=cache, jobs=jobs) for _ in range(2)]
+
+    found = [fetcher._fetch_github_repos() for fetcher in fetchers]
+
+    assert [[repo['title'] for repo in repos] for repos in found] == [["octo-models/octo"]] * 2
+    assert len(store.get("octo-models/octo")) == 1
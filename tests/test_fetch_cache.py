@@ -0,0 +1,43 @@
+from awesome_updater.core.fetch_cache import FetchCache
+
+
+def fetch(calls):
+    def compute():
+        calls.append(1)
+        return [{'title': 'Octo'}, {'title': 'OpenVLA'}]
+    return compute
+
+
+def test_item_lists_are_shared_then_evicted_once_every_profile_read_them():
+    cache = FetchCache(consumers=2)
+    calls = []
+
+    first = cache.items(('arxiv', 'vla'), fetch(calls), 'embodied')
+    first[0]['impact_score'] = 3.0  # Callers annotate their own copies
+    second = cache.items(('arxiv', 'vla'), fetch(calls), 'robotics')
+
+    assert calls == [1]
+    assert second == [{'title': 'Octo'}, {'title': 'OpenVLA'}]
+    assert cache.get(('arxiv', 'vla')) is None
+    assert cache.evictions == 1
+
+
+def test_finished_profiles_do_not_hold_lists_they_never_read():
+    cache = FetchCache(consumers=2)
+    cache.items(('labs',), fetch([]), 'embodied')
+    assert cache.get(('labs',)) is not None
+
+    cache.finish('robotics')
+
+    assert cache.get(('labs',)) is None
+
+
+def test_values_without_a_consumer_stay_for_the_run():
+    cache = FetchCache(consumers=1)
+    cache.get_or_compute(('lab_scraper',), lambda: 'scraper')
+    cache.items(('labs',), fetch([]))
+
+    cache.finish('embodied')
+
+    assert cache.get(('lab_scraper',)) == 'scraper'
+    assert cache.get(('labs',)) is not None
@@ -0,0 +1,130 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from awesome_updater.core import github_client
+from awesome_updater.core.github_client import GitHubClient
+
+
+class FakeResponse:
+    status_code = 200
+    content = b"{}"
+
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+
+    def json(self):
+        return {}
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Records when each request was sent; every response leaves the quota headers out."""
+
+    def __init__(self):
+        self.headers = {}
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        with self._lock:
+            self.sent.append(time.monotonic())
+        return FakeResponse()
+
+
+def call_concurrently(client, calls):
+    with ThreadPoolExecutor(max_workers=calls) as pool:
+        return list(pool.map(lambda i: client.request(f"repos/lab/repo{i}"), range(calls)))
+
+
+def test_concurrent_requests_are_paced_and_counted():
+    session = FakeSession()
+    client = GitHubClient("token", session=session)
+    budget = client.budgets["core"]
+    # Under 10% of the quota is left, so it is spread over the rest of the window
+    budget.limit, budget.remaining, budget.reset_at = 5000, 20, time.time() + 2
+
+    responses = call_concurrently(client, 5)
+
+    assert all(response is not None for response in responses)
+    gaps = [b - a for a, b in zip(session.sent, session.sent[1:])]
+    assert min(gaps) >= 0.09
+    assert budget.to_dict()["requests"] == 5
+
+
+def test_concurrent_requests_do_not_race_past_the_reserve():
+    session = FakeSession()
+    client = GitHubClient("token", reserve=2, max_wait=0, session=session)
+    budget = client.budgets["core"]
+    budget.limit, budget.remaining, budget.reset_at = 10, 5, time.time() + 3600
+
+    responses = call_concurrently(client, 8)
+
+    assert sum(response is not None for response in responses) == 3
+    assert len(session.sent) == 3
+    assert budget.to_dict()["skipped_requests"] == 5
+
+
+def test_stale_headers_do_not_return_reserved_quota():
+    client = GitHubClient("token", session=FakeSession())
+    budget = client.budgets["core"]
+    budget.update({"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "100"})
+    budget.update({"X-RateLimit-Remaining": "12", "X-RateLimit-Reset": "100"})
+    assert budget.remaining == 10
+
+    budget.update({"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "3700"})
+    assert budget.remaining == 4999
+
+
+class FakeSearch(FakeSession):
+    """Search API over repos created one per day, paging through ``Link`` headers."""
+
+    def __init__(self, days):
+        super().__init__()
+        start = date(2024, 1, 1)
+        self.repos = [{"id": i, "created": start + timedelta(days=i)} for i in range(days)]
+        self.pages = []
+
+    def get(self, url, params=None, **kwargs):
+        params = params or {key: values[0] for key, values in parse_qs(urlsplit(url).query).items()}
+        since, until = (date.fromisoformat(day) for day in params["q"].split("created:")[1].split(".."))
+        matches = [repo for repo in self.repos if since <= repo["created"] <= until]
+        per_page, page = int(params["per_page"]), int(params.get("page", 1))
+        self.pages.append((per_page, len(matches)))
+        response = FakeResponse()
+        response.data = {"total_count": len(matches), "items": matches[(page - 1) * per_page:page * per_page]}
+        response.json = lambda: response.data
+        response.links = {}
+        if page * per_page < len(matches):
+            query = urlencode({**params, "page": page + 1})
+            response.links["next"] = {"url": f"https://api.github.com/search/repositories?{query}"}
+        return response
+
+
+def test_queries_over_the_cap_are_sharded_without_wasting_pages(monkeypatch):
+    monkeypatch.setattr(github_client, "SEARCH_RESULT_CAP", 10)
+    monkeypatch.setattr(github_client, "SEARCH_PAGE_SIZE", 4)
+    session = FakeSearch(days=30)
+    client = GitHubClient("token", session=session)
+
+    repos = list(client.iter_search_repos("robot", since=date(2024, 1, 1), until=date(2024, 1, 30)))
+
+    assert sorted(repo["id"] for repo in repos) == list(range(30))
+    # Full pages are only fetched for ranges small enough to keep
+    assert all(matches <= 10 for per_page, matches in session.pages if per_page == 4)
+
+
+def test_capped_queries_are_not_sharded(monkeypatch):
+    monkeypatch.setattr(github_client, "SEARCH_RESULT_CAP", 10)
+    monkeypatch.setattr(github_client, "SEARCH_PAGE_SIZE", 4)
+    session = FakeSearch(days=30)
+    client = GitHubClient("token", session=session)
+
+    repos = list(client.iter_search_repos("robot", max_results=6, since=date(2024, 1, 1), until=date(2024, 1, 30)))
+
+    assert [repo["id"] for repo in repos] == list(range(6))
+    assert session.pages == [(4, 30), (4, 30)]
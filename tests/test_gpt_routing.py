@@ -0,0 +1,86 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from openai import OpenAI
+
+from utils.gpt_service import GPTService
+from utils.model_router import ModelRouter
+
+SLO = 0.5
+SLOW_SECONDS = 2.0
+
+
+class FakeOpenAI(BaseHTTPRequestHandler):
+    """Chat completions endpoint where ``slow-model`` takes longer than the SLO."""
+
+    calls = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.calls.append(body["model"])
+        if body["model"] == "slow-model":
+            time.sleep(SLOW_SECONDS)
+        data = json.dumps({
+            "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": f"answer from {body['model']}"}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except OSError:
+            pass  # The client gave up waiting
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAI)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+
+
+def service(base_url, state_path=None):
+    router = ModelRouter(tiers={"default": ["slow-model", "fast-model"]}, latency_slo={"default": SLO},
+                         min_calls=1, state_path=state_path)
+    gpt = GPTService("sk-test", model="slow-model", router=router)
+    # The default client retries twice, which would hold a slow model for three SLOs
+    gpt.client = OpenAI(api_key="sk-test", base_url=base_url)
+    return gpt
+
+
+def test_slow_model_falls_back_after_one_slo(base_url):
+    gpt = service(base_url)
+    FakeOpenAI.calls.clear()
+
+    started = time.monotonic()
+    answer = gpt.complete("Hello", task="merge")
+    elapsed = time.monotonic() - started
+
+    assert answer == "answer from fast-model"
+    assert FakeOpenAI.calls == ["slow-model", "fast-model"]
+    assert elapsed < SLO + 1.0
+    assert gpt.model_stats()["slow-model"]["error_rate"] == 1.0
+
+
+def test_router_stats_persist_across_runs(base_url, tmp_path):
+    state_path = str(tmp_path / "model_stats.json")
+    service(base_url, state_path).complete("Hello", task="merge")
+
+    # A later run starts with the slow model's failure and goes straight to the fallback
+    gpt = service(base_url, state_path)
+    assert gpt.router.models_for("merge") == ["fast-model", "slow-model"]
+    FakeOpenAI.calls.clear()
+    assert gpt.complete("Hello", task="merge") == "answer from fast-model"
+    assert FakeOpenAI.calls == ["fast-model"]
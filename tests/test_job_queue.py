@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+import utils.job_queue
+from awesome_updater.core.fetch_jobs import FetchCoordinator
+from utils.job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    # Retries become available again immediately
+    monkeypatch.setattr(utils.job_queue, "backoff_delay", lambda attempt: 0.0)
+    return JobQueue(str(tmp_path / "jobs.sqlite"), lease_seconds=0.05, max_attempts=2)
+
+
+def status(queue, run_id="run", key="octo"):
+    return queue._connect().execute(
+        "SELECT status, attempts, error FROM jobs WHERE run_id = ? AND key = ?", (run_id, key)
+    ).fetchone()
+
+
+def test_jobs_are_unique_per_run(queue):
+    assert queue.enqueue("run", "enrich_repo", "octo", {"path": "repos/octo-models/octo"})
+    assert not queue.enqueue("run", "enrich_repo", "octo", {"path": "repos/octo-models/octo"})
+    assert queue.enqueue_many("run", "enrich_repo", [("octo", {}, 0.0), ("rt-2", {}, 0.0)]) == 1
+    assert queue.pending("run") == 2
+
+
+def test_expired_lease_is_leased_again_and_the_late_result_is_discarded(queue):
+    queue.enqueue("run", "enrich_repo", "octo", {"path": "repos/octo-models/octo"})
+    slow = queue.lease("slow-worker")
+    assert queue.lease("other-worker") is None
+
+    time.sleep(0.06)
+    retry = queue.lease("other-worker")
+
+    assert (retry.id, retry.attempts) == (slow.id, 2)
+    assert not queue.complete(slow, "slow-worker", {"stars": 1})
+    assert queue.complete(retry, "other-worker", {"stars": 2})
+    # A finished job never takes a second result
+    assert not queue.complete(retry, "other-worker", {"stars": 3})
+    assert queue.results("run", "enrich_repo") == {"octo": {"stars": 2}}
+
+
+def test_only_the_lease_owner_can_finish_a_job(queue):
+    queue.enqueue("run", "enrich_repo", "octo", {})
+    job = queue.lease("worker")
+
+    assert not queue.complete(job, "intruder", {"stars": 1})
+    queue.fail(job, "intruder", "boom")
+
+    assert status(queue) == ("leased", 1, None)
+    assert not queue.extend(job, "intruder")
+    assert queue.extend(job, "worker")
+
+
+def test_failures_are_retried_until_max_attempts(queue):
+    queue.enqueue("run", "enrich_repo", "octo", {})
+
+    queue.fail(queue.lease("worker"), "worker", "HTTP 502")
+    assert status(queue) == ("queued", 1, "HTTP 502")
+
+    queue.fail(queue.lease("worker"), "worker", "HTTP 503")
+    assert status(queue) == ("failed", 2, "HTTP 503")
+    assert queue.lease("worker") is None
+    assert queue.pending("run") == 0
+    assert queue.results("run", "enrich_repo") == {"octo": None}
+
+
+def test_lease_that_expires_on_the_last_attempt_fails_the_job(queue):
+    queue.enqueue("run", "enrich_repo", "octo", {})
+    queue.lease("worker")
+    time.sleep(0.06)
+    queue.lease("worker")  # Second and last attempt, also abandoned
+    time.sleep(0.06)
+
+    assert queue.pending("run") == 0
+    assert status(queue) == ("failed", 2, "lease expired")
+
+
+def test_coordinator_finishes_a_run_without_external_workers(queue):
+    coordinator = FetchCoordinator(queue, run_id="run", poll_interval=0)
+    calls = []
+
+    def handler(payload, deadline):
+        calls.append(payload["path"])
+        if payload["path"] == "repos/missing":
+            raise ValueError("not found")
+        return {"stars": len(calls)}
+
+    results = coordinator.run("enrich_repo", {
+        "octo": {"path": "repos/octo-models/octo"},
+        "missing": {"path": "repos/missing"},
+    }, {"enrich_repo": handler}, priorities={"missing": -1.0})
+
+    assert results == {"octo": {"stars": 3}}
+    # The higher-priority job ran first and was retried up to max_attempts
+    assert calls == ["repos/missing", "repos/missing", "repos/octo-models/octo"]
+    assert queue.pending("run") == 0
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from awesome_updater.core.entry_formatter import format_entry
+from awesome_updater.core.lab_scraper import LabScraper, LabSite
+from awesome_updater.core.parser_pool import ParserPool
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "labs")
+
+
+class FixtureSite(BaseHTTPRequestHandler):
+    """Serves tests/fixtures/labs under /labs/ with ETags, answering 304 when unchanged."""
+
+    requests = []
+
+    def do_GET(self):
+        name = self.path.split("?")[0].rsplit("/", 1)[-1]
+        path = os.path.join(FIXTURES, name)
+        if not self.path.startswith("/labs/") or not os.path.isfile(path):
+            self.send_error(404)
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        conditional = self.headers.get("If-None-Match") == etag
+        self.requests.append((name, conditional))
+        if conditional:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = HTTPServer(("127.0.0.1", 0), FixtureSite)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/labs"
+    server.shutdown()
+
+
+@pytest.fixture(scope="module")
+def parsers():
+    pool = ParserPool(1)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def scraper(parsers, tmp_path):
+    def build(sites):
+        # Fixture posts are from 2024; the 1999 post is past the age limit
+        return LabScraper(sites, state_path=str(tmp_path / "lab_state.json"), min_interval=0,
+                          max_age_days=365 * 20, parsers=parsers)
+    return build
+
+
+def test_feed_posts_are_blog_entries_and_old_posts_are_skipped(base_url, scraper):
+    site = LabSite(name="Robotics Lab", url=f"{base_url}/index.html", feed=f"{base_url}/feed.xml")
+
+    items = scraper([site]).scrape()
+
+    assert [item['title'] for item in items] == [
+        "Scaling robot learning with cross-embodiment data",
+        "A tactile sensor for dexterous hands",
+    ]
+    assert items[0] == {
+        'title': "Scaling robot learning with cross-embodiment data",
+        'description': "We pool demonstrations from 22 robot platforms.",
+        'links': ["http://lab.test/blog/cross-embodiment"],
+        'type': 'blog',
+        'lab': "Robotics Lab",
+        'published_date': "2024-06-03T09:00:00+00:00",
+    }
+    assert format_entry(items[0]) == (
+        "- [Scaling robot learning with cross-embodiment data](http://lab.test/blog/cross-embodiment)"
+        " - We pool demonstrations from 22 robot platforms. (Robotics Lab)"
+    )
+
+
+def test_posts_are_only_seen_after_commit(base_url, scraper, tmp_path):
+    site = LabSite(name="Robotics Lab", url=f"{base_url}/index.html", feed=f"{base_url}/feed.xml")
+    lab = scraper([site])
+
+    first = lab.scrape()
+    # The run that used these posts failed: nothing was recorded, so they come back
+    assert not os.path.exists(tmp_path / "lab_state.json")
+    assert scraper([site]).scrape() == first
+
+    lab.commit()
+    with open(tmp_path / "lab_state.json") as f:
+        state = json.load(f)
+    assert sorted(state["seen"]["Robotics Lab"]) == [
+        "http://lab.test/blog/cross-embodiment",
+        "http://lab.test/blog/tactile-sensor",
+    ]
+    FixtureSite.requests.clear()
+    assert scraper([site]).scrape() == []
+    assert FixtureSite.requests == [("feed.xml", True)]
+
+
+def test_posts_over_the_limit_are_returned_next_run(base_url, scraper):
+    site = LabSite(name="Robotics Lab", url=f"{base_url}/index.html", feed=f"{base_url}/feed.xml",
+                   max_posts=1)
+    lab = scraper([site])
+    assert [item['title'] for item in lab.scrape()] == ["Scaling robot learning with cross-embodiment data"]
+    lab.commit()
+
+    lab = scraper([site])
+    assert [item['title'] for item in lab.scrape()] == ["A tactile sensor for dexterous hands"]
+    lab.commit()
+
+    assert scraper([site]).scrape() == []
+
+
+def test_feed_advertised_by_the_index_page(base_url, scraper):
+    site = LabSite(name="Robotics Lab", url=f"{base_url}/index.html")
+
+    items = scraper([site]).scrape()
+
+    assert len(items) == 2
+    assert items[1]['links'] == ["http://lab.test/blog/tactile-sensor"]
+
+
+def test_sitemap_posts_are_titled_from_their_slug(base_url, scraper):
+    site = LabSite(name="Robotics Lab", url=f"{base_url}/missing.html", sitemap=f"{base_url}/sitemap.xml",
+                   post_pattern=r"/news/[\w-]+")
+
+    items = scraper([site]).scrape()
+
+    assert [(item['title'], item['published_date']) for item in items] == [
+        ("Humanoid walking policy", "2024-05-20T00:00:00+00:00"),
+        ("World models for planning", "2024-04-02T10:00:00+00:00"),
+    ]
+
+
+def test_index_page_links_on_the_same_site(base_url, scraper):
+    site = LabSite(name="Robotics Lab", url=f"{base_url}/links.html", post_pattern=r"/news/[\w-]+")
+
+    items = scraper([site]).scrape()
+
+    host = base_url.rsplit("/", 1)[0]
+    assert [(item['title'], item['links']) for item in items] == [
+        ("Sim-to-real transfer for legged robots", [f"{host}/news/sim-to-real-transfer"]),
+        ("An open-source parallel gripper", [f"{host}/news/open-source-gripper"]),
+    ]
+    assert all(item['published_date'] is None for item in items)
+
+
+def test_posts_from_a_checkpointed_selection_are_seen_after_commit(base_url, scraper):
+    site = LabSite(name="Robotics Lab", url=f"{base_url}/index.html", feed=f"{base_url}/feed.xml")
+    # A resumed profile skips the scrape and only has the URLs saved with its selection
+    lab = scraper([site])
+    lab.mark_seen({"Robotics Lab": ["http://lab.test/blog/cross-embodiment"]})
+    lab.commit()
+
+    assert [item['title'] for item in scraper([site]).scrape()] == ["A tactile sensor for dexterous hands"]
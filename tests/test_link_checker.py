@@ -0,0 +1,88 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from awesome_updater.core.link_checker import LinkChecker, apply_fixes, build_report, extract_urls
+
+
+class Links(BaseHTTPRequestHandler):
+    """/ok answers, /gone is dead, /moved redirects to /ok for good and /nohead rejects HEAD."""
+
+    hits = []
+
+    def _answer(self):
+        self.hits.append((self.command, self.path))
+        if self.path == "/moved":
+            self.send_response(301)
+            self.send_header("Location", "/ok")
+        elif self.path == "/gone":
+            self.send_response(404)
+        elif self.path == "/nohead" and self.command == "HEAD":
+            self.send_response(405)
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._answer()
+
+    def do_GET(self):
+        self._answer()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def host():
+    server = HTTPServer(("127.0.0.1", 0), Links)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_extract_urls_finds_markdown_auto_and_bare_links_once():
+    readme = ("- [Octo](https://github.com/octo-models/octo) - see <https://octo-models.github.io>.\n"
+              "| RT-2 | https://arxiv.org/abs/2307.15818, [Paper](https://arxiv.org/abs/2307.15818) |\n")
+    assert extract_urls(readme) == [
+        "https://github.com/octo-models/octo",
+        "https://octo-models.github.io",
+        "https://arxiv.org/abs/2307.15818",
+    ]
+
+
+def test_links_are_classified_and_cached(host, tmp_path):
+    checker = LinkChecker(cache_path=str(tmp_path / "links.json"), max_workers=4)
+    urls = [f"{host}/ok", f"{host}/gone", f"{host}/moved", f"{host}/nohead"]
+
+    results = checker.check_all(urls)
+
+    assert {url.rsplit("/", 1)[-1]: result.status for url, result in results.items()} == {
+        "ok": "ok", "gone": "dead", "moved": "redirected", "nohead": "ok",
+    }
+    assert results[f"{host}/moved"].final_url == f"{host}/ok"
+    assert ("GET", "/nohead") in Links.hits
+    assert build_report(results)["counts"] == {"ok": 2, "dead": 1, "redirected": 1}
+
+    Links.hits.clear()
+    cached = LinkChecker(cache_path=str(tmp_path / "links.json")).check_all(urls)
+    assert Links.hits == []
+    # Dead links keep counting consecutive failures across runs
+    assert cached[f"{host}/gone"].failures == 1
+
+
+def test_fixes_rewrite_redirects_and_drop_entries_dead_long_enough(host, tmp_path):
+    checker = LinkChecker(cache_path=str(tmp_path / "links.json"), ttl_hours=0)
+    readme = (f"- [Moved]({host}/moved) - rewritten\n"
+              f"- [Moved on]({host}/moved-on) - a longer path is left alone\n"
+              f"- [Gone]({host}/gone) - removed on the second dead check\n")
+    urls = [f"{host}/moved", f"{host}/gone"]
+
+    once = apply_fixes(readme, checker.check_all(urls))
+    assert once.splitlines()[0] == f"- [Moved]({host}/ok) - rewritten"
+    assert f"{host}/moved-on" in once
+    assert "[Gone]" in once
+
+    assert "[Gone]" not in apply_fixes(readme, checker.check_all(urls))
@@ -0,0 +1,81 @@
+from utils.merge_validator import diff_entries, normalize_url, validate_merge
+
+README = """# Awesome Embodied AI
+
+## Research Papers
+
+| Name | Description | Paper | Code |
+|------|-------------|-------|------|
+| RT-1 | Robotics transformer for real-world control | [Paper](https://arxiv.org/abs/2212.06817) | [Code]() |
+| RT-2 | Vision-language-action models for robot control | [Paper](https://arxiv.org/abs/2307.15818) | [Code]() |
+| Octo | An open-source generalist robot policy | [Paper](https://arxiv.org/abs/2405.12213) | [Code]() |
+
+## Simulators
+
+- [Isaac Gym](https://github.com/NVIDIA-Omniverse/IsaacGymEnvs) - GPU physics simulation [⭐2000]
+- [Habitat](https://github.com/facebookresearch/habitat-sim) - Photorealistic 3D simulator [⭐2500]
+"""
+
+RT_1 = "| RT-1 | Robotics transformer for real-world control | [Paper](https://arxiv.org/abs/2212.06817) | [Code]() |"
+RT_2 = "| RT-2 | Vision-language-action models for robot control | [Paper](https://arxiv.org/abs/2307.15818) | [Code]() |"
+ISAAC = "- [Isaac Gym](https://github.com/NVIDIA-Omniverse/IsaacGymEnvs) - GPU physics simulation [⭐2000]"
+HABITAT = "- [Habitat](https://github.com/facebookresearch/habitat-sim) - Photorealistic 3D simulator [⭐2500]"
+MANISKILL = "- [ManiSkill](https://github.com/haosulab/ManiSkill) - GPU physics simulation for manipulation [⭐900]"
+
+
+def test_normalize_url_ignores_arxiv_versions_and_www():
+    assert normalize_url("https://arxiv.org/pdf/2307.15818v2.pdf") == "arxiv.org/abs/2307.15818"
+    assert normalize_url("http://www.arxiv.org/abs/2307.15818v1") == "arxiv.org/abs/2307.15818"
+    assert normalize_url("https://www.GitHub.com/octo-models/octo/") == "github.com/octo-models/octo"
+
+
+def test_lost_section_rejects_the_merge():
+    merged = README.split("## Simulators")[0]
+
+    result, report = validate_merge(README, merged, max_removals=10)
+
+    assert result is None
+    assert report.missing_sections == ["Simulators"]
+
+
+def test_dropped_entries_are_restored_next_to_their_surviving_neighbour():
+    merged = README.replace(RT_2 + "\n", "").replace(HABITAT + "\n", MANISKILL + "\n")
+
+    result, report = validate_merge(README, merged)
+
+    lines = result.splitlines()
+    assert lines[lines.index(RT_1) + 1] == RT_2
+    assert lines[lines.index(ISAAC) + 1:lines.index(ISAAC) + 3] == [HABITAT, MANISKILL]
+    assert [entry.title for entry in report.restored] == ["RT-2", "Habitat"]
+    assert report.removed == []
+    assert [entry.title for entry in report.added] == ["ManiSkill"]
+
+
+def test_entry_without_surviving_neighbours_goes_to_the_section_end():
+    merged = README.replace(ISAAC + "\n", "").replace(HABITAT + "\n", "")
+
+    result, report = validate_merge(README, merged)
+
+    assert result.rstrip("\n").splitlines()[-2:] == [ISAAC, HABITAT]
+    assert len(report.restored) == 2
+
+
+def test_removals_within_the_limit_are_accepted():
+    merged = README.replace(RT_2 + "\n", "")
+
+    result, report = validate_merge(README, merged, max_removals=1)
+
+    assert result == merged
+    assert [entry.title for entry in report.removed] == ["RT-2"]
+    assert report.restored == []
+
+
+def test_rewritten_rows_are_modified_not_removed_and_added():
+    merged = README.replace("Vision-language-action models for robot control", "VLA models that transfer web knowledge")
+
+    report = diff_entries(README, merged)
+
+    assert [(old.title, new.line.split("|")[2].strip()) for old, new in report.modified] == [
+        ("RT-2", "VLA models that transfer web knowledge")
+    ]
+    assert report.removed == [] and report.added == []
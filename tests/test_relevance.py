@@ -0,0 +1,46 @@
+from utils.relevance import RelevanceRanker, readme_entries
+
+SEEDS = ["embodied ai", "robot", "manipulation", "humanoid", "world model", "vision language action"]
+README = """## Research Papers
+
+| Name | Description | Paper | Code |
+|------|-------------|-------|------|
+| RT-2 | Vision-language-action models transfer web knowledge to robotic control | [Paper](https://arxiv.org/abs/2307.15818) | [Code]() |
+| Octo | An open-source generalist robot policy | [Paper](https://arxiv.org/abs/2405.12213) | [Code]() |
+
+## Simulators
+
+- [Habitat](https://github.com/facebookresearch/habitat-sim) - Photorealistic simulator for embodied AI navigation [⭐2500]
+"""
+ON_TOPIC = "A humanoid robot learns dexterous manipulation with a world model"
+OFF_TOPIC = "A sourdough bread recipe with a crispy crust"
+
+
+def test_readme_entries_skip_headers_and_link_cells():
+    assert readme_entries(README) == [
+        "RT-2 Vision-language-action models transfer web knowledge to robotic control",
+        "Octo An open-source generalist robot policy",
+        "Habitat Photorealistic simulator for embodied AI navigation [⭐2500]",
+    ]
+
+
+def test_score_does_not_depend_on_the_batch():
+    ranker = RelevanceRanker(SEEDS, readme_entries(README))
+    others = ["Quarterly earnings of a retail bank", "Robot manipulation benchmark", OFF_TOPIC,
+              "Vision language action models at scale"]
+
+    alone = ranker.score_texts([ON_TOPIC])[0]
+
+    assert ranker.score_texts(others + [ON_TOPIC])[-1] == alone
+    assert ranker.score_texts([ON_TOPIC] * 3) == [alone] * 3
+
+
+def test_threshold_splits_on_and_off_topic_texts():
+    for corpus in (None, readme_entries(README)):
+        ranker = RelevanceRanker(SEEDS, corpus, threshold=0.05)
+
+        kept, dropped = ranker.filter([{'title': ON_TOPIC}, {'title': OFF_TOPIC}])
+
+        assert [item['title'] for item in kept] == [ON_TOPIC]
+        assert dropped[0]['topic_relevance'] == 0.0
+        assert 0.05 <= kept[0]['topic_relevance'] <= 1.0
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+import utils.resilience
+from utils.resilience import (CircuitBreaker, CircuitOpenError, Deadline, DeadlineExceeded, RetryBudget,
+                              call_with_resilience)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(utils.resilience, "backoff_delay", lambda attempt, base=1.0: 0.0)
+
+
+def flaky(failures, calls):
+    def func(timeout):
+        calls.append(timeout)
+        if len(calls) <= failures:
+            raise ConnectionError("reset by peer")
+        return "ok"
+    return func
+
+
+def test_deadline_caps_call_timeouts():
+    assert Deadline().timeout(30) == 30
+    assert Deadline(5).timeout(30) <= 5
+
+    expired = Deadline(0.01)
+    time.sleep(0.02)
+    assert expired.expired()
+    with pytest.raises(DeadlineExceeded):
+        expired.timeout(30)
+
+
+def test_breaker_opens_after_consecutive_failures_and_half_opens_after_the_reset():
+    breaker = CircuitBreaker("arxiv", failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert not breaker.allow()
+    assert breaker.to_dict() == {"state": "open", "consecutive_failures": 2, "short_circuited": 1}
+
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == "half_open"
+    # One failed trial call re-opens it straight away
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker("github", failure_threshold=1, latency_threshold=2.0)
+    breaker.record_success(latency=1.0)
+    assert breaker.state == "closed"
+    breaker.record_success(latency=3.0)
+    assert breaker.state == "open"
+
+
+def test_calls_are_retried_within_the_budget():
+    calls = []
+    budget = RetryBudget(max_retries=3)
+
+    assert call_with_resilience(CircuitBreaker("arxiv"), flaky(2, calls), retry_budget=budget) == "ok"
+    assert len(calls) == 3 and budget.used == 2
+
+    # Only one retry left in the run-wide budget
+    calls.clear()
+    with pytest.raises(ConnectionError):
+        call_with_resilience(CircuitBreaker("tavily"), flaky(2, calls), retry_budget=budget)
+    assert len(calls) == 2
+
+
+def test_open_breaker_and_spent_deadline_short_circuit_calls():
+    calls = []
+    breaker = CircuitBreaker("arxiv", failure_threshold=1)
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        call_with_resilience(breaker, flaky(0, calls))
+
+    deadline = Deadline(0.01)
+    time.sleep(0.02)
+    with pytest.raises(DeadlineExceeded):
+        call_with_resilience(CircuitBreaker("arxiv"), flaky(0, calls), deadline=deadline)
+    assert calls == []
+
+
+def test_call_timeout_is_capped_by_the_deadline():
+    calls = []
+    call_with_resilience(CircuitBreaker("arxiv"), flaky(0, calls), deadline=Deadline(5), timeout=30)
+    assert calls[0] <= 5
@@ -0,0 +1,98 @@
+from awesome_updater.core.content_merger import ContentMerger
+from awesome_updater.core.section_merge import entry_kind, route_entries, split_sections
+
+README = """# Awesome Embodied AI
+
+A curated list of embodied AI resources.
+
+## Research Papers
+
+| Name | Description | Paper | Code |
+|------|-------------|-------|------|
+| RT-2 | Vision-language-action models for robot control | [Paper](https://arxiv.org/abs/2307.15818) | [Code]() |
+
+### Surveys
+
+| Name | Description | Paper | Code |
+|------|-------------|-------|------|
+| Embodied AI Survey | A survey of simulators and tasks for embodied agents | [Paper](https://arxiv.org/abs/2103.04918) | [Code]() |
+
+## Simulators
+
+- [Isaac Gym](https://github.com/NVIDIA-Omniverse/IsaacGymEnvs) - GPU physics simulation for robot learning [⭐2000]
+- [Habitat](https://github.com/facebookresearch/habitat-sim) - Photorealistic 3D simulator for navigation [⭐2500]
+
+## Datasets
+
+- [Open X-Embodiment](https://github.com/google-deepmind/open_x_embodiment) - Robot manipulation dataset across embodiments [⭐1500]
+"""
+
+PAPER = ("| Octo | An open-source generalist robot policy with vision-language-action control | "
+         "[Paper](https://arxiv.org/abs/2405.12213) | [Code](https://github.com/octo-models/octo) |")
+SIMULATOR = "- [ManiSkill](https://github.com/haosulab/ManiSkill) - GPU physics simulation for manipulation [⭐900]"
+DATASET = "- [DROID](https://github.com/droid-dataset/droid) - Robot manipulation dataset in the wild [⭐400]"
+
+
+class AppendingGPT:
+    """Stands in for ``GPTService``: appends the routed entries to the section it is given."""
+
+    def __init__(self):
+        self.sections = []
+
+    def complete(self, prompt, **kwargs):
+        section = prompt.split("Here is one section of the list:\n", 1)[1].split(
+            "\n\nHere are new entries routed to this section:\n", 1)[0]
+        entries = prompt.split("\n\nHere are new entries routed to this section:\n", 1)[1].split(
+            "\n\nAdd the relevant new entries", 1)[0]
+        self.sections.append(section.split("\n", 1)[0])
+        return f"{section.rstrip()}\n{entries}"
+
+
+def test_split_keeps_preamble_and_subsections_and_round_trips():
+    sections = split_sections(README)
+
+    assert [section.heading for section in sections] == ["", "## Research Papers", "## Simulators", "## Datasets"]
+    assert "### Surveys" in sections[1].text
+    assert sections[1].has_table and not sections[1].has_list
+    assert sections[2].has_list and not sections[2].has_table
+    assert "".join(section.text for section in sections) == README
+
+
+def test_split_without_headings_or_trailing_newline():
+    assert "".join(s.text for s in split_sections("# Title\n\nNo sections yet")) == "# Title\n\nNo sections yet"
+    assert split_sections("") == []
+
+
+def test_entries_are_routed_by_content_and_kind():
+    sections = split_sections(README)
+
+    routed = route_entries(sections, [PAPER, SIMULATOR, DATASET])
+
+    assert routed == {1: [PAPER], 2: [SIMULATOR], 3: [DATASET]}
+    assert (entry_kind(PAPER), entry_kind(SIMULATOR)) == ("table", "list")
+
+
+def test_entries_without_overlap_go_to_the_first_section_of_their_kind():
+    sections = split_sections(README)
+
+    assert route_entries(sections, ["- [Zzz](https://example.com) - qqq"]) == {2: ["- [Zzz](https://example.com) - qqq"]}
+    assert route_entries(split_sections("# Title\n"), [SIMULATOR]) == {0: [SIMULATOR]}
+
+
+def test_sharded_merge_reassembles_untouched_sections_exactly(tmp_path):
+    readme_path = tmp_path / "README.md"
+    readme_path.write_text(README, encoding="utf-8")
+    gpt = AppendingGPT()
+    merger = ContentMerger(str(readme_path), gpt, mode="sharded")
+
+    assert merger.merge_content(f"{PAPER}\n\n{DATASET}\n")
+
+    merged = readme_path.read_text(encoding="utf-8")
+    assert sorted(gpt.sections) == ["## Datasets", "## Research Papers"]
+    before, after = split_sections(README), split_sections(merged)
+    assert [s.heading for s in after] == [s.heading for s in before]
+    # Sections without new entries pass through byte for byte
+    assert after[0].text == before[0].text
+    assert after[2].text == before[2].text
+    assert after[1].text == before[1].text.rstrip() + "\n" + PAPER + "\n\n"
+    assert after[3].text == before[3].text.rstrip() + "\n" + DATASET + "\n"